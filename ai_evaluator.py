@@ -1,15 +1,139 @@
+import asyncio
+import json
 import os
-from openai import OpenAI
+import re
+import threading
+import time
+import httpx
 
-from dotenv import load_dotenv
-load_dotenv()
-client = OpenAI(
-    base_url="https://api.groq.com/openai/v1",
-    api_key=os.getenv("GROQ_API_KEY")
-)
-print("GROQ KEY:", os.getenv("GROQ_API_KEY"))
+import cassette
+import metrics
+from async_runtime import LoopLocal, run_sync
+from llm_cache import DEFAULT_CACHE_PATH, DEFAULT_TTL, LLMCache, cache_key
 
-def evaluate_readme(readme_text):
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+
+
+def _build_client():
+    """
+    Construct the Groq client on first use. The openai package is slow
+    to import, so it is only loaded once an LLM call is actually made.
+    """
+    from dotenv import load_dotenv
+    from openai import AsyncOpenAI
+
+    load_dotenv()
+    limits = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+    return AsyncOpenAI(
+        base_url=os.getenv("GROQ_BASE_URL", GROQ_BASE_URL),
+        # Replays need no key, but the client refuses to start without one
+        api_key=os.getenv("GROQ_API_KEY") or ("replay" if cassette.mode() == "replay" else None),
+        http_client=httpx.AsyncClient(
+            limits=limits,
+            transport=cassette.transport(limits),
+            timeout=httpx.Timeout(60.0)
+        )
+    )
+
+
+# One pooled async client per event loop, shared by all three evaluators
+_client = LoopLocal(_build_client)
+
+MODEL = "llama-3.1-8b-instant"
+
+# Bump a version whenever its prompt template changes, so cached
+# answers to the old wording are not reused
+README_PROMPT_VERSION = "readme-v1"
+READMES_PROMPT_VERSION = "readmes-v1"
+
+# Characters of each README sent in a batched evaluation
+README_EXCERPT_CHARS = 2500
+SCREENING_PROMPT_VERSION = "screening-v1"
+ROADMAP_PROMPT_VERSION = "roadmap-v1"
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """
+    Return the shared completion cache, or None when disabled via LLM_CACHE=0
+    """
+    global _llm_cache
+
+    if os.getenv("LLM_CACHE", "1") == "0":
+        return None
+
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMCache(
+                    path=os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+                    ttl=int(os.getenv("LLM_CACHE_TTL", str(DEFAULT_TTL))),
+                    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+                )
+
+    return _llm_cache
+
+
+def get_async_client():
+    """
+    Return the pooled Groq client for the running event loop
+    """
+    return _client.get()
+
+
+async def close_async_client():
+    client = _client.discard()
+    if client is not None:
+        await client.close()
+
+
+async def _complete_async(prompt, temperature, template_version, parse):
+    """
+    Return `parse` of the model's answer to `prompt`, reusing a cached
+    answer for identical inputs. Only answers that parse are cached.
+    """
+    cache = get_llm_cache()
+    key = cache_key(MODEL, temperature, template_version, prompt)
+
+    # A memory miss falls through to SQLite; keep that off the event loop
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            return parse(cached)
+
+    started = time.perf_counter()
+    try:
+        response = await get_async_client().chat.completions.create(
+            model=MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature
+        )
+    except Exception as e:
+        status = getattr(e, "status_code", None) or "error"
+        metrics.observe_llm("chat.completions", MODEL, status, time.perf_counter() - started)
+        raise
+
+    metrics.observe_llm("chat.completions", MODEL, 200, time.perf_counter() - started)
+    metrics.record_llm_usage(MODEL, template_version, response.usage)
+    content = response.choices[0].message.content
+
+    result = parse(content)
+    if cache is not None:
+        await asyncio.to_thread(cache.set, key, content)
+    return result
+
+
+def _parse_roadmap(raw_output):
+    # Extract JSON safely
+    json_match = re.search(r"\{.*\}", raw_output.strip(), re.DOTALL)
+    if not json_match:
+        raise ValueError("No JSON object in roadmap response")
+    return json.loads(json_match.group())
+
+
+async def evaluate_readme_async(readme_text):
     if not readme_text:
         return {
             "readme_score": 0,
@@ -36,17 +160,9 @@ def evaluate_readme(readme_text):
     {readme_text[:3000]}
     """
 
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.2
-    )
-
-    import json
-
     try:
-        return json.loads(response.choices[0].message.content)
-    except:
+        return await _complete_async(prompt, 0.2, README_PROMPT_VERSION, json.loads)
+    except (ValueError, TypeError):
         return {
             "readme_score": 0,
             "strengths": [],
@@ -54,7 +170,121 @@ def evaluate_readme(readme_text):
         }
 
 
-def recruiter_screening_summary(username, total_score, breakdown, readme_eval):
+def _repo_key(name):
+    """
+    Compare repo names the way a model may echo them: any case, with an
+    owner prefix or a README.md / .md suffix
+    """
+    name = re.sub(r"(/readme)?\.md$", "", str(name).strip().lower())
+    return name.rstrip("/").rsplit("/", 1)[-1]
+
+
+def _parse_readmes(raw_output, names):
+    """
+    Read a batched README answer, which may be wrapped in a code fence or
+    prose. Returns the JSON object with "readmes" turned into {repo name:
+    score out of 20} for the repos the model answered, in any order;
+    raises ValueError when it answered none of them.
+    """
+    json_match = re.search(r"\{.*\}", raw_output.strip(), re.DOTALL)
+    if not json_match:
+        raise ValueError("No JSON object in README response")
+    data = json.loads(json_match.group())
+
+    wanted = {_repo_key(name): name for name in names}
+    scores = {}
+    for entry in data.get("readmes") or []:
+        if not isinstance(entry, dict):
+            continue
+        name = wanted.get(_repo_key(entry.get("repo", "")))
+        try:
+            score = int(entry["readme_score"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if name is not None and name not in scores:
+            scores[name] = max(0, min(score, 20))
+
+    if not scores:
+        raise ValueError("README answers do not match the READMEs sent")
+    data["readmes"] = scores
+    return data
+
+
+async def evaluate_readmes_async(selection):
+    """
+    Evaluate the READMEs picked by readme_selection.select_readmes in one
+    prompt. "readme_score" is the mean of the per-repo scores, so one
+    polished project cannot carry an otherwise undocumented account.
+    Repos the model skipped, or every repo when its answer is unusable,
+    keep their structure score scaled to 20 ("scored_by": "structure").
+    """
+    selected = selection["selected"] if selection else []
+    if not selected:
+        return {
+            "readme_score": 0,
+            "strengths": [],
+            "improvements": ["No README found."],
+            "repos": []
+        }
+
+    names = [entry["repo"] for entry in selected]
+    excerpts = "\n\n".join(
+        f"--- README {i} ({entry['repo']}) ---\n{entry['text'][:README_EXCERPT_CHARS]}"
+        for i, entry in enumerate(selected, 1)
+    )
+
+    prompt = f"""
+    You are a senior technical recruiter.
+
+    Evaluate each of the following GitHub READMEs from the same candidate.
+
+    Score each one STRICTLY out of 20, then give strengths and
+    improvements for the candidate's documentation overall.
+
+    Return ONLY valid JSON in this format, with one entry per README in
+    the order given:
+
+    {{
+      "readmes": [{{"repo": "name", "readme_score": number}}],
+      "strengths": ["point1", "point2", "point3"],
+      "improvements": ["point1", "point2", "point3"]
+    }}
+
+    {excerpts}
+    """
+
+    try:
+        data = await _complete_async(
+            prompt, 0.2, READMES_PROMPT_VERSION, lambda raw: _parse_readmes(raw, names)
+        )
+    except (ValueError, TypeError):
+        data = {"readmes": {}, "improvements": ["AI response parsing failed."]}
+
+    repos = []
+    for entry in selected:
+        scored = entry["repo"] in data["readmes"]
+        repos.append({
+            "repo": entry["repo"],
+            "readme_score": data["readmes"][entry["repo"]] if scored
+            else round(entry["structure_score"] / 5),
+            "structure_score": entry["structure_score"],
+            "copies": entry["copies"],
+            "scored_by": "llm" if scored else "structure"
+        })
+
+    scores = [repo["readme_score"] for repo in repos]
+    return {
+        "readme_score": round(sum(scores) / len(scores)),
+        "strengths": data.get("strengths", []),
+        "improvements": data.get("improvements", []),
+        "repos": repos,
+        "readmes_found": selection["readmes_found"],
+        "unique_readmes": selection["unique_readmes"],
+        "templates_skipped": selection["templates_skipped"]
+    }
+
+
+async def recruiter_screening_summary_async(username, total_score, breakdown, readme_eval):
     prompt = f"""
     You are a senior technical recruiter at a product-based company.
 
@@ -78,23 +308,15 @@ def recruiter_screening_summary(username, total_score, breakdown, readme_eval):
     }}
     """
 
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.3
-    )
-
-    import json
-
     try:
-        return json.loads(response.choices[0].message.content)
-    except:
+        return await _complete_async(prompt, 0.3, SCREENING_PROMPT_VERSION, json.loads)
+    except (ValueError, TypeError):
         return {
             "screening_decision": "Unknown",
             "recruiter_summary": "AI parsing failed.",
             "top_improvements": []
         }
-def generate_growth_roadmap(username, total_score, breakdown=None, red_flags=None):
+async def generate_growth_roadmap_async(username, total_score, breakdown=None, red_flags=None):
     prompt = f"""
         You are a senior software engineering mentor helping a student improve their GitHub profile.
 
@@ -137,20 +359,7 @@ def generate_growth_roadmap(username, total_score, breakdown=None, red_flags=Non
         """
 
     try:
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3
-        )
-
-        import json, re
-
-        raw_output = response.choices[0].message.content.strip()
-
-        # Extract JSON safely
-        json_match = re.search(r"\{.*\}", raw_output, re.DOTALL)
-        if json_match:
-            return json.loads(json_match.group())
+        return await _complete_async(prompt, 0.3, ROADMAP_PROMPT_VERSION, _parse_roadmap)
 
     except Exception:
         pass
@@ -190,3 +399,23 @@ def generate_growth_roadmap(username, total_score, breakdown=None, red_flags=Non
             ]
         }
     }
+
+
+def evaluate_readme(readme_text):
+    return run_sync(evaluate_readme_async(readme_text))
+
+
+def evaluate_readmes(selection):
+    return run_sync(evaluate_readmes_async(selection))
+
+
+def recruiter_screening_summary(username, total_score, breakdown, readme_eval):
+    return run_sync(
+        recruiter_screening_summary_async(username, total_score, breakdown, readme_eval)
+    )
+
+
+def generate_growth_roadmap(username, total_score, breakdown=None, red_flags=None):
+    return run_sync(
+        generate_growth_roadmap_async(username, total_score, breakdown, red_flags)
+    )
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import weakref
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop():
+    """
+    Return the shared event loop used by the synchronous wrappers,
+    starting its thread on first use
+    """
+    global _loop
+
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="async-runtime",
+                    daemon=True
+                )
+                thread.start()
+                _loop = loop
+
+    return _loop
+
+
+def submit(coro):
+    """
+    Schedule a coroutine on the background loop without waiting; returns
+    a concurrent.futures.Future usable from any thread or loop
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+
+
+def run_sync(coro):
+    """
+    Run a coroutine on the background loop and block until it finishes
+    """
+    return submit(coro).result()
+
+
+def iterate_sync(agen):
+    """
+    Drive an async generator from synchronous code, one item at a time
+    """
+    try:
+        while True:
+            try:
+                item = run_sync(agen.__anext__())
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        run_sync(agen.aclose())
+
+
+class LoopLocal:
+    """
+    Lazily build one object per running event loop.
+
+    Async clients (httpx, OpenAI) hold connections bound to the loop that
+    created them, so each loop gets its own pooled instance.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instances = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self):
+        loop = asyncio.get_running_loop()
+        instance = self._instances.get(loop)
+
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(loop)
+                if instance is None:
+                    instance = self._factory()
+                    self._instances[loop] = instance
+
+        return instance
+
+    def discard(self):
+        """
+        Forget the instance bound to the running loop and return it
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            return self._instances.pop(loop, None)
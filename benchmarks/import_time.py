@@ -0,0 +1,101 @@
+"""
+Cold-start guard: import each entry module in a fresh interpreter and
+fail if it is slower than its budget or eagerly loads a heavy package.
+
+    python -m benchmarks.import_time [--repeat 5] [--scale 1.0] [--output out.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds, best of --repeat runs on a developer laptop
+BUDGETS = {
+    "github_service": 0.25,
+    "ai_evaluator": 0.3,
+    "main": 1.0
+}
+
+# Must stay lazy: only loaded once a request or chart needs them
+DEFERRED_MODULES = ["openai", "numpy", "matplotlib", "pandas", "prometheus_client"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [name for name in {deferred!r} if name in sys.modules]
+}}))
+"""
+
+
+def measure(module, repeat):
+    """
+    Return the fastest import time of `module` and the deferred modules
+    it pulled in, plus anything it printed while importing
+    """
+    best = None
+    loaded = []
+    chatter = []
+
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, deferred=DEFERRED_MODULES)],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        lines = result.stdout.strip().splitlines()
+        sample = json.loads(lines[-1])
+        chatter = lines[:-1]
+
+        if best is None or sample["seconds"] < best:
+            best = sample["seconds"]
+        loaded = sample["loaded"]
+
+    return {"seconds": round(best, 4), "loaded": loaded, "printed": chatter}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply every budget, e.g. 2.0 on slow CI runners")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = {}
+    failures = []
+
+    for module, budget in BUDGETS.items():
+        sample = measure(module, args.repeat)
+        sample["budget"] = budget * args.scale
+        results[module] = sample
+
+        print(f"{module:<16} {sample['seconds']:.3f}s (budget {sample['budget']:.2f}s)")
+
+        if sample["seconds"] > sample["budget"]:
+            failures.append(f"{module} took {sample['seconds']:.3f}s")
+        if sample["loaded"]:
+            failures.append(f"{module} eagerly imports {', '.join(sample['loaded'])}")
+        if sample["printed"]:
+            failures.append(f"{module} prints at import time")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""
+Benchmark harness: micro-benchmarks of the scoring functions over
+synthetic profiles, then end-to-end /analyze latency and throughput
+against local GitHub and chat-completion stand-ins.
+
+    python -m benchmarks.run [--quick] [--output results.json] [--baseline old.json]
+
+Results are JSON so runs on different commits can be compared with
+--baseline, which exits non-zero when anything slowed down by more
+than --tolerance.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from benchmarks.synthetic import commit_list, generate_user, generate_users
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMIT_SIZES = [1_000, 10_000, 100_000]
+REPO_SIZES = [1, 100, 1_000, 5_000]
+CONCURRENCY_LEVELS = [1, 4, 16]
+
+
+def _time(func, *args, min_seconds=0.2, max_repeat=50):
+    """
+    Call `func` until `min_seconds` have passed (at least 3 times) and
+    return best and median seconds per call
+    """
+    samples = []
+    started = time.perf_counter()
+
+    while len(samples) < 3 or (
+        time.perf_counter() - started < min_seconds and len(samples) < max_repeat
+    ):
+        call_start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - call_start)
+
+    return {
+        "best_seconds": round(min(samples), 6),
+        "median_seconds": round(statistics.median(samples), 6),
+        "runs": len(samples)
+    }
+
+
+def run_micro(commit_sizes, repo_sizes):
+    from commit_analyzer import analyze_commit_patterns
+    from engineering_depth import analyze_engineering_depth
+    from github_service import RepoRecord
+    from readme_selection import select_readmes
+    from red_flag_engine import detect_red_flags
+    from scoring_engine import calculate_portfolio_score
+
+    results = {
+        "analyze_commit_patterns": {},
+        "calculate_portfolio_score": {},
+        "analyze_engineering_depth": {},
+        "detect_red_flags": {},
+        "select_readmes": {}
+    }
+
+    for size in commit_sizes:
+        commits = commit_list(size)
+        results["analyze_commit_patterns"][str(size)] = _time(analyze_commit_patterns, commits)
+        print(f"  analyze_commit_patterns   {size:>9,} commits  "
+              f"{results['analyze_commit_patterns'][str(size)]['best_seconds']:.4f}s")
+        del commits
+
+    commit_data = analyze_commit_patterns(commit_list(1_000))
+    readme_eval = {"readme_score": 12}
+
+    for size in repo_sizes:
+        user = generate_user("micro-user", repos=size, commits=0)
+        profile = user["profile"]
+        repos = [RepoRecord.from_rest(repo) for repo in user["repos"]]
+
+        for name, func, args in [
+            ("calculate_portfolio_score", calculate_portfolio_score, (profile, repos)),
+            ("analyze_engineering_depth", analyze_engineering_depth, (repos,)),
+            ("detect_red_flags", detect_red_flags, (profile, repos, commit_data, readme_eval)),
+            ("select_readmes", select_readmes, (user["readmes"],))
+        ]:
+            results[name][str(size)] = _time(func, *args)
+            print(f"  {name:<25} {size:>9,} repos    {results[name][str(size)]['best_seconds']:.6f}s")
+
+    return results
+
+
+def _retained_bytes(build):
+    """
+    Bytes still allocated by the object `build` returns
+    """
+    tracemalloc.start()
+    try:
+        value = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del value
+    return size
+
+
+def run_memory(repo_sizes):
+    """
+    Memory held by an account's repo list as parsed REST payloads versus
+    as the RepoRecords the fetch layer keeps
+    """
+    from github_service import RepoRecord
+
+    results = {}
+
+    for size in repo_sizes:
+        # Parsed from JSON, as the response body would be
+        body = json.dumps(generate_user("memory-user", repos=size, commits=0)["repos"])
+        payload_bytes = _retained_bytes(lambda: json.loads(body))
+        record_bytes = _retained_bytes(
+            lambda: [RepoRecord.from_rest(repo) for repo in json.loads(body)]
+        )
+        results[str(size)] = {
+            "payload_bytes": payload_bytes,
+            "record_bytes": record_bytes,
+            "record_bytes_per_repo": record_bytes // size
+        }
+        print(f"  repo list {size:>9,} repos    payloads {payload_bytes / 1e6:8.2f} MB  "
+              f"records {record_bytes / 1e6:8.2f} MB")
+
+    return results
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+async def _load(base_url, usernames, concurrency):
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        async def one(username):
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(f"/analyze/{username}")
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200 or "error" in response.json():
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(username) for username in usernames))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(usernames),
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(len(usernames) / elapsed, 3),
+        "p50_seconds": round(_percentile(latencies, 0.5), 4),
+        "p95_seconds": round(_percentile(latencies, 0.95), 4),
+        "max_seconds": round(max(latencies), 4)
+    }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _spawn(module, port, *args):
+    """
+    Run a stand-in in its own interpreter, so serving does not compete
+    with the app under test for the GIL, and wait until it accepts
+    """
+    process = subprocess.Popen(
+        [sys.executable, "-m", module, "--port", str(port), *map(str, args)],
+        cwd=ROOT, stdout=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{module} exited with {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+
+    process.kill()
+    raise RuntimeError(f"{module} did not start listening on port {port}")
+
+
+def run_end_to_end(levels, requests, repos, commits, github_latency, llm_latency):
+    """
+    Serve main.app with uvicorn against the stand-ins and load it at each
+    concurrency level. Every request is for a different user and all
+    caches are off, so each one measures a cold analysis.
+    """
+    count = requests * len(levels)
+    # Same generator and seed as the stand-in, so the logins line up
+    logins = list(generate_users(count, repos=1, commits=0))
+    github_port, llm_port = _free_port(), _free_port()
+    github = _spawn(
+        "stubs.github_rest", github_port, "--users", count, "--repos", repos,
+        "--commits", commits, "--latency", github_latency
+    )
+    llm = _spawn("stubs.openai_server", llm_port, "--latency", llm_latency)
+    scratch = tempfile.mkdtemp(prefix="bench-")
+
+    os.environ.update({
+        "GITHUB_BASE_URL": f"http://127.0.0.1:{github_port}",
+        "GROQ_BASE_URL": f"http://127.0.0.1:{llm_port}/v1",
+        "GROQ_API_KEY": "benchmark",
+        "GITHUB_BACKEND": "rest",
+        "GITHUB_HTTP_CACHE": "0",
+        "LLM_CACHE": "0",
+        "REPORT_CACHE": "0",
+        "SNAPSHOT_STORE": "0",
+        "SNAPSHOT_DB_PATH": os.path.join(scratch, "snapshots.sqlite"),
+        "COHORT_INDEX_PATH": os.path.join(scratch, "cohort.sqlite"),
+        "JOB_QUEUE_PATH": os.path.join(scratch, "jobs.sqlite")
+    })
+    # A real token would be sent to the stand-in for nothing
+    os.environ.pop("GITHUB_TOKEN", None)
+    os.environ.pop("GITHUB_TOKENS", None)
+
+    import uvicorn
+    import main
+
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=0, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    results = {}
+    try:
+        for i, level in enumerate(levels):
+            batch = logins[i * requests:(i + 1) * requests]
+            results[str(level)] = asyncio.run(_load(f"http://127.0.0.1:{port}", batch, level))
+            sample = results[str(level)]
+            print(f"  concurrency {level:>3}: p50 {sample['p50_seconds']:.3f}s  "
+                  f"p95 {sample['p95_seconds']:.3f}s  {sample['throughput_per_second']:.2f} req/s  "
+                  f"errors {sample['errors']}")
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+        for process in (github, llm):
+            process.terminate()
+            process.wait()
+
+    return {
+        "profile": {"repos": repos, "commits": commits},
+        "github_latency_seconds": github_latency,
+        "llm_latency_seconds": llm_latency,
+        "levels": results
+    }
+
+
+def _metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform()
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Return regressions of `results` against `baseline`: slower micro
+    timings, larger repo lists and end-to-end p50 or throughput beyond
+    `tolerance`
+    """
+    regressions = []
+
+    for name, sizes in results.get("micro", {}).items():
+        for size, sample in sizes.items():
+            before = baseline.get("micro", {}).get(name, {}).get(size)
+            if before and sample["best_seconds"] > before["best_seconds"] * (1 + tolerance):
+                regressions.append(
+                    f"{name}[{size}] {before['best_seconds']:.6f}s -> {sample['best_seconds']:.6f}s"
+                )
+
+    for size, sample in results.get("memory", {}).items():
+        before = baseline.get("memory", {}).get(size)
+        if before and sample["record_bytes"] > before["record_bytes"] * (1 + tolerance):
+            regressions.append(
+                f"repo list memory[{size}] {before['record_bytes']} -> {sample['record_bytes']} bytes"
+            )
+
+    levels = results.get("end_to_end", {}).get("levels", {})
+    base_levels = baseline.get("end_to_end", {}).get("levels", {})
+    for level, sample in levels.items():
+        before = base_levels.get(level)
+        if not before:
+            continue
+        if sample["p50_seconds"] > before["p50_seconds"] * (1 + tolerance):
+            regressions.append(
+                f"/analyze p50 at concurrency {level} "
+                f"{before['p50_seconds']:.3f}s -> {sample['p50_seconds']:.3f}s"
+            )
+        if sample["throughput_per_second"] < before["throughput_per_second"] / (1 + tolerance):
+            regressions.append(
+                f"/analyze throughput at concurrency {level} "
+                f"{before['throughput_per_second']:.2f} -> {sample['throughput_per_second']:.2f} req/s"
+            )
+
+    return regressions
+
+
+def _int_list(text):
+    return [int(part) for part in text.split(",") if part]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true",
+                        help="small sizes for a fast smoke run")
+    parser.add_argument("--commit-sizes", type=_int_list,
+                        help="comma-separated commit counts, up to 1000000")
+    parser.add_argument("--repo-sizes", type=_int_list,
+                        help="comma-separated repo counts, 1 to 5000")
+    parser.add_argument("--concurrency", type=_int_list, default=CONCURRENCY_LEVELS)
+    parser.add_argument("--requests", type=int, default=32,
+                        help="requests per concurrency level")
+    parser.add_argument("--e2e-repos", type=int, default=30)
+    parser.add_argument("--e2e-commits", type=int, default=3000)
+    parser.add_argument("--github-latency", type=float, default=0.02)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-e2e", action="store_true")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown before a result counts as a regression")
+    args = parser.parse_args()
+
+    commit_sizes = args.commit_sizes or ([1_000, 10_000] if args.quick else COMMIT_SIZES)
+    repo_sizes = args.repo_sizes or ([1, 100] if args.quick else REPO_SIZES)
+    requests = 4 if args.quick and args.requests == 32 else args.requests
+
+    results = {"meta": _metadata()}
+
+    if not args.skip_micro:
+        print("Micro-benchmarks")
+        results["micro"] = run_micro(commit_sizes, repo_sizes)
+        print("Repo list memory")
+        results["memory"] = run_memory(repo_sizes)
+
+    if not args.skip_e2e:
+        print("End-to-end /analyze")
+        results["end_to_end"] = run_end_to_end(
+            args.concurrency, requests, args.e2e_repos, args.e2e_commits,
+            args.github_latency, args.llm_latency
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failures = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = compare(results, json.load(f), args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION: {failure}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Deterministic synthetic GitHub users for benchmarks and the REST stand-in.
+
+Commits are not stored: commit `i` of a repo is computed from its index,
+so a user with a million commits costs no more memory than its repo list.
+"""
+import random
+import time
+import zlib
+
+LANGUAGES = ["Python", "TypeScript", "JavaScript", "Go", "Java", "Rust", None]
+
+DESCRIPTIONS = [
+    "REST API built with django and postgres",
+    "react dashboard with redux and tailwind",
+    "Flask service backed by redis",
+    "Machine learning experiments in pytorch",
+    "Command line tool",
+    "Spring boot microservice with mysql",
+    "vue frontend for a fastapi backend with mongodb",
+    None
+]
+
+MESSAGES = [
+    "Add pagination to the search endpoint",
+    "update",
+    "Refactor cache invalidation",
+    "fix",
+    "Introduce retry with backoff for webhooks",
+    "minor changes",
+    "Document the deployment steps",
+    "Speed up report rendering",
+    "tests"
+]
+
+README = """# {name}
+
+{description}
+
+## Features
+
+- Fast setup
+- Documented API
+
+## Installation
+
+```
+pip install -r requirements.txt
+```
+
+## Usage
+
+Run `python -m {name}` and open http://localhost:8000.
+"""
+
+# URL templates of a REST repo payload, keyed by field name; real payloads
+# carry these, the owner object and the rest for about a hundred keys
+URL_FIELDS = [
+    "archive", "assignees", "blobs", "branches", "collaborators", "comments",
+    "commits", "compare", "contents", "contributors", "deployments", "downloads",
+    "events", "forks", "git_commits", "git_refs", "git_tags", "hooks",
+    "issue_comment", "issue_events", "issues", "keys", "labels", "languages",
+    "merges", "milestones", "notifications", "pulls", "releases", "stargazers",
+    "statuses", "subscribers", "subscription", "tags", "teams", "trees"
+]
+
+OWNER_URL_FIELDS = [
+    "followers", "following", "gists", "starred", "subscriptions",
+    "organizations", "repos", "events", "received_events"
+]
+
+DAY = 86400
+# Newest commit of every synthetic repo is within a year of this instant
+EPOCH_END = 1735689600  # 2025-01-01T00:00:00Z
+
+
+def _iso(epoch_seconds):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch_seconds))
+
+
+def _rest_padding(login, name, index):
+    """
+    The fields of a REST repo payload the analyzer never reads
+    """
+    api = f"https://api.github.com/repos/{login}/{name}"
+    owner_api = f"https://api.github.com/users/{login}"
+
+    fields = {
+        "id": 100000 + index,
+        "node_id": f"R_kgDO{index:08d}",
+        "private": False,
+        "owner": {
+            "login": login,
+            "id": 5000,
+            "node_id": "U_kgDOAAATiA",
+            "avatar_url": "https://avatars.githubusercontent.com/u/5000?v=4",
+            "gravatar_id": "",
+            "url": owner_api,
+            "html_url": f"https://github.com/{login}",
+            "type": "User",
+            "site_admin": False,
+            **{f"{field}_url": f"{owner_api}/{field}" for field in OWNER_URL_FIELDS}
+        },
+        "html_url": f"https://github.com/{login}/{name}",
+        "url": api,
+        "git_url": f"git://github.com/{login}/{name}.git",
+        "ssh_url": f"git@github.com:{login}/{name}.git",
+        "clone_url": f"https://github.com/{login}/{name}.git",
+        "svn_url": f"https://github.com/{login}/{name}",
+        "homepage": None,
+        "created_at": "2019-01-01T00:00:00Z",
+        "updated_at": "2024-06-01T00:00:00Z",
+        "watchers_count": 0,
+        "watchers": 0,
+        "forks": 0,
+        "open_issues": 0,
+        "has_projects": True,
+        "has_downloads": True,
+        "has_wiki": True,
+        "has_pages": False,
+        "has_discussions": False,
+        "mirror_url": None,
+        "archived": False,
+        "disabled": False,
+        "license": None,
+        "allow_forking": True,
+        "is_template": False,
+        "web_commit_signoff_required": False,
+        "topics": [],
+        "visibility": "public",
+        "default_branch": "main"
+    }
+    fields.update({f"{field}_url": f"{api}/{field}" for field in URL_FIELDS})
+    return fields
+
+
+def generate_user(login, repos=30, commits=3000, seed=0, fork_ratio=0.2, readme_ratio=0.7):
+    """
+    Build a user with `repos` repositories (1 to 5,000 in practice), each
+    a full-size REST payload, and `commits` commits spread unevenly over
+    the original ones
+    """
+    rng = random.Random(f"{login}:{seed}")
+
+    repo_list = []
+    commit_counts = {}
+    readmes = {}
+    activity = {}
+    weights = []
+
+    for index in range(repos):
+        name = f"repo-{index:04d}"
+        fork = rng.random() < fork_ratio
+        description = rng.choice(DESCRIPTIONS)
+        open_issues = rng.randint(0, 6)
+        open_prs = rng.randint(0, 2)
+
+        repo_list.append({
+            **_rest_padding(login, name, index),
+            "name": name,
+            "full_name": f"{login}/{name}",
+            "fork": fork,
+            "description": description,
+            "language": rng.choice(LANGUAGES),
+            "stargazers_count": int(rng.paretovariate(1.2)) - 1,
+            "forks_count": rng.randint(0, 5),
+            "size": rng.randint(10, 50000),
+            "open_issues_count": open_issues + open_prs,
+            "has_issues": True,
+            "pushed_at": None
+        })
+        activity[name] = {
+            "open_issues": open_issues,
+            "closed_issues": rng.randint(0, 40),
+            "open_prs": open_prs,
+            "closed_prs": rng.randint(0, 10),
+            "merged_prs": rng.randint(0, 30)
+        }
+        if rng.random() < readme_ratio:
+            readmes[name] = README.format(name=name, description=description or "")
+        weights.append(0.0 if fork else rng.paretovariate(1.5))
+
+    # Share the commit total out in proportion to the weights
+    total_weight = sum(weights) or 1.0
+    assigned = 0
+    for repo, weight in zip(repo_list, weights):
+        count = int(commits * weight / total_weight)
+        commit_counts[repo["name"]] = count
+        assigned += count
+    for repo, weight in zip(repo_list, weights):
+        if assigned >= commits:
+            break
+        if weight:
+            commit_counts[repo["name"]] += 1
+            assigned += 1
+
+    for index, repo in enumerate(repo_list):
+        repo["pushed_at"] = _iso(_newest(login, index))
+
+    return {
+        "profile": {
+            "login": login,
+            "name": login.replace("-", " ").title(),
+            "public_repos": repos,
+            "followers": rng.randint(0, 500),
+            "following": rng.randint(0, 100),
+            "created_at": "2018-01-01T00:00:00Z",
+            "html_url": f"https://github.com/{login}"
+        },
+        "repos": repo_list,
+        "commit_counts": commit_counts,
+        "readmes": readmes,
+        "activity": activity
+    }
+
+
+def _salt(login, index):
+    # crc32 rather than hash(): str hashes change between interpreter runs
+    return zlib.crc32(f"{login}:{index}".encode()) | 1
+
+
+def _newest(login, repo_index):
+    return EPOCH_END - (_salt(login, repo_index) % (365 * DAY))
+
+
+def commit_at(user, repo_name, i):
+    """
+    The i-th newest commit of a repo as a REST /commits item
+    """
+    login = user["profile"]["login"]
+    index = int(repo_name.rsplit("-", 1)[1])
+    salt = _salt(login, index)
+    gap = 2 * DAY
+
+    # Average one commit every two days, jittered but always older than i - 1
+    timestamp = _newest(login, index) - i * gap - (i * 2654435761 + salt) % gap
+    return {
+        "sha": f"{salt:08x}{i:032x}",
+        "commit": {
+            "message": MESSAGES[(i * 7 + salt) % len(MESSAGES)],
+            "author": {"date": _iso(timestamp)}
+        }
+    }
+
+
+def iter_commits(user, repo_name, start=0, stop=None, since=None):
+    """
+    Yield a repo's commits newest first from index `start`, ending at
+    `stop` or at the first commit older than the ISO time `since`
+    """
+    count = user["commit_counts"].get(repo_name, 0)
+    stop = count if stop is None else min(stop, count)
+
+    for i in range(start, stop):
+        commit = commit_at(user, repo_name, i)
+        if since and commit["commit"]["author"]["date"] < since:
+            return
+        yield commit
+
+
+def commit_list(count, seed=0):
+    """
+    A flat list of `count` REST commit items for micro-benchmarks
+    """
+    rng = random.Random(seed)
+    timestamp = EPOCH_END
+    commits = []
+
+    for i in range(count):
+        timestamp -= rng.randint(0, 3 * DAY)
+        commits.append({
+            "sha": f"{seed:08x}{i:032x}",
+            "commit": {
+                "message": MESSAGES[rng.randrange(len(MESSAGES))],
+                "author": {"date": _iso(timestamp)}
+            }
+        })
+
+    return commits
+
+
+def generate_users(count, repos=30, commits=3000, prefix="bench-user", seed=0):
+    """
+    {login: user} for `count` users of the same shape
+    """
+    return {
+        f"{prefix}-{i:04d}": generate_user(f"{prefix}-{i:04d}", repos, commits, seed)
+        for i in range(count)
+    }
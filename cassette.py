@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+
+DEFAULT_CASSETTE_PATH = os.path.join(".cache", "cassette.sqlite")
+MODES = ("off", "record", "replay")
+
+# Headers the analyzer reads back; rate-limit headers are left out so a
+# replay never waits on a reset that passed long ago
+STORED_HEADERS = ("content-type", "link", "etag", "last-modified", "retry-after")
+
+# Sent by the ETag cache; a recorded 304 would be useless to a replay that
+# starts with an empty cache, so recording always asks for the full body
+CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+
+
+class CassetteMiss(httpx.TransportError):
+    """
+    Raised in replay mode for a request that was never recorded
+    """
+
+
+def mode():
+    """
+    CASSETTE_MODE: off (default), record or replay
+    """
+    value = os.getenv("CASSETTE_MODE", "off").lower()
+    if value not in MODES:
+        raise ValueError(f"CASSETTE_MODE must be one of {', '.join(MODES)}, not {value!r}")
+    return value
+
+
+def normalize_url(url):
+    """
+    Lowercase scheme and host and sort the query, so parameter order
+    does not decide whether a request matches
+    """
+    parts = urlsplit(str(url))
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+def normalize_body(body):
+    """
+    Canonical JSON for JSON bodies (key order and whitespace ignored),
+    the raw bytes otherwise
+    """
+    if not body:
+        return b""
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode()
+    except ValueError:
+        return body
+
+
+def request_key(method, url, body):
+    """
+    Match key of one interaction: method, normalized URL and body
+    """
+    digest = hashlib.sha256()
+    for part in (method.upper().encode(), normalize_url(url).encode(), normalize_body(body)):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class Cassette:
+    """
+    SQLite file of recorded HTTP interactions.
+
+    Bodies are zlib-compressed and looked up by key, so a corpus of
+    thousands of candidates replays without being loaded into memory.
+    Recording the same request again keeps the newest response.
+    """
+
+    def __init__(self, path=DEFAULT_CASSETTE_PATH):
+        self.path = path
+        self.recorded = 0
+        self.replayed = 0
+        self.missed = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS interactions (
+                key TEXT PRIMARY KEY,
+                method TEXT NOT NULL,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                recorded_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def lookup(self, key):
+        """
+        Return (status, headers, body) recorded for `key`, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body FROM interactions WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None:
+                self.missed += 1
+                return None
+            self.replayed += 1
+
+        return row[0], json.loads(row[1]), zlib.decompress(row[2])
+
+    def record(self, key, request, status, headers, body):
+        kept = {name: headers[name] for name in STORED_HEADERS if name in headers}
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO interactions "
+                "(key, method, url, status, headers, body, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, request.method, normalize_url(request.url), status,
+                 json.dumps(kept), zlib.compress(body, 6), time.time())
+            )
+            self._conn.commit()
+            self.recorded += 1
+
+    def stats(self):
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM interactions").fetchone()[0]
+            return {
+                "interactions": count,
+                "recorded": self.recorded,
+                "replayed": self.replayed,
+                "missed": self.missed
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """
+    Record responses from `inner` to `cassette`, or answer every request
+    from `cassette` without touching the network
+    """
+
+    def __init__(self, cassette, mode, inner=None):
+        self.cassette = cassette
+        self.mode = mode
+        self.inner = inner
+
+    async def handle_async_request(self, request):
+        body = await request.aread()
+        key = request_key(request.method, request.url, body)
+
+        if self.mode == "replay":
+            entry = self.cassette.lookup(key)
+            if entry is None:
+                raise CassetteMiss(
+                    f"No recorded response for {request.method} {normalize_url(request.url)}",
+                    request=request
+                )
+            status, headers, content = entry
+            return httpx.Response(status, headers=headers, content=content, request=request)
+
+        for name in CONDITIONAL_HEADERS:
+            request.headers.pop(name, None)
+
+        response = await self.inner.handle_async_request(request)
+        # Decoded here, so the replayed body carries no Content-Encoding
+        content = await response.aread()
+        await response.aclose()
+
+        self.cassette.record(key, request, response.status_code, response.headers, content)
+        headers = [
+            (name, value) for name, value in response.headers.multi_items()
+            if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def aclose(self):
+        if self.inner is not None:
+            await self.inner.aclose()
+
+
+_cassette = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette():
+    """
+    Return the shared cassette, or None when CASSETTE_MODE is off
+    """
+    global _cassette
+
+    if mode() == "off":
+        return None
+
+    if _cassette is None:
+        with _cassette_lock:
+            if _cassette is None:
+                _cassette = Cassette(os.getenv("CASSETTE_PATH", DEFAULT_CASSETTE_PATH))
+
+    return _cassette
+
+
+def transport(limits):
+    """
+    Transport for an httpx.AsyncClient: None (httpx's default) when
+    cassettes are off, otherwise one that records or replays
+    """
+    current = mode()
+    if current == "off":
+        return None
+
+    inner = httpx.AsyncHTTPTransport(limits=limits) if current == "record" else None
+    return CassetteTransport(get_cassette(), current, inner)
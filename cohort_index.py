@@ -0,0 +1,190 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+
+DEFAULT_COHORT_PATH = os.path.join(".cache", "cohort.sqlite")
+
+# Breakdown entries that are the same for everyone rank nobody
+SKIPPED_DIMENSIONS = ("ai_evaluation_reserved",)
+
+# Sorts after every username, for bisecting past all entries of one value
+_LAST = "\U0010ffff"
+
+
+def cohort_metrics(final_score, breakdown, engineering_score):
+    """
+    The indexed numbers of one report: "total", each breakdown dimension
+    and "engineering_depth"
+    """
+    metrics = {"total": final_score, "engineering_depth": engineering_score}
+    for name, value in breakdown.items():
+        if name not in SKIPPED_DIMENSIONS:
+            metrics[name] = value
+    return metrics
+
+
+class CohortIndex:
+    """
+    Scores of every analyzed candidate, for percentile ranks and top-k
+    leaderboards.
+
+    Each (metric, language) pair keeps a list of (-score, username) in
+    sorted order, so a rank is two bisects and a top-k is a slice, with
+    language None covering everyone. Entries persist in SQLite and are
+    loaded on start; a re-analyzed candidate replaces their old entry.
+    """
+
+    def __init__(self, path=DEFAULT_COHORT_PATH):
+        self.path = path
+
+        self._entries = {}
+        self._sorted = {}
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS candidates (
+                    username TEXT PRIMARY KEY,
+                    login TEXT NOT NULL,
+                    metrics TEXT NOT NULL,
+                    languages TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+            self._load()
+
+    def _load(self):
+        rows = self._conn.execute(
+            "SELECT username, login, metrics, languages FROM candidates"
+        ).fetchall()
+
+        for key, login, metrics, languages in rows:
+            self._entries[key] = (login, json.loads(metrics), json.loads(languages))
+
+        # One sort per list instead of an insort per row
+        for key, (_, metrics, languages) in self._entries.items():
+            for metric, value in metrics.items():
+                for language in (None, *languages):
+                    self._sorted.setdefault((metric, language), []).append((-value, key))
+        for entries in self._sorted.values():
+            entries.sort()
+
+    def add(self, login, metrics, languages):
+        """
+        Insert or replace a candidate's scores; `languages` are the
+        languages of their repositories
+        """
+        key = login.lower()
+        languages = sorted({language.lower() for language in languages if language})
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (login, metrics, languages)
+            for metric, value in metrics.items():
+                for language in (None, *languages):
+                    insort(self._sorted.setdefault((metric, language), []), (-value, key))
+
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO candidates (username, login, metrics, languages, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, login, json.dumps(metrics), json.dumps(languages), time.time())
+                )
+                self._conn.commit()
+
+    def _remove(self, key):
+        previous = self._entries.pop(key, None)
+        if previous is None:
+            return
+
+        _, metrics, languages = previous
+        for metric, value in metrics.items():
+            for language in (None, *languages):
+                entries = self._sorted[(metric, language)]
+                index = bisect_left(entries, (-value, key))
+                if index < len(entries) and entries[index] == (-value, key):
+                    del entries[index]
+
+    def percentile(self, metric, score, language=None):
+        """
+        Percent of the cohort scoring below `score`, counting ties as
+        half; None when the cohort is empty
+        """
+        with self._lock:
+            entries = self._sorted.get((metric, language.lower() if language else None), [])
+            if not entries:
+                return None
+
+            first = bisect_left(entries, (-score, ""))
+            after = bisect_right(entries, (-score, _LAST))
+            below = len(entries) - after
+            ties = after - first
+
+        return round(100 * (below + 0.5 * ties) / len(entries), 1)
+
+    def ranks(self, username, language=None):
+        """
+        {metric: {"score", "percentile"}} for an indexed candidate, or None
+        """
+        with self._lock:
+            entry = self._entries.get(username.lower())
+        if entry is None:
+            return None
+
+        return {
+            metric: {"score": value, "percentile": self.percentile(metric, value, language)}
+            for metric, value in entry[1].items()
+        }
+
+    def top(self, metric, k=10, language=None):
+        """
+        The `k` highest scorers on `metric`, best first
+        """
+        with self._lock:
+            entries = self._sorted.get((metric, language.lower() if language else None), [])
+            return [
+                {"username": self._entries[key][0], "score": -negative}
+                for negative, key in entries[:k]
+            ]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "candidates": len(self._entries),
+                "metrics": sorted({metric for metric, language in self._sorted if language is None}),
+                "languages": sorted({language for _, language in self._sorted if language})
+            }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_cohort_index():
+    """
+    Return the shared cohort index, or None when disabled via COHORT_INDEX=0
+    """
+    global _index
+
+    if os.getenv("COHORT_INDEX", "1") == "0":
+        return None
+
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CohortIndex(os.getenv("COHORT_INDEX_PATH", DEFAULT_COHORT_PATH))
+
+    return _index
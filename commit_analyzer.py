@@ -1,58 +1,123 @@
-from datetime import datetime
+from datetime import datetime, timezone
 
+from keyword_matcher import default_matcher
 
-def analyze_commit_patterns(commits):
+DAY = 86400
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def _utc_naive(date_str):
     """
-    Analyze commit frequency and detect burst patterns
+    Rewrite an ISO timestamp as naive UTC so NumPy can parse it
     """
-    if not commits:
-        return {
-            "consistency_score": 0,
-            "burst_detected": True,
-            "message_quality_score": 0,
-            "meaningless_commit_ratio": 1
-        }
+    if date_str.endswith("Z"):
+        return date_str[:-1]
 
-    commit_dates = []
-    meaningful_count = 0
-    meaningless_keywords = ["update", "fix", "changes", "minor", "test"]
+    parsed = datetime.fromisoformat(date_str)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat()
+
+
+def extract_commit_features(commits):
+    """
+    Turn GitHub commit payloads into (timestamps, meaningful) arrays:
+    epoch seconds as int64 and a bool flag per commit message
+    """
+    # numpy stays out of the import path of the API and dashboard
+    import numpy as np
+
+    dates = []
+    messages = []
 
     for commit in commits:
-        date_str = commit["commit"]["author"]["date"]
-        commit_dates.append(datetime.fromisoformat(date_str.replace("Z", "+00:00")))
+        dates.append(_utc_naive(commit["commit"]["author"]["date"]))
+        messages.append(commit["commit"]["message"])
+
+    timestamps = np.array(dates, dtype="datetime64[s]").astype(np.int64)
+    low_signal = np.array(default_matcher.flags(messages, "low_signal"), dtype=bool)
+    return timestamps, ~low_signal
+
+
+def _window_max(timestamps, seconds):
+    """
+    Largest number of commits inside any window of `seconds`
+    (timestamps must be sorted)
+    """
+    import numpy as np
 
-        message = commit["commit"]["message"].lower()
+    ends = np.searchsorted(timestamps, timestamps + seconds, side="left")
+    return int((ends - np.arange(len(timestamps))).max())
 
-        if not any(word in message for word in meaningless_keywords):
-            meaningful_count += 1
 
-    # Consistency calculation
-    commit_dates.sort()
-    gaps = []
+def analyze_commit_arrays(timestamps, meaningful):
+    """
+    Vectorized commit analysis over epoch-second timestamps and
+    per-commit meaningful-message flags
+    """
+    import numpy as np
 
-    for i in range(1, len(commit_dates)):
-        gap = (commit_dates[i] - commit_dates[i - 1]).days
-        gaps.append(gap)
+    total_commits = len(timestamps)
+
+    if total_commits == 0:
+        return {
+            "consistency_score": 0,
+            "burst_detected": True,
+            "message_quality_score": 0,
+            "meaningless_commit_ratio": 1
+        }
 
-    max_gap = max(gaps) if gaps else 0
+    timestamps = np.sort(np.asarray(timestamps, dtype=np.int64))
+    meaningful_count = int(np.count_nonzero(meaningful))
+
+    # Consistency calculation: longest gap between consecutive commits, in whole days
+    gaps = np.diff(timestamps) // DAY
+    max_gap = int(gaps.max()) if len(gaps) else 0
 
     consistency_score = max(0, 15 - max_gap)
     consistency_score = min(consistency_score, 15)
 
     # Burst detection (more than 5 commits in same day)
-    date_counts = {}
-    for d in commit_dates:
-        day = d.date()
-        date_counts[day] = date_counts.get(day, 0) + 1
+    days = timestamps // DAY
+    _, day_counts = np.unique(days, return_counts=True)
+    burst_days = int(np.count_nonzero(day_counts > 5))
 
-    burst_detected = any(count > 5 for count in date_counts.values())
+    # Weekly cadence: 1970-01-01 was a Thursday, so shift to Monday = 0
+    weekday_counts = np.bincount((days + 3) % 7, minlength=7)
+    weeks = (days + 3) // 7
+    _, week_counts = np.unique(weeks, return_counts=True)
+    span_weeks = int(weeks[-1] - weeks[0]) + 1
 
-    meaningless_ratio = 1 - (meaningful_count / len(commits))
-    message_quality_score = int((meaningful_count / len(commits)) * 15)
+    meaningless_ratio = 1 - (meaningful_count / total_commits)
+    message_quality_score = int((meaningful_count / total_commits) * 15)
 
     return {
         "consistency_score": consistency_score,
-        "burst_detected": burst_detected,
+        "burst_detected": burst_days > 0,
         "message_quality_score": message_quality_score,
-        "meaningless_commit_ratio": round(meaningless_ratio, 2)
+        "meaningless_commit_ratio": round(meaningless_ratio, 2),
+        "total_commits": total_commits,
+        "active_days": len(day_counts),
+        "max_gap_days": max_gap,
+        "median_gap_days": float(np.median(gaps)) if len(gaps) else 0.0,
+        "burst_days": burst_days,
+        "rolling_activity": {
+            "max_commits_7_days": _window_max(timestamps, 7 * DAY),
+            "max_commits_30_days": _window_max(timestamps, 30 * DAY)
+        },
+        "weekly_cadence": {
+            "weekday_histogram": dict(zip(WEEKDAYS, weekday_counts.tolist())),
+            "active_weeks": len(week_counts),
+            "active_week_ratio": round(len(week_counts) / span_weeks, 2),
+            "max_commits_per_week": int(week_counts.max()),
+            "mean_commits_per_active_week": round(float(week_counts.mean()), 2)
+        }
     }
+
+
+def analyze_commit_patterns(commits):
+    """
+    Analyze commit frequency and detect burst patterns
+    """
+    return analyze_commit_arrays(*extract_commit_features(commits))
+
@@ -1,148 +1,98 @@
-import streamlit as st
-import matplotlib.pyplot as plt
-import numpy as np
-import requests
-
-from github_service import (
-    get_user_profile,
-    get_user_repos,
-    get_repo_readme,
-    get_repo_commits
-)
-from scoring_engine import calculate_portfolio_score
-from commit_analyzer import analyze_commit_patterns
-from ai_evaluator import (
-    evaluate_readme,
-    recruiter_screening_summary,
-    generate_growth_roadmap
-)
-from red_flag_engine import detect_red_flags
-from engineering_depth import analyze_engineering_depth
-
+import os
 
-st.set_page_config(page_title="GitHub Portfolio Analyzer", layout="wide")
-
-st.title("🚀 GitHub Portfolio Analyzer")
-st.markdown("AI-Powered Recruiter Style GitHub Evaluation")
-
-st.markdown("""
-### 🎯 What This Tool Does
-- Evaluates GitHub from a recruiter’s perspective  
-- Generates an objective portfolio score  
-- Detects red flags  
-- Highlights strongest projects  
-- Provides a 30-day improvement roadmap  
-""")
-
-profile_input = st.text_input(
-    "Enter GitHub Profile URL",
-    placeholder="https://github.com/username"
-)
+import streamlit as st
+from dotenv import load_dotenv
 
-if st.button("Analyze Profile") and profile_input:
+import ai_evaluator
+import github_service
+from async_runtime import iterate_sync, run_sync
+from pipeline import REPORT_SECTIONS, iter_report_sections
+from rate_limiter import GitHubRateLimitError
+from report_cache import ReportCache, get_report_cache, report_key
 
-    username = profile_input.rstrip("/").split("/")[-1]
 
-    with st.spinner("Analyzing profile..."):
+load_dotenv()
 
-        profile = get_user_profile(username)
+# How long reports are reused across reruns and sessions when the shared
+# report cache is disabled
+CACHE_TTL = 600
 
-        if "error" in profile:
-            st.error("GitHub user not found.")
-            st.stop()
+async def _open_clients():
+    github_service.get_async_client()
+    if os.getenv("GROQ_API_KEY"):
+        ai_evaluator.get_async_client()
 
-        repos = get_user_repos(username)
 
-        # ---------- Score Calculation ----------
-        score_data = calculate_portfolio_score(profile, repos)
+@st.cache_resource(show_spinner=False)
+def service_runtime():
+    """
+    Open the service layer's caches and its pooled clients on the shared
+    background loop once per server process
+    """
+    github_service.get_http_cache()
+    github_service.get_scheduler()
+    ai_evaluator.get_llm_cache()
+    run_sync(_open_clients())
+    return True
 
-        readme_text = None
-        if repos:
-            readme_text = get_repo_readme(username, repos[0]["name"])
 
-        ai_result = evaluate_readme(readme_text)
+@st.cache_resource(show_spinner=False)
+def dashboard_cache():
+    """
+    The shared report cache, or with REPORT_CACHE=0 a private one for this
+    server process, so reruns never repeat a fresh analysis
+    """
+    return get_report_cache() or ReportCache(ttl=CACHE_TTL, max_stale=0)
 
-        final_score = score_data["total_score"] + ai_result["readme_score"]
-        final_score = min(final_score, 100)
 
-        # ---------- Commit Analysis ----------
-        commits = []
-        if repos:
-            commits = get_repo_commits(username, repos[0]["name"])
+def render_radar_chart(breakdown):
+    # matplotlib and numpy are only needed once a report is drawn,
+    # so keep them out of the page's startup path
+    import matplotlib.pyplot as plt
+    import numpy as np
 
-        commit_data = analyze_commit_patterns(commits)
+    categories = list(breakdown.keys())
+    values = [min(v, 20) for v in breakdown.values()]
 
-        # ---------- Engineering Depth ----------
-        engineering_score = analyze_engineering_depth(repos)
+    angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
+    values += values[:1]
+    angles += angles[:1]
 
-        # ---------- Red Flags ----------
-        red_flags = detect_red_flags(profile, repos, commit_data, ai_result)
+    fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
+    ax.plot(angles, values)
+    ax.fill(angles, values, alpha=0.25)
 
-        # ---------- Recruiter Screening ----------
-        recruiter_result = recruiter_screening_summary(
-            username,
-            final_score,
-            score_data["breakdown"],
-            ai_result
-        )
+    ax.set_yticklabels([])
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(categories, fontsize=8)
 
-        # ---------- Growth Roadmap ----------
-        roadmap = generate_growth_roadmap(
-            username,
-            final_score,
-            score_data["breakdown"],
-            red_flags
-        )
+    st.subheader("📊 Score Breakdown")
+    st.pyplot(fig)
 
-        # ---------- Highlighted Projects ----------
-        top_repos = sorted(
-            repos,
-            key=lambda x: x.get("stargazers_count", 0),
-            reverse=True
-        )[:3]
-
-        top_repositories = [
-            {
-                "name": repo["name"],
-                "stars": repo["stargazers_count"],
-                "language": repo["language"],
-                "description": repo["description"]
-            }
-            for repo in top_repos
-        ]
-
-        # ---------- Issue & PR Activity ----------
-        repo_activity = []
-        for repo in top_repos:
-            issues_url = f"https://api.github.com/repos/{username}/{repo['name']}/issues"
-            pulls_url = f"https://api.github.com/repos/{username}/{repo['name']}/pulls"
-
-            issues = requests.get(issues_url).json()
-            pulls = requests.get(pulls_url).json()
-
-            repo_activity.append({
-                "repo": repo["name"],
-                "issues": len([i for i in issues if "pull_request" not in i]),
-                "prs": len(pulls)
-            })
-
-    # ================= DISPLAY SECTION =================
 
+def render_header(report):
     col1, col2 = st.columns([2, 1])
 
     with col1:
-        st.subheader(f"👤 Username: {profile.get('login')}")
+        st.subheader(f"👤 Username: {report['username']}")
 
     with col2:
-        st.metric("🎯 Portfolio Score", f"{final_score}/100")
+        if "github_portfolio_score" in report:
+            st.metric("🎯 Portfolio Score", f"{report['github_portfolio_score']}/100")
+        else:
+            st.metric("🎯 Portfolio Score", "…")
+
+    if report.get("mode") == "fast":
+        st.info("⚡ Fast mode: README, screening and roadmap come from rule-based heuristics, not the LLM.")
 
     st.divider()
 
-    # ---------- Highlighted Projects ----------
+
+def render_projects(report):
     st.subheader("🔝 Highlighted Projects")
 
-    if top_repositories:
-        for repo in top_repositories:
+    if report["top_repositories"]:
+        for repo in report["top_repositories"]:
             st.markdown(f"### {repo['name']}")
             st.write(f"⭐ Stars: {repo['stars']}")
             st.write(f"🔤 Language: {repo['language']}")
@@ -151,42 +101,81 @@ if st.button("Analyze Profile") and profile_input:
     else:
         st.info("No standout repositories detected.")
 
-    # ---------- Issue & PR Activity ----------
+
+def render_activity(report):
     st.subheader("📬 Issue & PR Activity")
 
-    for repo in repo_activity:
+    totals = report["activity_totals"]
+    st.caption(f"Across {totals['repos']} original repositories")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric("Open Issues", totals.get("open_issues", 0))
+        st.metric("Closed Issues", totals.get("closed_issues", 0))
+
+    with col2:
+        st.metric("Open PRs", totals.get("open_prs", 0))
+        st.metric("Closed PRs", totals.get("closed_prs", 0))
+
+    with col3:
+        st.metric("Merged PRs", totals.get("merged_prs", 0))
+        if totals.get("merged_unknown"):
+            st.caption(f"Merges unknown for {totals['merged_unknown']} repositories (search rate limited)")
+
+    for repo in report["repo_activity"]:
         st.markdown(f"### {repo['repo']}")
-        st.write(f"Issues: {repo['issues']}")
-        st.write(f"Pull Requests: {repo['prs']}")
+        st.write(f"Issues: {repo['issues']} ({repo['open_issues']} open, {repo['closed_issues']} closed)")
+        merged = "unknown" if repo.get("merged_unknown") else repo["merged_prs"]
+        st.write(
+            f"Pull Requests: {repo['prs']} ({repo['open_prs']} open, "
+            f"{merged} merged, {repo['closed_prs']} closed)"
+        )
         st.markdown("---")
 
-    # ---------- Radar Chart ----------
-    breakdown = score_data["breakdown"]
 
-    categories = list(breakdown.keys())
-    values = [min(v, 20) for v in breakdown.values()]
+def render_breakdown(report):
+    render_radar_chart(report["score_breakdown"])
 
-    angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
-    values += values[:1]
-    angles += angles[:1]
+    st.divider()
 
-    fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-    ax.plot(angles, values)
-    ax.fill(angles, values, alpha=0.25)
 
-    ax.set_yticklabels([])
-    ax.set_xticks(angles[:-1])
-    ax.set_xticklabels(categories, fontsize=8)
+def render_cohort(report):
+    ranks = report["cohort_rank"]
+    if not ranks:
+        return
 
-    st.subheader("📊 Score Breakdown")
-    st.pyplot(fig)
+    st.subheader("🏁 Cohort Ranking")
+    st.caption("Percent of previously analyzed candidates scoring below this profile")
+
+    total = ranks.get("total")
+    if total:
+        st.metric("Overall Percentile", f"{total['percentile']}%")
+
+    for metric, rank in ranks.items():
+        if metric != "total":
+            st.write(f"{metric.replace('_', ' ').title()}: {rank['score']} "
+                     f"(percentile {rank['percentile']})")
 
     st.divider()
 
-    # ---------- README ----------
+
+def render_readme(report):
+    ai_result = report["readme_evaluation"]
+
     st.subheader("📄 README Evaluation")
     st.write(f"**README Score:** {ai_result['readme_score']}/20")
 
+    if ai_result.get("repos"):
+        st.caption(
+            f"{len(ai_result['repos'])} of {ai_result['readmes_found']} READMEs evaluated "
+            f"({ai_result['unique_readmes']} unique, {ai_result['templates_skipped']} starter templates skipped)"
+        )
+        for repo in ai_result["repos"]:
+            copies = f", {repo['copies']} near-identical copies" if repo["copies"] > 1 else ""
+            estimated = " (estimated from structure)" if repo.get("scored_by") == "structure" else ""
+            st.write(f"- {repo['repo']}: {repo['readme_score']}/20{copies}{estimated}")
+
     col1, col2 = st.columns(2)
 
     with col1:
@@ -201,7 +190,10 @@ if st.button("Analyze Profile") and profile_input:
 
     st.divider()
 
-    # ---------- Recruiter Screening ----------
+
+def render_screening(report):
+    recruiter_result = report["recruiter_screening"]
+
     st.subheader("🧠 Recruiter Screening Simulation")
 
     decision = recruiter_result["screening_decision"]
@@ -222,7 +214,10 @@ if st.button("Analyze Profile") and profile_input:
 
     st.divider()
 
-    # ---------- Commit Analysis ----------
+
+def render_commits(report):
+    commit_data = report["commit_analysis"]
+
     st.subheader("🛠 Commit Quality & Consistency Analysis")
 
     st.markdown("""
@@ -256,7 +251,8 @@ if st.button("Analyze Profile") and profile_input:
 
     st.divider()
 
-    # ---------- Red Flags ----------
+
+def render_red_flags(report):
     st.subheader("🚩 Risk Flags")
 
     st.markdown("""
@@ -270,15 +266,16 @@ if st.button("Analyze Profile") and profile_input:
     - Very low public repository count  
     """)
 
-    if red_flags:
-        for flag in red_flags:
+    if report["red_flags"]:
+        for flag in report["red_flags"]:
             st.error(f"⚠ {flag}")
     else:
         st.success("No major red flags detected.")
 
     st.divider()
 
-    # ---------- Engineering Depth ----------
+
+def render_engineering(report):
     st.subheader("🧠 Engineering Depth Score")
 
     st.markdown("""
@@ -291,16 +288,149 @@ if st.button("Analyze Profile") and profile_input:
     - System-level project complexity  
     """)
 
-    st.metric("Engineering Depth", f"{engineering_score}/15")
+    st.metric("Engineering Depth", f"{report['engineering_depth_score']}/15")
 
     st.divider()
 
-    # ---------- Growth Plan ----------
+
+def render_roadmap(report):
     st.subheader("📅 30-Day GitHub Growth Plan")
 
-    for week, content in roadmap.items():
+    for week, content in report["growth_roadmap"].items():
+        if not week.startswith("week"):
+            continue
         st.markdown(f"## {week.capitalize()}")
         st.markdown(f"**Focus:** {content.get('focus')}")
 
         for task in content.get("tasks", []):
             st.write(f"- {task}")
+
+
+# Page layout, top to bottom: (slot, renderer, report keys it needs)
+SECTIONS = [
+    ("header", render_header, ["username"]),
+    ("projects", render_projects, ["top_repositories"]),
+    ("activity", render_activity, ["repo_activity", "activity_totals"]),
+    ("breakdown", render_breakdown, ["score_breakdown"]),
+    ("cohort", render_cohort, ["cohort_rank"]),
+    ("readme", render_readme, ["readme_evaluation"]),
+    ("screening", render_screening, ["recruiter_screening"]),
+    ("commits", render_commits, ["commit_analysis"]),
+    ("red_flags", render_red_flags, ["red_flags"]),
+    ("engineering", render_engineering, ["engineering_depth_score"]),
+    ("roadmap", render_roadmap, ["growth_roadmap"]),
+]
+
+
+class ReportView:
+    """
+    One placeholder per section, laid out up front so sections can be
+    filled in as their data arrives without reordering the page
+    """
+
+    def __init__(self):
+        self.report = {}
+        self.timings = {}
+        self.slots = {name: st.empty() for name, _, _ in SECTIONS}
+
+    def update(self, **values):
+        self.report.update(values)
+
+        for name, renderer, keys in SECTIONS:
+            if any(key in values for key in keys) and all(key in self.report for key in keys):
+                with self.slots[name].container():
+                    renderer(self.report)
+
+        # The header shows the score, which arrives after the username
+        if "github_portfolio_score" in values and "username" in self.report:
+            with self.slots["header"].container():
+                render_header(self.report)
+
+
+def analyze(username, view, mode="full"):
+    """
+    Fill `view` section by section; shows the error and returns False
+    when the user is unknown or GitHub or the LLM fails
+    """
+    cache = dashboard_cache()
+    key = report_key(username, mode)
+    cached = cache.peek(key)
+
+    if cached is not None:
+        view.update(**cached[0])
+        return True
+
+    timings = {}
+    with st.spinner("Analyzing profile..."):
+        try:
+            for section, value in iterate_sync(iter_report_sections(username, timings, mode)):
+                if section == "error":
+                    st.error("GitHub user not found.")
+                    return False
+                view.update(**{section: value})
+        except GitHubRateLimitError as e:
+            wait = f" Try again in {e.retry_after} seconds." if e.retry_after else ""
+            st.error(f"GitHub rate limit exhausted.{wait}")
+            return False
+        except github_service.GitHubServiceError as e:
+            st.error(f"GitHub request failed: {e}")
+            return False
+        except Exception as e:
+            # The LLM evaluators raise whatever the client raised
+            st.error(f"Analysis failed: {e or type(e).__name__}")
+            return False
+
+    view.timings = timings
+    cache.store(key, {section: view.report[section] for section in REPORT_SECTIONS})
+    return True
+
+
+st.set_page_config(page_title="GitHub Portfolio Analyzer", layout="wide")
+
+service_runtime()
+
+st.title("🚀 GitHub Portfolio Analyzer")
+st.markdown("AI-Powered Recruiter Style GitHub Evaluation")
+
+st.markdown("""
+### 🎯 What This Tool Does
+- Evaluates GitHub from a recruiter’s perspective  
+- Generates an objective portfolio score  
+- Detects red flags  
+- Highlights strongest projects  
+- Provides a 30-day improvement roadmap  
+""")
+
+profile_input = st.text_input(
+    "Enter GitHub Profile URL",
+    placeholder="https://github.com/username"
+)
+
+fast_mode = st.toggle(
+    "Fast mode (no LLM calls)",
+    help="Scores README structure and builds the screening and roadmap from rules, "
+         "looking into only the top 5 repositories"
+)
+
+if st.button("Analyze Profile") and profile_input:
+
+    username = profile_input.rstrip("/").split("/")[-1]
+
+    # Drop the previous report first so a failed lookup does not leave it on screen
+    st.session_state.pop("report", None)
+
+    view = ReportView()
+    if not analyze(username, view, "fast" if fast_mode else "full"):
+        st.stop()
+
+    st.session_state["report"] = view.report
+
+    if view.timings:
+        with st.expander("⏱ Stage timings"):
+            st.json(view.timings)
+
+elif "report" in st.session_state:
+    # Any other widget interaction reruns the script; redraw the last
+    # report from session state instead of recomputing it
+    view = ReportView()
+    view.update(**st.session_state["report"])
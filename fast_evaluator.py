@@ -0,0 +1,253 @@
+"""
+Deterministic stand-ins for the three LLM evaluations, used by
+mode=fast. They return the same shapes as ai_evaluator, each marked
+with "generated_by": GENERATED_BY.
+"""
+from readme_selection import structure_features, structure_score
+from red_flag_engine import (
+    FEW_REPOS,
+    INACTIVITY_GAPS,
+    LOW_QUALITY_COMMITS,
+    MOSTLY_FORKS,
+    NO_README
+)
+
+GENERATED_BY = "fast-heuristics"
+
+# Screening thresholds on the 0-100 screening score
+PASS_SCORE = 70
+REJECT_SCORE = 45
+
+# Highest value of each calculate_portfolio_score breakdown dimension
+DIMENSION_MAX = {
+    "Repository Organization": 15,
+    "Impact & Visibility": 30,
+    "Project Impact": 20,
+    "Technical Depth": 15,
+    "Original Work Ratio": 20
+}
+
+# (strength, improvement) per README feature
+README_FEATURES = [
+    ("install_section", "Installation steps are documented",
+     "Add installation or setup instructions"),
+    ("usage_section", "Usage is explained",
+     "Add a usage section with a runnable example"),
+    ("code_blocks", "Includes code samples",
+     "Show commands or code in fenced code blocks"),
+    ("images", "Uses screenshots or diagrams",
+     "Add a screenshot or architecture diagram"),
+    ("links", "Links to docs, demos or dependencies",
+     "Link to a live demo or further documentation")
+]
+
+# Roadmap week per red flag rule, in the order they should be tackled
+FLAG_WEEKS = {
+    NO_README: {
+        "focus": "Document Your Projects",
+        "tasks": [
+            "Write a README for your 3 strongest repositories",
+            "Add installation and usage sections with code blocks",
+            "Add a screenshot or architecture diagram to each"
+        ]
+    },
+    MOSTLY_FORKS: {
+        "focus": "Show Original Work",
+        "tasks": [
+            "Archive or delete forks you never changed",
+            "Start one original project that solves a real problem",
+            "Pin your own repositories above any forks"
+        ]
+    },
+    INACTIVITY_GAPS: {
+        "focus": "Build a Consistent Commit Rhythm",
+        "tasks": [
+            "Commit to one project at least 4 days a week",
+            "Split large changes into several focused commits",
+            "Close 3 open issues in your own repositories"
+        ]
+    },
+    LOW_QUALITY_COMMITS: {
+        "focus": "Write Meaningful Commit Messages",
+        "tasks": [
+            "Use imperative, descriptive messages such as \"Add pagination to search\"",
+            "Avoid messages like \"update\" or \"fix\" for the rest of the month",
+            "Reword the vague messages on an unmerged branch before pushing"
+        ]
+    },
+    FEW_REPOS: {
+        "focus": "Grow Your Public Portfolio",
+        "tasks": [
+            "Publish 2 finished projects from your local machine",
+            "Give each one a description, topics and a README",
+            "Make one of them a deployed, usable app"
+        ]
+    }
+}
+
+# Roadmap week for a weak breakdown dimension
+DIMENSION_WEEKS = {
+    "Repository Organization": {
+        "focus": "Organize Your Repositories",
+        "tasks": [
+            "Add descriptions and topics to every public repository",
+            "Archive abandoned experiments",
+            "Pin your 3 strongest repositories"
+        ]
+    },
+    "Impact & Visibility": {
+        "focus": "Increase Visibility",
+        "tasks": [
+            "Share one project in a relevant community or forum",
+            "Write a short post explaining a technical decision",
+            "Contribute a fix to an open-source project you use"
+        ]
+    },
+    "Project Impact": {
+        "focus": "Ship Something People Use",
+        "tasks": [
+            "Deploy your best project and link the live demo",
+            "Add measurable outcomes to its README",
+            "Respond to issues and feedback within a week"
+        ]
+    },
+    "Technical Depth": {
+        "focus": "Broaden Your Stack",
+        "tasks": [
+            "Add a database layer to one existing project",
+            "Build a small project in a second language",
+            "Add automated tests and a CI workflow"
+        ]
+    },
+    "Original Work Ratio": {
+        "focus": "Show Original Work",
+        "tasks": [
+            "Start one original project from scratch",
+            "Archive forks you have not modified",
+            "Document the design choices in your own projects"
+        ]
+    }
+}
+
+FALLBACK_WEEK = {
+    "focus": "Polish and Signal",
+    "tasks": [
+        "Add tests to your strongest project",
+        "Tag a release with a changelog",
+        "Update your GitHub profile README with your focus areas"
+    ]
+}
+
+
+def evaluate_readmes(selection):
+    """
+    Score the selected READMEs out of 20 from their markdown structure
+    """
+    selected = selection["selected"] if selection else []
+    if not selected:
+        return {
+            "readme_score": 0,
+            "strengths": [],
+            "improvements": ["No README found."],
+            "repos": [],
+            "generated_by": GENERATED_BY
+        }
+
+    features = [structure_features(entry["text"]) for entry in selected]
+    repos = [
+        {
+            "repo": entry["repo"],
+            "readme_score": round(structure_score(entry["text"], found) / 5),
+            "structure_score": entry["structure_score"],
+            "copies": entry["copies"]
+        }
+        for entry, found in zip(selected, features)
+    ]
+
+    strengths = []
+    improvements = []
+    for feature, strength, improvement in README_FEATURES:
+        # Judged on the best README: one good example counts
+        if features[0][feature]:
+            strengths.append(strength)
+        else:
+            improvements.append(improvement)
+    if features[0]["words"] < 150:
+        improvements.append("Explain what the project does and why in a few paragraphs")
+
+    return {
+        "readme_score": round(sum(repo["readme_score"] for repo in repos) / len(repos)),
+        "strengths": strengths[:3],
+        "improvements": improvements[:3],
+        "repos": repos,
+        "readmes_found": selection["readmes_found"],
+        "unique_readmes": selection["unique_readmes"],
+        "templates_skipped": selection["templates_skipped"],
+        "generated_by": GENERATED_BY
+    }
+
+
+def _weakest_dimensions(breakdown):
+    """
+    Breakdown dimensions ordered from the lowest share of their maximum
+    """
+    shares = {
+        name: breakdown.get(name, 0) / maximum
+        for name, maximum in DIMENSION_MAX.items()
+    }
+    return sorted(shares, key=lambda name: (shares[name], name))
+
+
+def recruiter_screening(username, screening_score, breakdown, readme_eval, red_flags):
+    """
+    Pass on score thresholds, held back by each red flag
+    """
+    if screening_score >= PASS_SCORE and len(red_flags) <= 1:
+        decision = "Yes"
+    elif screening_score < REJECT_SCORE or len(red_flags) >= 3:
+        decision = "No"
+    else:
+        decision = "Borderline"
+
+    weakest = _weakest_dimensions(breakdown)
+    strongest = weakest[-1]
+    summary = (
+        f"{username} scores {screening_score}/100 on the initial screen. "
+        f"Strongest area: {strongest} ({breakdown.get(strongest, 0)}/{DIMENSION_MAX[strongest]}); "
+        f"weakest: {weakest[0]} ({breakdown.get(weakest[0], 0)}/{DIMENSION_MAX[weakest[0]]}). "
+        f"README score {readme_eval.get('readme_score', 0)}/20. "
+        + (f"{len(red_flags)} red flag(s): {' '.join(red_flags)}" if red_flags else "No red flags.")
+    )
+
+    improvements = [FLAG_WEEKS[flag]["tasks"][0] for flag in red_flags if flag in FLAG_WEEKS]
+    improvements += [DIMENSION_WEEKS[name]["tasks"][0] for name in weakest]
+
+    return {
+        "screening_decision": decision,
+        "recruiter_summary": summary,
+        "top_improvements": list(dict.fromkeys(improvements))[:3],
+        "generated_by": GENERATED_BY
+    }
+
+
+def growth_roadmap(username, final_score, breakdown, red_flags):
+    """
+    Four weeks: one per fired red flag rule, then the weakest breakdown
+    dimensions, then a general polishing week
+    """
+    weeks = [FLAG_WEEKS[flag] for flag in red_flags if flag in FLAG_WEEKS]
+    weeks += [DIMENSION_WEEKS[name] for name in _weakest_dimensions(breakdown)]
+    weeks.append(FALLBACK_WEEK)
+
+    plan = []
+    for week in weeks:
+        # Forks show up both as a flag and as a weak dimension
+        if all(week["focus"] != chosen["focus"] for chosen in plan):
+            plan.append(week)
+
+    roadmap = {
+        f"week{number}": {"focus": week["focus"], "tasks": list(week["tasks"])}
+        for number, week in enumerate(plan[:4], 1)
+    }
+    roadmap["generated_by"] = GENERATED_BY
+    return roadmap
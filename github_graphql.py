@@ -0,0 +1,249 @@
+import asyncio
+import os
+import threading
+import time
+
+from async_runtime import LoopLocal
+from github_service import (
+    DEFAULT_COMMIT_LIMIT,
+    GitHubServiceError,
+    RepoRecord,
+    api_base_url,
+    post_graphql_async
+)
+
+REPO_PAGE_SIZE = 50
+MEMO_TTL = 60
+
+# Where REST /readme finds a README, most common first: the root in any
+# usual case and extension, then docs/ and .github/
+README_PATHS = (
+    "README.md", "readme.md", "Readme.md", "README", "README.markdown",
+    "README.rst", "README.txt", "docs/README.md", ".github/README.md"
+)
+README_FIELDS = "\n".join(
+    f'        readme{i}: object(expression: "HEAD:{path}") {{ ... on Blob {{ text }} }}'
+    for i, path in enumerate(README_PATHS)
+)
+
+USER_QUERY = """
+query($login: String!, $after: String, $repoPageSize: Int!, $commitCount: Int!) {
+  user(login: $login) {
+    login
+    name
+    bio
+    company
+    location
+    avatarUrl
+    url
+    createdAt
+    followers { totalCount }
+    following { totalCount }
+    repositories(
+      first: $repoPageSize
+      after: $after
+      privacy: PUBLIC
+      ownerAffiliations: OWNER
+      orderBy: {field: NAME, direction: ASC}
+    ) {
+      totalCount
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        description
+        url
+        isFork
+        stargazerCount
+        forkCount
+        diskUsage
+        pushedAt
+        primaryLanguage { name }
+        openIssues: issues(states: OPEN) { totalCount }
+        closedIssues: issues(states: CLOSED) { totalCount }
+        openPRs: pullRequests(states: OPEN) { totalCount }
+        closedPRs: pullRequests(states: CLOSED) { totalCount }
+        mergedPRs: pullRequests(states: MERGED) { totalCount }
+""" + README_FIELDS + """
+        defaultBranchRef {
+          target {
+            ... on Commit {
+              history(first: $commitCount) {
+                nodes { oid message authoredDate }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def graphql_url():
+    return os.getenv("GITHUB_GRAPHQL_URL", f"{api_base_url()}/graphql")
+
+
+def _to_profile(user, repo_total):
+    """
+    Shape a GraphQL user like the REST /users/{username} payload
+    """
+    return {
+        "login": user["login"],
+        "name": user.get("name"),
+        "bio": user.get("bio"),
+        "company": user.get("company"),
+        "location": user.get("location"),
+        "avatar_url": user.get("avatarUrl"),
+        "html_url": user.get("url"),
+        "created_at": user.get("createdAt"),
+        "followers": user["followers"]["totalCount"],
+        "following": user["following"]["totalCount"],
+        "public_repos": repo_total
+    }
+
+
+def _to_repo(node):
+    """
+    Project a GraphQL repository node onto the RepoRecord REST repos use
+    """
+    language = node.get("primaryLanguage") or {}
+
+    return RepoRecord(
+        node["name"],
+        stars=node["stargazerCount"],
+        language=language.get("name"),
+        fork=node["isFork"],
+        description=node.get("description"),
+        pushed_at=node.get("pushedAt"),
+        size=node.get("diskUsage") or 0
+    )
+
+
+def _to_commits(node):
+    """
+    Shape the default-branch history like REST /commits items
+    """
+    branch = node.get("defaultBranchRef") or {}
+    history = (branch.get("target") or {}).get("history") or {}
+
+    return [
+        {
+            "sha": commit["oid"],
+            "commit": {
+                "message": commit["message"],
+                "author": {"date": commit["authoredDate"]}
+            }
+        }
+        for commit in history.get("nodes", [])
+    ]
+
+
+def _to_activity(node):
+    """
+    Shape the issue and PR counts like github_service activity counts;
+    GraphQL's CLOSED pull requests already exclude merged ones
+    """
+    counts = {
+        "open_issues": node["openIssues"]["totalCount"],
+        "closed_issues": node["closedIssues"]["totalCount"],
+        "open_prs": node["openPRs"]["totalCount"],
+        "closed_prs": node["closedPRs"]["totalCount"],
+        "merged_prs": node["mergedPRs"]["totalCount"]
+    }
+    counts["total_issues"] = counts["open_issues"] + counts["closed_issues"]
+    counts["total_prs"] = counts["open_prs"] + counts["closed_prs"] + counts["merged_prs"]
+    return counts
+
+
+def _readme_text(node):
+    """
+    Text of the first README_PATHS entry the repository has
+    """
+    for i in range(len(README_PATHS)):
+        blob = node.get(f"readme{i}")
+        if blob and blob.get("text"):
+            return blob["text"]
+    return None
+
+
+async def _query_user(username: str):
+    """
+    Page through the user's repositories and collect everything the
+    analyzers need. Returns None when the user does not exist.
+    """
+    data = {"profile": None, "repos": [], "readmes": {}, "commits": {}, "activity": {}}
+    after = None
+
+    while True:
+        payload = await post_graphql_async(
+            graphql_url(),
+            USER_QUERY,
+            {
+                "login": username,
+                "after": after,
+                "repoPageSize": REPO_PAGE_SIZE,
+                "commitCount": DEFAULT_COMMIT_LIMIT
+            }
+        )
+
+        user = (payload.get("data") or {}).get("user")
+        errors = payload.get("errors") or []
+
+        if user is None:
+            if all(error.get("type") == "NOT_FOUND" for error in errors):
+                return None
+            raise GitHubServiceError(f"GraphQL query failed: {errors}")
+
+        repositories = user["repositories"]
+        if data["profile"] is None:
+            data["profile"] = _to_profile(user, repositories["totalCount"])
+
+        for node in repositories["nodes"]:
+            name = node["name"]
+            data["repos"].append(_to_repo(node))
+            data["readmes"][name] = _readme_text(node)
+            data["commits"][name] = _to_commits(node)
+            data["activity"][name] = _to_activity(node)
+
+        page = repositories["pageInfo"]
+        if not page["hasNextPage"]:
+            return data
+        after = page["endCursor"]
+
+
+_memo = {}
+_memo_lock = threading.Lock()
+_inflight = LoopLocal(dict)
+
+
+async def fetch_user_data_async(username: str):
+    """
+    Return the user's profile, repos, READMEs, commits and activity from
+    one paginated query. Results are reused for a short time so the
+    per-resource fetchers in github_service all share one query.
+    """
+    key = username.lower()
+
+    with _memo_lock:
+        cached = _memo.get(key)
+        if cached and time.monotonic() - cached[0] < MEMO_TTL:
+            return cached[1]
+
+    inflight = _inflight.get()
+    task = inflight.get(key)
+
+    if task is None:
+        task = asyncio.ensure_future(_query_user(username))
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+
+    data = await asyncio.shield(task)
+
+    with _memo_lock:
+        now = time.monotonic()
+        for stale in [name for name, (at, _) in _memo.items() if now - at >= MEMO_TTL]:
+            del _memo[stale]
+        _memo[key] = (now, data)
+
+    return data
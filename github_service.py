@@ -1,70 +1,704 @@
-import requests
+import asyncio
+import os
+import threading
+import time
+from datetime import timezone
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+import cassette
+import metrics
+from async_runtime import LoopLocal, iterate_sync, run_sync
+from http_cache import DEFAULT_CACHE_PATH, HTTPCache
+from rate_limiter import (
+    GitHubRateLimitError,
+    RateLimitScheduler,
+    SECONDARY_BACKOFF,
+    classify_limit_response,
+    load_tokens,
+    resource_for_path,
+    retry_after_seconds
+)
 
 GITHUB_BASE_URL = "https://api.github.com"
+PAGE_SIZE = 100
+DEFAULT_COMMIT_LIMIT = 100
+MAX_ATTEMPTS = 5
+# Server errors are retried this many times, SERVER_ERROR_BACKOFF apart
+# (doubling), before the response is handed back
+SERVER_ERROR_RETRIES = 2
+SERVER_ERROR_BACKOFF = 0.5
+SERVER_ERRORS = (500, 502, 503, 504)
+# Statuses that mean "skip this repository" for per-repo resources:
+# 409 is an empty repository, 451 one blocked for legal reasons, and a
+# server error that outlived its retries only loses that one repo
+REPO_MISSING = (404, 409, 451) + SERVER_ERRORS
+ACTIVITY_CONCURRENCY = 8
+README_CONCURRENCY = 8
 
 
-def get_user_profile(username: str):
+class GitHubServiceError(Exception):
     """
-    Fetch basic GitHub user profile data
+    Raised for GitHub responses that are neither data nor a plain 404,
+    so they are not mistaken for an empty account
+    """
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class RepoRecord:
+    """
+    The repository fields the analyzers read. REST and GraphQL payloads
+    (about a hundred keys per repo) are projected onto this on arrival.
+    """
+
+    __slots__ = ("name", "stars", "language", "fork", "description",
+                 "pushed_at", "size", "open_issues")
+
+    def __init__(self, name, stars=0, language=None, fork=False, description=None,
+                 pushed_at=None, size=0, open_issues=None):
+        self.name = name
+        self.stars = stars
+        self.language = language
+        self.fork = fork
+        self.description = description
+        self.pushed_at = pushed_at
+        self.size = size
+        # Open issues plus open PRs, as REST reports it; lets the activity
+        # counts skip requests for repos with nothing open
+        self.open_issues = open_issues
+
+    @classmethod
+    def from_rest(cls, repo):
+        """
+        Project a REST /users/{username}/repos item
+        """
+        return cls(
+            repo["name"],
+            repo.get("stargazers_count") or 0,
+            repo.get("language"),
+            bool(repo.get("fork")),
+            repo.get("description"),
+            repo.get("pushed_at"),
+            repo.get("size") or 0,
+            repo.get("open_issues_count")
+        )
+
+    def __repr__(self):
+        return f"RepoRecord({self.name!r}, stars={self.stars}, fork={self.fork})"
+
+
+def api_base_url():
+    """
+    GitHub REST root; GITHUB_BASE_URL points it at a stand-in such as
+    `python -m stubs.github_rest`
+    """
+    return os.getenv("GITHUB_BASE_URL", GITHUB_BASE_URL).rstrip("/")
+
+
+def _build_client():
+    limits = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+    return httpx.AsyncClient(
+        base_url=api_base_url(),
+        headers={"Accept": "application/vnd.github+json"},
+        limits=limits,
+        transport=cassette.transport(limits),
+        timeout=httpx.Timeout(15.0)
+    )
+
+
+# One keep-alive pool per event loop, shared by every fetch below
+_client = LoopLocal(_build_client)
+
+
+def get_async_client():
+    """
+    Return the pooled GitHub client for the running event loop
+    """
+    return _client.get()
+
+
+async def close_async_client():
+    """
+    Close the pooled client bound to the running event loop, if any
+    """
+    client = _client.discard()
+    if client is not None:
+        await client.aclose()
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache():
     """
-    url = f"{GITHUB_BASE_URL}/users/{username}"
-    response = requests.get(url)
+    Return the shared conditional-request cache, or None when disabled
+    via GITHUB_HTTP_CACHE=0
+    """
+    global _http_cache
+
+    if os.getenv("GITHUB_HTTP_CACHE", "1") == "0":
+        return None
+
+    if _http_cache is None:
+        with _http_cache_lock:
+            if _http_cache is None:
+                max_mb = int(os.getenv("GITHUB_HTTP_CACHE_MAX_MB", "256"))
+                _http_cache = HTTPCache(
+                    path=os.getenv("GITHUB_HTTP_CACHE_PATH", DEFAULT_CACHE_PATH),
+                    max_bytes=max_mb * 1024 * 1024
+                )
+
+    return _http_cache
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """
+    Return the shared rate-limit scheduler over the configured tokens
+    """
+    global _scheduler
+
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = RateLimitScheduler(
+                    load_tokens(),
+                    max_wait=int(os.getenv("GITHUB_MAX_RATE_LIMIT_WAIT", "120"))
+                )
+
+    return _scheduler
+
+
+async def _send(request):
+    """
+    Send a request with a token from the pool, waiting out primary and
+    secondary rate limits instead of returning them to the caller.
+    Server errors are retried a few times, then returned.
+    """
+    client = get_async_client()
+    scheduler = get_scheduler()
+    resource = resource_for_path(request.url.path)
+    server_errors = 0
+
+    for attempt in range(MAX_ATTEMPTS):
+        token = await scheduler.acquire(resource)
+        if token:
+            request.headers["Authorization"] = f"Bearer {token}"
+        else:
+            request.headers.pop("Authorization", None)
+
+        started = time.perf_counter()
+        try:
+            response = await client.send(request)
+        except httpx.HTTPError:
+            metrics.observe_github(request.method, request.url.path, "error", time.perf_counter() - started)
+            raise
+        metrics.observe_github(
+            request.method, request.url.path, response.status_code, time.perf_counter() - started
+        )
+        scheduler.update(token, response.headers)
+
+        if response.status_code in SERVER_ERRORS and server_errors < SERVER_ERROR_RETRIES:
+            await response.aclose()
+            await asyncio.sleep(SERVER_ERROR_BACKOFF * 2 ** server_errors)
+            server_errors += 1
+            continue
 
+        limit = classify_limit_response(response)
+        if limit is None:
+            return response
+
+        await response.aclose()
+
+        if limit == "primary":
+            scheduler.mark_exhausted(
+                token,
+                response.headers.get("x-ratelimit-resource", resource),
+                float(response.headers.get("x-ratelimit-reset", 0))
+            )
+        else:
+            delay = retry_after_seconds(
+                response.headers.get("retry-after"), SECONDARY_BACKOFF * (attempt + 1)
+            )
+            scheduler.backoff(token, delay)
+
+    raise GitHubRateLimitError(
+        f"GitHub kept rate limiting {request.url.path}"
+    )
+
+
+def _check(response, missing=(404,)):
+    """
+    Return True for a 200, False for an expected "nothing here" status,
+    and raise for anything else
+    """
     if response.status_code == 200:
-        return response.json()
-    else:
-        return {"error": "User not found"}
+        return True
+
+    if response.status_code in missing:
+        if response.status_code == 404:
+            get_scheduler().record_not_found()
+        return False
+
+    raise GitHubServiceError(
+        f"GitHub returned {response.status_code} for {response.request.url.path}",
+        status_code=response.status_code
+    )
+
+
+# GETs currently on the wire, so concurrent identical fetches share one
+_inflight = LoopLocal(dict)
 
 
-def get_user_repos(username: str):
+async def _get(url: str, params=None, headers=None):
     """
-    Fetch public repositories of a user
+    Send a GET through the shared pool. Identical requests already in
+    flight on this loop are joined rather than sent again.
     """
-    url = f"{GITHUB_BASE_URL}/users/{username}/repos"
-    response = requests.get(url)
+    client = get_async_client()
+    request = client.build_request("GET", url, params=params, headers=headers)
+    key = f"{request.url}|{request.headers.get('accept', '')}"
+
+    inflight = _inflight.get()
+    task = inflight.get(key)
+
+    if task is None:
+        task = asyncio.ensure_future(_fetch(request, key))
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+
+    return await asyncio.shield(task)
+
+
+async def _fetch(request, key):
+    """
+    Revalidate `request` against the on-disk cache. A 304 is answered
+    with the stored body as a 200.
+    """
+    cache = get_http_cache()
+    if cache is None:
+        return await _send(request)
+
+    # Every SQLite read and write stays off the event loop
+    entry = await asyncio.to_thread(cache.lookup, key)
+    request.headers.update(cache.conditional_headers(entry))
+
+    response = await _send(request)
+
+    if response.status_code == 304 and entry is not None:
+        await asyncio.to_thread(cache.record_hit, key)
+        return httpx.Response(
+            200,
+            headers=entry["headers"],
+            content=entry["body"],
+            request=request
+        )
 
     if response.status_code == 200:
+        await asyncio.to_thread(cache.store, key, response.headers, response.content)
+
+    return response
+
+
+async def post_graphql_async(url: str, query: str, variables=None):
+    """
+    POST a GraphQL query through the shared pool and token scheduler
+    """
+    client = get_async_client()
+    request = client.build_request(
+        "POST", url, json={"query": query, "variables": variables or {}}
+    )
+
+    response = await _send(request)
+    _check(response, missing=())
+    return response.json()
+
+
+def use_graphql():
+    """
+    True when GITHUB_BACKEND=graphql selects the single-query backend
+    """
+    return os.getenv("GITHUB_BACKEND", "rest").lower() == "graphql"
+
+
+async def _graphql_user_data(username: str):
+    # Imported here because github_graphql builds on this module
+    from github_graphql import fetch_user_data_async
+    return await fetch_user_data_async(username)
+
+
+def _format_since(since):
+    """
+    Normalize a datetime or ISO string to GitHub's UTC timestamp format
+    """
+    if since is None or isinstance(since, str):
+        return since
+
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc)
+    return since.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+async def _paginate_async(path: str, params=None, max_items=None, missing=(404,)):
+    """
+    Yield items across every page of a list endpoint by following
+    the Link rel="next" header; a `missing` status ends the listing
+    """
+    url = path
+    page_size = PAGE_SIZE if max_items is None else min(PAGE_SIZE, max_items)
+    params = {"per_page": page_size, **(params or {})}
+    yielded = 0
+
+    while url:
+        if max_items is not None and yielded >= max_items:
+            return
+
+        response = await _get(url, params=params)
+        if not _check(response, missing):
+            return
+
+        for item in response.json():
+            yield item
+            yielded += 1
+            if max_items is not None and yielded >= max_items:
+                return
+
+        # The next link already carries the query string
+        url = response.links.get("next", {}).get("url")
+        params = None
+
+
+async def iter_user_repos_async(username: str, max_items=None, since=None):
+    """
+    Stream public repositories of a user page by page as RepoRecords.
+
+    With `since`, repos are requested newest-push first and the stream
+    stops at the first repo not pushed after that time.
+    """
+    since = _format_since(since)
+    params = {"sort": "pushed", "direction": "desc"} if since else None
+
+    async for item in _paginate_async(
+        f"/users/{username}/repos", params, max_items
+    ):
+        repo = RepoRecord.from_rest(item)
+        if since and (repo.pushed_at or "") <= since:
+            return
+        yield repo
+
+
+async def iter_repo_commits_async(username: str, repo_name: str,
+                                  max_items=None, since=None):
+    """
+    Stream commits of a repository, newest first
+    """
+    since = _format_since(since)
+    params = {"since": since} if since else None
+
+    async for commit in _paginate_async(
+        f"/repos/{username}/{repo_name}/commits", params, max_items, REPO_MISSING
+    ):
+        yield commit
+
+
+async def get_user_profile_async(username: str):
+    """
+    Fetch basic GitHub user profile data
+    """
+    if use_graphql():
+        data = await _graphql_user_data(username)
+        return data["profile"] if data else {"error": "User not found"}
+
+    response = await _get(f"/users/{username}")
+
+    if _check(response):
         return response.json()
     else:
-        return []
+        return {"error": "User not found"}
 
 
-def get_repo_readme(username: str, repo_name: str):
+async def get_user_repos_async(username: str, max_items=None, since=None):
+    """
+    Fetch all public repositories of a user
+    """
+    if use_graphql():
+        data = await _graphql_user_data(username)
+        repos = data["repos"] if data else []
+        since = _format_since(since)
+        if since:
+            repos = sorted(
+                [r for r in repos if (r.pushed_at or "") > since],
+                key=lambda r: r.pushed_at,
+                reverse=True
+            )
+        return repos[:max_items] if max_items is not None else repos
+
+    return [
+        repo async for repo in iter_user_repos_async(username, max_items, since)
+    ]
+
+
+async def get_repo_readme_async(username: str, repo_name: str):
     """
     Fetch README content of a repository
     """
-    url = f"{GITHUB_BASE_URL}/repos/{username}/{repo_name}/readme"
+    if use_graphql():
+        data = await _graphql_user_data(username)
+        return data["readmes"].get(repo_name) if data else None
+
     headers = {
         "Accept": "application/vnd.github.v3.raw"
     }
 
-    response = requests.get(url, headers=headers)
+    response = await _get(
+        f"/repos/{username}/{repo_name}/readme",
+        headers=headers
+    )
 
-    if response.status_code == 200:
+    if _check(response, REPO_MISSING):
         return response.text
     else:
         return None
 
 
-def get_repo_commits(username: str, repo_name: str):
+async def get_repo_readmes_async(username: str, repo_names):
     """
-    Fetch recent commits of a repository (limited to 30)
+    README text of every repo in `repo_names`, fetched concurrently;
+    returns {repo name: text or None}
     """
-    url = f"{GITHUB_BASE_URL}/repos/{username}/{repo_name}/commits?per_page=30"
-    response = requests.get(url)
+    if use_graphql():
+        data = await _graphql_user_data(username)
+        readmes = data["readmes"] if data else {}
+        return {name: readmes.get(name) for name in repo_names}
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        return []
+    semaphore = asyncio.Semaphore(README_CONCURRENCY)
 
-def get_repo_activity(username: str, repo_name: str):
-    base_url = f"{GITHUB_BASE_URL}/repos/{username}/{repo_name}"
+    async def fetch(name):
+        async with semaphore:
+            return await get_repo_readme_async(username, name)
+
+    results = await asyncio.gather(*(fetch(name) for name in repo_names))
+    return dict(zip(repo_names, results))
 
-    issues = requests.get(f"{base_url}/issues?state=all").json()
-    pulls = requests.get(f"{base_url}/pulls?state=all").json()
 
-    return {
-        "total_issues": len(issues) if isinstance(issues, list) else 0,
-        "total_prs": len(pulls) if isinstance(pulls, list) else 0
+async def get_repo_commits_async(username: str, repo_name: str,
+                                 max_items=DEFAULT_COMMIT_LIMIT, since=None):
+    """
+    Fetch recent commits of a repository (limited to `max_items`)
+    """
+    if use_graphql():
+        data = await _graphql_user_data(username)
+        commits = data["commits"].get(repo_name, []) if data else []
+        since = _format_since(since)
+        if since:
+            commits = [c for c in commits if c["commit"]["author"]["date"] >= since]
+        return commits[:max_items] if max_items is not None else commits
+
+    return [
+        commit async for commit in
+        iter_repo_commits_async(username, repo_name, max_items, since)
+    ]
+
+
+def _last_page(response):
+    """
+    Number of items in a per_page=1 listing: the page number of its
+    rel="last" link, or the length of the only page
+    """
+    last = response.links.get("last", {}).get("url")
+    if last:
+        page = parse_qs(urlsplit(last).query).get("page")
+        if page:
+            return int(page[0])
+    return len(response.json())
+
+
+async def _count_async(path: str, params=None, missing=REPO_MISSING):
+    """
+    Count the items of a list endpoint without downloading them
+    """
+    response = await _get(path, params={**(params or {}), "per_page": 1})
+    if not _check(response, missing):
+        return 0
+    return _last_page(response)
+
+
+async def _search_count_async(query: str):
+    response = await _get("/search/issues", params={"q": query, "per_page": 1})
+    # 422 is what search answers for a repository it cannot see
+    if not _check(response, missing=REPO_MISSING + (422,)):
+        return 0
+    return response.json().get("total_count", 0)
+
+
+def _activity(open_issues, closed_issues, open_prs, closed_prs, merged_prs):
+    """
+    Activity counts; `merged_prs` None means merges could not be told
+    apart, so every closed PR is reported as closed and the repo is
+    marked "merged_unknown"
+    """
+    counts = {
+        "open_issues": open_issues,
+        "closed_issues": closed_issues,
+        "open_prs": open_prs,
+        "closed_prs": closed_prs,
+        "merged_prs": merged_prs or 0,
+        "total_issues": open_issues + closed_issues,
+        "total_prs": open_prs + closed_prs + (merged_prs or 0)
     }
+    if merged_prs is None:
+        counts["merged_unknown"] = 1
+    return counts
+
+
+async def _merged_count_async(username: str, repo_name: str):
+    """
+    Merged PRs of a repo from a per_page=1 search. Search allows only
+    10-30 requests a minute, so this is None once its budget is spent;
+    the repo is then marked "merged_unknown" rather than the whole report
+    waiting for or failing on the search reset.
+    """
+    if not get_scheduler().available("search"):
+        return None
+    try:
+        return await _search_count_async(f"repo:{username}/{repo_name} is:pr is:merged")
+    except GitHubRateLimitError:
+        return None
+
+
+async def _repo_activity_async(username: str, repo_name: str, open_items=None):
+    """
+    Exact issue and PR counts of one repository from per_page=1 listings.
+    The issues endpoint also lists PRs, so PR counts are subtracted; merged
+    PRs are counted by _merged_count_async, only when any PR was closed.
+    `open_items` (the repo's open_issues_count) skips the open listings
+    when it is 0.
+    """
+    base_url = f"/repos/{username}/{repo_name}"
+    # 410 means issues are disabled for the repository
+    no_issues = REPO_MISSING + (410,)
+
+    async def zero():
+        return 0
+
+    nothing_open = open_items == 0
+    issues_open, issues_closed, prs_open, prs_closed = await asyncio.gather(
+        zero() if nothing_open else _count_async(f"{base_url}/issues", {"state": "open"}, no_issues),
+        _count_async(f"{base_url}/issues", {"state": "closed"}, no_issues),
+        zero() if nothing_open else _count_async(f"{base_url}/pulls", {"state": "open"}),
+        _count_async(f"{base_url}/pulls", {"state": "closed"})
+    )
+
+    merged = await _merged_count_async(username, repo_name) if prs_closed else 0
+
+    return _activity(
+        max(issues_open - prs_open, 0),
+        max(issues_closed - prs_closed, 0),
+        prs_open,
+        prs_closed - (merged or 0),
+        merged
+    )
+
+
+async def get_repo_activity_async(username: str, repo_name: str):
+    """
+    Open, closed and merged issue/PR counts of a repository.
+    total_issues excludes PRs; closed_prs excludes merged ones.
+    """
+    if use_graphql():
+        data = await _graphql_user_data(username)
+        empty = _activity(0, 0, 0, 0, 0)
+        return data["activity"].get(repo_name, empty) if data else empty
+
+    return await _repo_activity_async(username, repo_name)
+
+
+async def get_user_activity_async(username: str, repos):
+    """
+    Activity counts of every repo in `repos` (RepoRecords), fetched
+    concurrently; returns {repo name: counts}
+    """
+    if use_graphql():
+        data = await _graphql_user_data(username)
+        activity = data["activity"] if data else {}
+        empty = _activity(0, 0, 0, 0, 0)
+        return {repo.name: activity.get(repo.name, empty) for repo in repos}
+
+    semaphore = asyncio.Semaphore(ACTIVITY_CONCURRENCY)
+
+    async def fetch(repo):
+        async with semaphore:
+            return await _repo_activity_async(username, repo.name, repo.open_issues)
+
+    results = await asyncio.gather(*(fetch(repo) for repo in repos))
+    return {repo.name: result for repo, result in zip(repos, results)}
+
+
+def iter_user_repos(username: str, max_items=None, since=None):
+    """
+    Stream public repositories of a user page by page
+    """
+    return iterate_sync(iter_user_repos_async(username, max_items, since))
+
+
+def iter_repo_commits(username: str, repo_name: str, max_items=None, since=None):
+    """
+    Stream commits of a repository, newest first
+    """
+    return iterate_sync(
+        iter_repo_commits_async(username, repo_name, max_items, since)
+    )
+
+
+def get_user_profile(username: str):
+    """
+    Fetch basic GitHub user profile data
+    """
+    return run_sync(get_user_profile_async(username))
+
+
+def get_user_repos(username: str, max_items=None, since=None):
+    """
+    Fetch all public repositories of a user
+    """
+    return run_sync(get_user_repos_async(username, max_items, since))
+
+
+def get_repo_readme(username: str, repo_name: str):
+    """
+    Fetch README content of a repository
+    """
+    return run_sync(get_repo_readme_async(username, repo_name))
+
+
+def get_repo_readmes(username: str, repo_names):
+    """
+    README text of every repo in `repo_names`, fetched concurrently
+    """
+    return run_sync(get_repo_readmes_async(username, repo_names))
+
+
+def get_repo_commits(username: str, repo_name: str,
+                     max_items=DEFAULT_COMMIT_LIMIT, since=None):
+    """
+    Fetch recent commits of a repository (limited to `max_items`)
+    """
+    return run_sync(
+        get_repo_commits_async(username, repo_name, max_items, since)
+    )
+
+
+def get_repo_activity(username: str, repo_name: str):
+    return run_sync(get_repo_activity_async(username, repo_name))
+
+
+def get_user_activity(username: str, repos):
+    return run_sync(get_user_activity_async(username, repos))
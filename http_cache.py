@@ -0,0 +1,187 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "github_http.sqlite")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Headers worth replaying when a 304 is served from the cache
+STORED_HEADERS = ("content-type", "link", "etag", "last-modified")
+
+
+class HTTPCache:
+    """
+    On-disk store of conditional-request validators and bodies.
+
+    Entries are keyed by request URL (plus Accept header), evicted
+    least-recently-used once the stored bodies exceed `max_bytes`. The
+    body total is kept in memory, so a store only touches the table's
+    size column when the cap is crossed.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)"
+        )
+        self._conn.commit()
+        self._bytes = self._stored_bytes()
+
+    def _stored_bytes(self):
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def lookup(self, key):
+        """
+        Return the stored entry for `key` or None, without touching counters
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, headers, body FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            "etag": row[0],
+            "last_modified": row[1],
+            "headers": json.loads(row[2]),
+            "body": row[3]
+        }
+
+    def conditional_headers(self, entry):
+        """
+        Build If-None-Match / If-Modified-Since headers for a stored entry
+        """
+        headers = {}
+        if entry is None:
+            return headers
+
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        return headers
+
+    def record_hit(self, key):
+        """
+        Count a 304 revalidation and mark the entry as recently used
+        """
+        with self._lock:
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                (time.time(), key)
+            )
+            self._conn.commit()
+
+    def store(self, key, headers, body):
+        """
+        Save a 200 response if it carries a validator, then enforce the size cap
+        """
+        with self._lock:
+            self.misses += 1
+
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+
+        if len(body) > self.max_bytes:
+            return
+
+        kept = {
+            name: headers[name] for name in STORED_HEADERS if name in headers
+        }
+
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (key, etag, last_modified, headers, body, size, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, etag, last_modified, json.dumps(kept), body, len(body), time.time())
+            )
+            self._bytes += len(body) - (previous[0] if previous else 0)
+            if self._bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # Other processes sharing the file may have stored or evicted too
+        total = self._stored_bytes()
+
+        while total > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            total -= row[1]
+            self.evictions += 1
+
+        self._bytes = total
+
+    def stats(self):
+        """
+        Return hit/miss counters and current on-disk usage
+        """
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            lookups = self.hits + self.misses
+
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes
+            }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._bytes = 0
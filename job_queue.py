@@ -0,0 +1,342 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from github_service import GitHubServiceError
+from pipeline import REPORT_SECTIONS, iter_report_sections
+from rate_limiter import GitHubRateLimitError
+from report_cache import get_report_cache, report_key
+
+DEFAULT_QUEUE_PATH = os.path.join(".cache", "jobs.sqlite")
+DEFAULT_WORKERS = 4
+# Finished jobs are kept this long for polling, then pruned
+DEFAULT_RETENTION = 24 * 3600
+# Idle workers also re-check the table this often, so jobs queued by
+# another process sharing the file are picked up
+POLL_SECONDS = 1.0
+# Running jobs are stamped this often by the process that claimed them;
+# one whose stamp is STALE_SECONDS old belonged to a process that died
+HEARTBEAT_SECONDS = 10.0
+STALE_SECONDS = 60.0
+
+
+class JobStore:
+    """
+    SQLite table of analysis jobs and their partial reports.
+
+    Higher `priority` runs first, then oldest first. Claiming a job is a
+    single UPDATE, so several workers (or processes) never take the same one.
+    A claimed job records this store's `owner` and a heartbeat; writes to
+    it are ignored once another owner has taken it over.
+    """
+
+    def __init__(self, path=DEFAULT_QUEUE_PATH, retention=DEFAULT_RETENTION):
+        self.path = path
+        self.retention = retention
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                username TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                refresh INTEGER NOT NULL,
+                mode TEXT NOT NULL DEFAULT 'full',
+                owner TEXT,
+                heartbeat_at REAL,
+                status TEXT NOT NULL,
+                report TEXT NOT NULL,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+            """
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")]
+        for column, definition in (("mode", "TEXT NOT NULL DEFAULT 'full'"),
+                                   ("owner", "TEXT"), ("heartbeat_at", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, created_at)"
+        )
+        self._conn.commit()
+
+    def add(self, username, priority=0, refresh=False, mode="full"):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, username, priority, refresh, mode, status, report, created_at) "
+                "VALUES (?, ?, ?, ?, ?, 'queued', '{}', ?)",
+                (job_id, username, priority, int(refresh), mode, now)
+            )
+            self._conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+                (now - self.retention,)
+            )
+            self._conn.commit()
+
+        return job_id
+
+    def claim(self):
+        """
+        Mark the next queued job running and return (id, username,
+        refresh, mode), or None when the queue is empty
+        """
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                """
+                UPDATE jobs SET status = 'running', started_at = ?, owner = ?, heartbeat_at = ?
+                WHERE id = (
+                    SELECT id FROM jobs WHERE status = 'queued'
+                    ORDER BY priority DESC, created_at LIMIT 1
+                )
+                RETURNING id, username, refresh, mode
+                """,
+                (now, self.owner, now)
+            ).fetchone()
+            self._conn.commit()
+
+        return (row[0], row[1], bool(row[2]), row[3]) if row else None
+
+    def update(self, job_id, report):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET report = ?, heartbeat_at = ? "
+                "WHERE id = ? AND status = 'running' AND owner = ?",
+                (json.dumps(report), time.time(), job_id, self.owner)
+            )
+            self._conn.commit()
+
+    def finish(self, job_id, report, error=None):
+        """
+        Record the outcome; False when the job is no longer ours (it went
+        stale and was requeued), in which case nothing is written
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, report = ?, error = ?, finished_at = ? "
+                "WHERE id = ? AND status = 'running' AND owner = ?",
+                ("failed" if error is not None else "done", json.dumps(report),
+                 json.dumps(error) if error is not None else None, time.time(),
+                 job_id, self.owner)
+            )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    def heartbeat(self):
+        """
+        Stamp every job this store is running, so others see it is alive
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE status = 'running' AND owner = ?",
+                (time.time(), self.owner)
+            )
+            self._conn.commit()
+
+    def requeue(self, job_id=None, stale_after=STALE_SECONDS):
+        """
+        Put one of our running jobs, or every running job whose owner has
+        not sent a heartbeat for `stale_after` seconds, back in the queue;
+        returns how many were requeued
+        """
+        with self._lock:
+            if job_id is None:
+                cursor = self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', started_at = NULL, owner = NULL, "
+                    "heartbeat_at = NULL, report = '{}' "
+                    "WHERE status = 'running' AND COALESCE(heartbeat_at, 0) < ?",
+                    (time.time() - stale_after,)
+                )
+            else:
+                cursor = self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', started_at = NULL, owner = NULL, "
+                    "heartbeat_at = NULL, report = '{}' "
+                    "WHERE id = ? AND status = 'running' AND owner = ?",
+                    (job_id, self.owner)
+                )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def get(self, job_id):
+        """
+        Return the job as a dict, or None if unknown
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, username, priority, status, report, error, "
+                "created_at, started_at, finished_at, mode FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            position = None
+            if row[3] == "queued":
+                position = self._conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = 'queued' "
+                    "AND (priority > ? OR (priority = ? AND created_at < ?))",
+                    (row[2], row[2], row[6])
+                ).fetchone()[0]
+
+        report = json.loads(row[4])
+        return {
+            "job_id": row[0],
+            "username": row[1],
+            "priority": row[2],
+            "mode": row[9],
+            "status": row[3],
+            "queue_position": position,
+            "report": report,
+            "pending_sections": [s for s in REPORT_SECTIONS if s not in report],
+            "error": json.loads(row[5]) if row[5] is not None else None,
+            "created_at": row[6],
+            "started_at": row[7],
+            "finished_at": row[8]
+        }
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobQueue:
+    """
+    Bounded pool of asyncio workers draining a JobStore on the server
+    loop; store calls run in threads so SQLite never blocks the loop
+    """
+
+    def __init__(self, store, workers=DEFAULT_WORKERS):
+        self.store = store
+        self.workers = workers
+        self._wakeup = None
+        self._tasks = []
+
+    async def start(self):
+        # Jobs of a process that died start over; those of live processes
+        # sharing the file keep running there
+        await asyncio.to_thread(self.store.requeue)
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, username, priority=0, refresh=False, mode="full"):
+        job_id = self.store.add(username, priority, refresh, mode)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job_id
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            await asyncio.to_thread(self.store.heartbeat)
+            if await asyncio.to_thread(self.store.requeue):
+                self._wakeup.set()
+
+    async def _work(self):
+        while True:
+            claimed = await asyncio.to_thread(self.store.claim)
+            if claimed is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job_id, username, refresh, mode = claimed
+            try:
+                await self._run(job_id, username, refresh, mode)
+            except asyncio.CancelledError:
+                # Shutting down: let the next start pick it up again
+                await asyncio.to_thread(self.store.requeue, job_id)
+                raise
+            except Exception as e:
+                await asyncio.to_thread(self.store.finish, job_id, {}, str(e))
+
+    async def _run(self, job_id, username, refresh, mode):
+        cache = get_report_cache()
+        key = report_key(username, mode)
+
+        cached = cache.peek(key) if cache is not None and not refresh else None
+        if cached is not None:
+            await asyncio.to_thread(self.store.finish, job_id, cached[0])
+            return
+
+        report = {}
+        try:
+            async for section, value in iter_report_sections(username, mode=mode):
+                if section == "error":
+                    await asyncio.to_thread(self.store.finish, job_id, report, value)
+                    return
+                report[section] = value
+                await asyncio.to_thread(self.store.update, job_id, report)
+        except GitHubRateLimitError as e:
+            await asyncio.to_thread(self.store.finish, job_id, report, {
+                "message": "GitHub rate limit exhausted", "retry_after": e.retry_after
+            })
+            return
+        except GitHubServiceError as e:
+            await asyncio.to_thread(self.store.finish, job_id, report, str(e))
+            return
+
+        report = {section: report[section] for section in REPORT_SECTIONS}
+        if cache is not None:
+            cache.store(key, report)
+        await asyncio.to_thread(self.store.finish, job_id, report)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """
+    Return the shared job queue; JOB_QUEUE_PATH and JOB_WORKERS configure it
+    """
+    global _queue
+
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue(
+                    JobStore(
+                        path=os.getenv("JOB_QUEUE_PATH", DEFAULT_QUEUE_PATH),
+                        retention=int(os.getenv("JOB_RETENTION", str(DEFAULT_RETENTION)))
+                    ),
+                    workers=int(os.getenv("JOB_WORKERS", str(DEFAULT_WORKERS)))
+                )
+
+    return _queue
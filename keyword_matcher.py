@@ -0,0 +1,185 @@
+import re
+import threading
+
+
+# Category -> keywords. Multi-word keywords also match with "-", "_"
+# or "." between the words ("machine learning", "machine-learning").
+# A trailing "*" lets a keyword start a longer word, for repo names that
+# glue words together ("flask*" matches "flaskapp" and "flask-api");
+# every other keyword has to end where a word ends.
+# backend, frontend and database feed engineering_depth_score, so they
+# hold the original keywords only, as prefixes: joined names such as
+# "springboot-demo" or "postgresql" counted under substring matching and
+# still do, while a keyword inside a word ("mysql") does not.
+DEFAULT_TAXONOMY = {
+    "backend": ["django*", "flask*", "fastapi*", "spring*"],
+    "frontend": ["react*", "vue*", "angular*"],
+    "database": ["sql*", "mongodb*", "postgres*"],
+    "infra": [
+        "docker", "kubernetes", "k8s", "terraform", "ansible", "helm",
+        "nginx", "aws", "gcp", "azure", "devops", "ci cd"
+    ],
+    "ml": [
+        "ml", "machine learning", "deep learning", "pytorch", "tensorflow",
+        "keras", "sklearn", "scikit learn", "nlp", "llm", "transformers"
+    ],
+    # Commit verbs that say nothing about what changed, with the
+    # inflections substring matching used to catch
+    "low_signal": [
+        "update", "updates", "updated", "fix", "fixes", "fixed",
+        "changes", "minor", "test", "tests", "testing"
+    ]
+}
+
+_SEPARATOR = r"[\s_.\-]?"
+# Only letters make up words: digits, "_", "-" and "." separate them, so
+# "my_django_app" and "react18" both hold a keyword but "prefix" is not "fix"
+_WORD_START = r"(?<![a-z])"
+_WORD_END = r"(?![a-z])"
+# A lower-case letter followed by a capitalized word: "ReactPortfolio",
+# "myDjangoApp". Acronyms such as "FastAPI" or "MySQL" are not split.
+_CAMEL = re.compile(r"(?<=[a-z])(?=[A-Z][a-z])")
+
+
+def _keyword_pattern(keyword):
+    keyword = keyword.strip().lower()
+    prefix = keyword.endswith("*")
+    words = re.split(r"[\s_.\-]+", keyword.rstrip("*"))
+    body = _SEPARATOR.join(re.escape(word) for word in words if word)
+    return body if prefix else body + _WORD_END
+
+
+def _alternation(keywords):
+    # Longest first so "postgresql" is preferred over "postgres"
+    parts = sorted({_keyword_pattern(k) for k in keywords}, key=len, reverse=True)
+    return "|".join(parts)
+
+
+def _bounded(body):
+    return rf"{_WORD_START}(?:{body})"
+
+
+def _texts(text):
+    """
+    The lower-cased text to scan, plus a copy with camelCase words split
+    apart when it has any. Both are scanned: splitting finds "django" in
+    "myDjangoApp" but would lose "tensorflow" in "TensorFlow".
+    """
+    lowered = text.lower()
+    if _CAMEL.search(text) is None:
+        return (lowered,)
+    return (lowered, _CAMEL.sub(" ", text).lower())
+
+
+class KeywordMatcher:
+    """
+    Match a keyword taxonomy against text in one regex pass.
+
+    All categories are compiled into a single pattern with one named
+    group per category, so finding every category hit in an item costs
+    one scan regardless of how many keywords are registered.
+    """
+
+    def __init__(self, taxonomy=None):
+        self._taxonomy = {}
+        self._lock = threading.Lock()
+        self._combined = None
+        self._per_category = {}
+
+        for category, keywords in (taxonomy or {}).items():
+            self._taxonomy[category] = list(keywords)
+        self._compile()
+
+    def _compile(self):
+        groups = [
+            f"(?P<{category}>{_alternation(keywords)})"
+            for category, keywords in self._taxonomy.items()
+            if keywords
+        ]
+        # Patterns are lower-case only; callers lower() the text, which is
+        # markedly faster than re.IGNORECASE on large batches
+        combined = re.compile(_bounded("|".join(groups))) if groups else None
+        per_category = {
+            category: re.compile(_bounded(_alternation(keywords)))
+            for category, keywords in self._taxonomy.items()
+            if keywords
+        }
+
+        # Swap both at once so readers never see a half-built matcher
+        self._combined, self._per_category = combined, per_category
+
+    def register(self, category, keywords):
+        """
+        Add keywords to a category (creating it if needed) and recompile
+        """
+        if not category.isidentifier():
+            raise ValueError(f"Category name must be an identifier: {category!r}")
+
+        with self._lock:
+            self._taxonomy.setdefault(category, [])
+            self._taxonomy[category].extend(keywords)
+            self._compile()
+
+    @property
+    def taxonomy(self):
+        return {category: list(keywords) for category, keywords in self._taxonomy.items()}
+
+    def matches(self, text):
+        """
+        Return {category: [matched keywords]} for one item
+        """
+        hits = {}
+        if not text or self._combined is None:
+            return hits
+
+        lowered, *split = _texts(text)
+        for match in self._combined.finditer(lowered):
+            hits.setdefault(match.lastgroup, []).append(match.group())
+        for camel in split:
+            for match in self._combined.finditer(camel):
+                found = hits.setdefault(match.lastgroup, [])
+                if match.group() not in found:
+                    found.append(match.group())
+        return hits
+
+    def categories(self, text):
+        """
+        Return the set of categories that occur in `text`
+        """
+        if not text or self._combined is None:
+            return set()
+        return {
+            match.lastgroup
+            for variant in _texts(text)
+            for match in self._combined.finditer(variant)
+        }
+
+    def has(self, text, category):
+        """
+        True when `text` contains any keyword of `category`
+        """
+        pattern = self._per_category.get(category)
+        if not text or pattern is None:
+            return False
+        return any(pattern.search(variant) is not None for variant in _texts(text))
+
+    def flags(self, texts, category):
+        """
+        One bool per item of `texts`: does it contain a keyword of `category`
+        """
+        pattern = self._per_category.get(category)
+        if pattern is None:
+            return [False for _ in texts]
+
+        # Most items match, or have no camelCase, on the lower-cased text
+        # alone; only the rest pay for splitting
+        search = pattern.search
+        camel = _CAMEL.search
+        return [
+            search(text.lower()) is not None
+            or (camel(text) is not None and search(_CAMEL.sub(" ", text).lower()) is not None)
+            for text in texts
+        ]
+
+
+default_matcher = KeywordMatcher(DEFAULT_TAXONOMY)
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "llm_cache.sqlite")
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 1024
+
+
+def cache_key(model, temperature, template_version, content):
+    """
+    Content address of one LLM call: identical inputs give identical keys
+    """
+    material = json.dumps(
+        [model, temperature, template_version, content],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class LLMCache:
+    """
+    Two-level cache of LLM completions.
+
+    An in-memory LRU answers repeat calls within a process; SQLite keeps
+    entries across restarts and lets several uvicorn workers share them.
+    Entries older than `ttl` seconds are treated as missing.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS completions (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+
+    def get(self, key):
+        """
+        Return the cached completion text for `key`, or None
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            row = None
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM completions WHERE key = ?",
+                    (key,)
+                ).fetchone()
+
+            if row is not None and now - row[1] < self.ttl:
+                self._remember(key, row[1], row[0])
+                self.hits += 1
+                return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        now = time.time()
+
+        with self._lock:
+            self._remember(key, now, value)
+
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO completions (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, now)
+                )
+                self._conn.execute(
+                    "DELETE FROM completions WHERE created_at < ?",
+                    (now - self.ttl,)
+                )
+                self._conn.commit()
+
+    def _remember(self, key, created_at, value):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory)
+            }
@@ -1,33 +1,78 @@
-from fastapi import FastAPI
+import asyncio
+import json
+import time
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-from openai import OpenAI
 import os
-from github_service import get_user_profile, get_user_repos, get_repo_readme,get_repo_commits, get_repo_activity
-from scoring_engine import calculate_portfolio_score
-from commit_analyzer import analyze_commit_patterns
-from ai_evaluator import evaluate_readme, recruiter_screening_summary, generate_growth_roadmap
-from red_flag_engine import detect_red_flags
-from engineering_depth import analyze_engineering_depth
+import ai_evaluator
+import github_service
+import metrics
+from async_runtime import run_sync, submit
+from cohort_index import get_cohort_index
+from github_service import GitHubServiceError
+from job_queue import get_job_queue
+from pipeline import REPORT_SECTIONS, build_report, iter_report_sections
+from rate_limiter import GitHubRateLimitError
+from report_cache import get_report_cache, report_key
 
 
 load_dotenv()
 
-app = FastAPI()
+
+def _open_caches():
+    get_cohort_index()
+    github_service.get_http_cache()
+    github_service.get_scheduler()
+    ai_evaluator.get_llm_cache()
+
+
+async def _open_clients():
+    github_service.get_async_client()
+    if os.getenv("GROQ_API_KEY"):
+        ai_evaluator.get_async_client()
+
+
+async def _close_clients():
+    await github_service.close_async_client()
+    await ai_evaluator.close_async_client()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Build every lazy client before the first request instead of during it,
+    # on both the server loop and the background loop used by sync callers
+    await asyncio.to_thread(_open_caches)
+    await _open_clients()
+    await asyncio.wrap_future(submit(_open_clients()))
+    jobs = get_job_queue()
+    await jobs.start()
+
+    yield
+
+    await jobs.stop()
+    await _close_clients()
+    await asyncio.wrap_future(submit(_close_clients()))
+
+
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/")
 def home():
     return {"message": "GitHub Portfolio Analyzer Running 🚀"}
 
-@app.get("/test-groq")
-def test_groq():
-    client = OpenAI(
-        base_url="https://api.groq.com/openai/v1",
-        api_key=os.getenv("GROQ_API_KEY")
-    )
+@app.get("/metrics")
+def prometheus_metrics():
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
 
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-    messages=[
+@app.get("/test-groq")
+async def test_groq():
+    response = await ai_evaluator.get_async_client().chat.completions.create(
+        model=ai_evaluator.MODEL,
+        messages=[
             {"role": "system", "content": "You are a recruiter."},
             {"role": "user", "content": "Say hello in one line."}
         ]
@@ -36,88 +81,235 @@ def test_groq():
     return {"response": response.choices[0].message.content}
 
 
-@app.get("/analyze/{username}")
-def analyze_user(username: str):
-    profile = get_user_profile(username)
-    
-    if "error" in profile:
-        return {"error": "GitHub user not found"}
-    repos = get_user_repos(username)
-    score_data = calculate_portfolio_score(profile, repos)
-
-    readme_text = None
-    if repos:
-        readme_text = get_repo_readme(username, repos[0]["name"])
-
-    ai_result = evaluate_readme(readme_text)
-
-    final_score = score_data["total_score"] + ai_result["readme_score"]
-    final_score = min(final_score, 100)
-
-    recruiter_result = recruiter_screening_summary(
-        username,
-        final_score,
-        score_data["breakdown"],
-        ai_result
+# full runs the LLM evaluations; fast swaps them for local heuristics
+MODE_PATTERN = "^(full|fast)$"
+
+
+async def analyze_user_async(username: str, mode: str = "full"):
+    try:
+        return await build_report(username, mode=mode)
+    except GitHubRateLimitError as e:
+        return {"error": "GitHub rate limit exhausted", "retry_after": e.retry_after}
+    except GitHubServiceError as e:
+        return {"error": str(e)}
+
+
+async def analyze_cached_async(username: str, refresh: bool = False, mode: str = "full"):
+    """
+    Serve a report from the report cache, computing it at most once
+    at a time per username and mode
+    """
+    cache = get_report_cache()
+    if cache is None:
+        return await analyze_user_async(username, mode)
+
+    report, status = await cache.get_async(
+        report_key(username, mode),
+        lambda: analyze_user_async(username, mode),
+        refresh
     )
-    
-    commit_data = {}
-    if repos:
-        commits = get_repo_commits(username, repos[0]["name"])
-        commit_data = analyze_commit_patterns(commits)
-    engineering_score = analyze_engineering_depth(repos)
-
-    red_flags = detect_red_flags(profile, repos, commit_data, ai_result)
-
-    # Add engineering score to final score
-    final_score += engineering_score
-    final_score = min(final_score, 100)
-
-    roadmap = generate_growth_roadmap(
-        username,
-        final_score,
-        score_data["breakdown"],
-        red_flags
+    return {**report, "report_cache": status}
+
+
+@app.get("/analyze/{username}")
+def analyze_user(username: str, refresh: bool = False,
+                 mode: str = Query(default="full", pattern=MODE_PATTERN)):
+    return run_sync(analyze_cached_async(username, refresh, mode))
+
+
+async def _stream_sections(username: str, refresh: bool, mode: str = "full"):
+    """
+    Yield one NDJSON line per report section as it becomes available,
+    then a final "done" line
+    """
+    started = time.perf_counter()
+
+    def line(section, data):
+        return json.dumps({
+            "section": section,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+            "data": data
+        }) + "\n"
+
+    cache = get_report_cache()
+    key = report_key(username, mode)
+    cached = cache.peek(key) if cache is not None and not refresh else None
+
+    if cached is not None:
+        report, status = cached
+        for section in REPORT_SECTIONS:
+            yield line(section, report[section])
+        yield line("done", {"report_cache": status})
+        return
+
+    sections = {}
+    timings = {}
+    try:
+        async for section, value in iter_report_sections(username, timings, mode):
+            sections[section] = value
+            yield line(section, value)
+            if section == "error":
+                return
+    except GitHubRateLimitError as e:
+        yield line("error", {"message": "GitHub rate limit exhausted", "retry_after": e.retry_after})
+        return
+    except GitHubServiceError as e:
+        yield line("error", str(e))
+        return
+    except Exception as e:
+        # An LLM or network failure would otherwise end the stream silently
+        yield line("error", str(e) or type(e).__name__)
+        return
+
+    if cache is not None:
+        cache.store(key, {section: sections[section] for section in REPORT_SECTIONS})
+    yield line("done", {
+        "report_cache": {"status": "miss", "age_seconds": 0},
+        "stage_seconds": timings
+    })
+
+
+@app.get("/analyze/{username}/stream")
+async def analyze_user_stream(username: str, refresh: bool = False,
+                              mode: str = Query(default="full", pattern=MODE_PATTERN)):
+    return StreamingResponse(
+        _stream_sections(username, refresh, mode),
+        media_type="application/x-ndjson"
     )
 
-    top_repos = sorted(
-        [r for r in repos if not r["fork"]],
-        key=lambda x: x["stargazers_count"],
-        reverse=True
-    )[:3]
-
-    formatted_top = [
-        {
-            "name": r["name"],
-            "stars": r["stargazers_count"],
-            "language": r["language"],
-            "description": r["description"]
+
+class BatchRequest(BaseModel):
+    usernames: list[str]
+    concurrency: int = Field(default=8, ge=1, le=32)
+    mode: str = Field(default="full", pattern=MODE_PATTERN)
+
+
+async def _stream_batch(usernames, concurrency: int, mode: str = "full"):
+    """
+    Analyze candidates with bounded concurrency and yield one NDJSON
+    line per candidate as it finishes, then a throughput summary
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+
+    async def run(username):
+        async with semaphore:
+            candidate_start = time.perf_counter()
+            try:
+                report = await analyze_cached_async(username, mode=mode)
+            except Exception as e:
+                report = {"error": str(e)}
+            return username, report, time.perf_counter() - candidate_start
+
+    tasks = [asyncio.ensure_future(run(username)) for username in usernames]
+    failed = 0
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            username, report, elapsed = await next_done
+            if "error" in report:
+                failed += 1
+
+            yield json.dumps({
+                "username": username,
+                "elapsed_seconds": round(elapsed, 3),
+                "report": report
+            }) + "\n"
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    total = time.perf_counter() - started
+    yield json.dumps({
+        "summary": {
+            "candidates": len(usernames),
+            "failed": failed,
+            "elapsed_seconds": round(total, 3),
+            "candidates_per_minute": round(len(usernames) / total * 60, 2) if total else 0
         }
-        for r in top_repos
-    ]
-    activity_data = []
-
-    for repo in top_repos:
-        activity = get_repo_activity(username, repo["name"])
-        activity_data.append({
-            "repo": repo["name"],
-            "issues": activity["total_issues"],
-            "prs": activity["total_prs"]
-        })
+    }) + "\n"
+
+
+@app.post("/analyze/batch")
+async def analyze_batch(batch: BatchRequest):
+    # Drop repeated usernames; GitHub logins are case-insensitive
+    seen = set()
+    usernames = []
+    for username in batch.usernames:
+        if username.lower() not in seen:
+            seen.add(username.lower())
+            usernames.append(username)
+
+    return StreamingResponse(
+        _stream_batch(usernames, batch.concurrency, batch.mode),
+        media_type="application/x-ndjson"
+    )
 
+
+class JobRequest(BaseModel):
+    username: str
+    priority: int = Field(default=0, ge=-100, le=100)
+    refresh: bool = False
+    mode: str = Field(default="full", pattern=MODE_PATTERN)
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(job: JobRequest):
+    """
+    Queue an analysis and return its id at once; poll GET /jobs/{id}
+    """
+    queue = get_job_queue()
+    job_id = queue.submit(job.username, job.priority, job.refresh, job.mode)
+    return queue.store.get(job_id)
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = get_job_queue().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job
+
+
+def _cohort():
+    index = get_cohort_index()
+    if index is None:
+        raise HTTPException(status_code=404, detail="Cohort index is disabled")
+    return index
+
+
+@app.get("/cohort")
+def cohort_stats():
+    return _cohort().stats()
+
+
+@app.get("/cohort/top")
+def cohort_top(metric: str = "total", k: int = Query(default=10, ge=1, le=1000),
+               language: str | None = None):
+    """
+    Leaderboard of the highest scorers on `metric`, optionally only
+    candidates with a repository in `language`
+    """
     return {
-    "top_repositories": formatted_top,
-    "repo_activity": activity_data,
-    "username": profile.get("login"),
-    "github_portfolio_score": final_score,
-    "score_breakdown": score_data["breakdown"],
-    "readme_evaluation": ai_result,
-    "recruiter_screening": recruiter_result,
-    "commit_analysis": commit_data,
-    "engineering_depth_score": engineering_score,
-    "red_flags": red_flags,
-    "growth_roadmap": roadmap,
+        "metric": metric,
+        "language": language,
+        "candidates": _cohort().top(metric, k, language)
     }
 
 
+@app.get("/cohort/percentile")
+def cohort_percentile(score: float, metric: str = "total", language: str | None = None):
+    return {
+        "metric": metric,
+        "score": score,
+        "language": language,
+        "percentile": _cohort().percentile(metric, score, language)
+    }
+
 
+@app.get("/cohort/{username}")
+def cohort_candidate(username: str, language: str | None = None):
+    ranks = _cohort().ranks(username, language)
+    if ranks is None:
+        raise HTTPException(status_code=404, detail="Candidate has not been analyzed")
+    return {"username": username, "language": language, "ranks": ranks}
@@ -0,0 +1,189 @@
+import os
+import threading
+
+# Seconds; GitHub calls are usually tens of milliseconds, LLM calls seconds
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+GITHUB_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+_instruments = None
+_lock = threading.Lock()
+
+
+def enabled():
+    """
+    True unless METRICS=0 turns instrumentation off
+    """
+    return os.getenv("METRICS", "1") != "0"
+
+
+def github_endpoint(path):
+    """
+    Collapse a GitHub API path to its route template so label values
+    stay bounded: /repos/octo/app/issues -> /repos/{owner}/{repo}/issues
+    """
+    parts = [part for part in path.split("/") if part]
+
+    if len(parts) >= 2 and parts[0] == "users":
+        return "/".join(["", "users", "{user}", *parts[2:3]])
+    if len(parts) >= 3 and parts[0] == "repos":
+        return "/".join(["", "repos", "{owner}", "{repo}", *parts[3:4]])
+    return "/" + "/".join(parts[:2])
+
+
+def _state_collector():
+    """
+    Build a collector that reads rate-limit budgets and cache counters
+    when scraped, so the request path pays nothing for them
+    """
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+    class StateCollector:
+        def collect(self):
+            # Imported here: these modules import this one
+            import ai_evaluator
+            import github_service
+            from report_cache import get_report_cache
+
+            scheduler = github_service.get_scheduler().stats()
+
+            remaining = GaugeMetricFamily(
+                "github_rate_limit_remaining",
+                "Requests left in the current rate-limit window",
+                labels=["token", "resource"]
+            )
+            limit = GaugeMetricFamily(
+                "github_rate_limit_limit",
+                "Size of the current rate-limit window",
+                labels=["token", "resource"]
+            )
+            for token, budgets in scheduler["tokens"].items():
+                for resource, budget in budgets.items():
+                    if budget["remaining"] is not None:
+                        remaining.add_metric([token, resource], budget["remaining"])
+                    if budget["limit"] is not None:
+                        limit.add_metric([token, resource], budget["limit"])
+            yield remaining
+            yield limit
+
+            waits = CounterMetricFamily(
+                "github_rate_limit_events",
+                "Requests held back by GitHub rate limits",
+                labels=["kind"]
+            )
+            waits.add_metric(["primary"], scheduler["primary_limit_waits"])
+            waits.add_metric(["secondary"], scheduler["secondary_limit_retries"])
+            yield waits
+
+            caches = {
+                "github_http": github_service.get_http_cache(),
+                "llm": ai_evaluator.get_llm_cache(),
+                "report": get_report_cache()
+            }
+            ratio = GaugeMetricFamily(
+                "cache_hit_ratio", "Hits over lookups since start", labels=["cache"]
+            )
+            hits = CounterMetricFamily("cache_hits", "Cache hits", labels=["cache"])
+            misses = CounterMetricFamily("cache_misses", "Cache misses", labels=["cache"])
+
+            for name, cache in caches.items():
+                if cache is None:
+                    continue
+                stats = cache.stats()
+                ratio.add_metric([name], stats["hit_ratio"])
+                if "hits" in stats:
+                    hits.add_metric([name], stats["hits"])
+                    misses.add_metric([name], stats["misses"])
+                else:
+                    hits.add_metric([name], stats["fresh"] + stats["stale"])
+                    misses.add_metric([name], stats["miss"])
+            yield ratio
+            yield hits
+            yield misses
+
+    return StateCollector()
+
+
+def _get():
+    """
+    Create the registry and instruments on first use; prometheus_client
+    stays out of the import path until something is measured
+    """
+    global _instruments
+
+    if _instruments is None:
+        with _lock:
+            if _instruments is None:
+                from prometheus_client import CollectorRegistry, Counter, Histogram
+
+                registry = CollectorRegistry()
+                instruments = {
+                    "registry": registry,
+                    "stage": Histogram(
+                        "pipeline_stage_seconds",
+                        "Run time of each analysis pipeline stage",
+                        ["stage", "outcome"],
+                        buckets=STAGE_BUCKETS,
+                        registry=registry
+                    ),
+                    "github": Histogram(
+                        "github_request_seconds",
+                        "Latency of outbound GitHub API calls",
+                        ["method", "endpoint", "status"],
+                        buckets=GITHUB_BUCKETS,
+                        registry=registry
+                    ),
+                    "llm": Histogram(
+                        "groq_request_seconds",
+                        "Latency of outbound Groq completion calls",
+                        ["endpoint", "model", "status"],
+                        buckets=LLM_BUCKETS,
+                        registry=registry
+                    ),
+                    "tokens": Counter(
+                        "llm_tokens",
+                        "Tokens reported in completion usage",
+                        ["model", "prompt_version", "kind"],
+                        registry=registry
+                    )
+                }
+                registry.register(_state_collector())
+                _instruments = instruments
+
+    return _instruments
+
+
+def observe_stage(stage, seconds, outcome="ok"):
+    if enabled():
+        _get()["stage"].labels(stage, outcome).observe(seconds)
+
+
+def observe_github(method, path, status, seconds):
+    if enabled():
+        _get()["github"].labels(method, github_endpoint(path), str(status)).observe(seconds)
+
+
+def observe_llm(endpoint, model, status, seconds):
+    if enabled():
+        _get()["llm"].labels(endpoint, model, str(status)).observe(seconds)
+
+
+def record_llm_usage(model, prompt_version, usage):
+    """
+    Count prompt and completion tokens from an OpenAI-style `usage`
+    """
+    if not enabled() or usage is None:
+        return
+
+    tokens = _get()["tokens"]
+    tokens.labels(model, prompt_version, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+    tokens.labels(model, prompt_version, "completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+
+
+def render():
+    """
+    Return (body, content type) in the Prometheus text format
+    """
+    from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+    return generate_latest(_get()["registry"]), CONTENT_TYPE_LATEST
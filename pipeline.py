@@ -0,0 +1,557 @@
+import asyncio
+import time
+
+import metrics
+from github_service import get_user_profile_async, get_user_repos_async
+from scoring_engine import calculate_portfolio_score
+from commit_analyzer import analyze_commit_patterns
+from ai_evaluator import (
+    evaluate_readmes_async,
+    recruiter_screening_summary_async,
+    generate_growth_roadmap_async
+)
+from red_flag_engine import detect_red_flags
+from snapshot_store import (
+    activity_states,
+    analyze_repo_states,
+    get_snapshot_store,
+    readme_states,
+    refresh_activity_async,
+    refresh_readmes_async,
+    refresh_repo_commits_async,
+    score_fingerprint
+)
+from engineering_depth import analyze_engineering_depth
+from cohort_index import cohort_metrics, get_cohort_index
+from readme_selection import select_readmes
+import fast_evaluator
+
+
+class UserNotFoundError(Exception):
+    pass
+
+
+class Stage:
+    """
+    One step of the analysis: an async function called with the username
+    followed by the results of the stages named in `inputs`
+    """
+
+    def __init__(self, name, func, inputs=()):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+
+
+STAGES = []
+# mode=fast replaces the stages of the same name with these
+FAST_STAGES = []
+# Repos whose READMEs, commits and issue/PR counts a fast analysis fetches
+FAST_REPO_LIMIT = 5
+
+MODES = ("full", "fast")
+
+
+def stage(name, inputs=(), registry=STAGES):
+    """
+    Register the decorated coroutine function as a pipeline stage
+    """
+    def register(func):
+        registry.append(Stage(name, func, inputs))
+        return func
+    return register
+
+
+def stages_for(mode):
+    """
+    The stage list of an analysis mode: "full", or "fast" with every LLM
+    call swapped for a deterministic local scorer and the per-repo
+    fetches limited to a few repos
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}, not {mode!r}")
+    if mode == "full":
+        return STAGES
+
+    overrides = {s.name: s for s in FAST_STAGES}
+    names = {s.name for s in STAGES}
+    return [overrides.get(s.name, s) for s in STAGES] + \
+        [s for s in FAST_STAGES if s.name not in names]
+
+
+def _ordered(stages):
+    """
+    Return stages so that every stage follows its inputs; rejects
+    unknown inputs and cycles
+    """
+    by_name = {s.name: s for s in stages}
+    ordered = []
+    state = {}
+
+    def visit(s):
+        if state.get(s.name) == "done":
+            return
+        if state.get(s.name) == "visiting":
+            raise ValueError(f"Pipeline cycle through stage {s.name!r}")
+
+        state[s.name] = "visiting"
+        for name in s.inputs:
+            if name not in by_name:
+                raise ValueError(f"Stage {s.name!r} needs unknown stage {name!r}")
+            visit(by_name[name])
+        state[s.name] = "done"
+        ordered.append(s)
+
+    for s in stages:
+        visit(s)
+    return ordered
+
+
+async def execute(stages, username: str, timings=None):
+    """
+    Run every stage as soon as its inputs are ready and yield
+    (stage name, result) pairs in completion order.
+
+    Independent stages run concurrently on the current loop. Each stage's
+    own run time (not the wait for its inputs) is written to `timings`.
+    The first stage to fail cancels the rest and its exception is raised.
+    """
+    if timings is None:
+        timings = {}
+
+    queue = asyncio.Queue()
+    tasks = {}
+
+    async def run(s, dependencies):
+        # A failed input has already reported its own error
+        values = [await task for task in dependencies]
+
+        started = time.perf_counter()
+        try:
+            value = await s.func(username, *values)
+        except Exception as e:
+            metrics.observe_stage(s.name, time.perf_counter() - started, "error")
+            queue.put_nowait(e)
+            raise
+
+        elapsed = time.perf_counter() - started
+        timings[s.name] = round(elapsed, 4)
+        metrics.observe_stage(s.name, elapsed)
+
+        queue.put_nowait((s.name, value))
+        return value
+
+    for s in _ordered(stages):
+        tasks[s.name] = asyncio.ensure_future(
+            run(s, [tasks[name] for name in s.inputs])
+        )
+
+    try:
+        for _ in range(len(tasks)):
+            item = await queue.get()
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        for task in tasks.values():
+            if not task.done():
+                task.cancel()
+        # Stages that failed after the first error have nobody to report to
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+
+# ---------- Stages ----------
+
+@stage("profile")
+async def fetch_profile(username):
+    profile = await get_user_profile_async(username)
+    if "error" in profile:
+        raise UserNotFoundError("GitHub user not found")
+    return profile
+
+
+@stage("repos")
+async def fetch_repos(username):
+    return await get_user_repos_async(username)
+
+
+@stage("snapshot")
+async def load_snapshot(username):
+    store = get_snapshot_store()
+    if store is None:
+        return None
+    return await asyncio.to_thread(store.load, username)
+
+
+@stage("username", inputs=("profile",))
+async def login(username, profile):
+    return profile.get("login")
+
+
+@stage("score_data", inputs=("profile", "repos", "snapshot"))
+async def portfolio_score(username, profile, repos, snapshot):
+    # Stars and followers move without a push, so the repo list is always
+    # refetched (cheaply, via ETags); the score is reused when its inputs match
+    if snapshot and snapshot.get("score_fingerprint") == score_fingerprint(profile, repos):
+        return snapshot["score_data"]
+    return calculate_portfolio_score(profile, repos)
+
+
+@stage("score_breakdown", inputs=("score_data",))
+async def score_breakdown(username, score_data):
+    return score_data["breakdown"]
+
+
+@stage("top_repos", inputs=("repos",))
+async def top_repos(username, repos):
+    return sorted(
+        [r for r in repos if not r.fork],
+        key=lambda x: x.stars,
+        reverse=True
+    )[:3]
+
+
+@stage("top_repositories", inputs=("top_repos",))
+async def top_repositories(username, top_repos):
+    return [
+        {
+            "name": r.name,
+            "stars": r.stars,
+            "language": r.language,
+            "description": r.description
+        }
+        for r in top_repos
+    ]
+
+
+@stage("engineering_depth_score", inputs=("repos",))
+async def engineering_depth(username, repos):
+    return analyze_engineering_depth(repos)
+
+
+@stage("readmes", inputs=("repos", "snapshot"))
+async def fetch_readmes(username, repos, snapshot):
+    owned = [r for r in repos if not r.fork] or repos
+    return await refresh_readmes_async(username, owned, snapshot)
+
+
+@stage("readme_selection", inputs=("readmes",))
+async def readme_selection(username, readmes):
+    # Shingling and MinHash over every README is CPU work; keep it off the loop
+    return await asyncio.to_thread(select_readmes, readmes)
+
+
+@stage("readme_evaluation", inputs=("readme_selection",))
+async def readme_evaluation(username, selection):
+    return await evaluate_readmes_async(selection)
+
+
+@stage("repo_states", inputs=("repos", "snapshot"))
+async def refresh_commits(username, repos, snapshot):
+    """
+    Bring every original repository's recent commits up to date against
+    the stored snapshot
+    """
+    if not repos:
+        return {}
+
+    owned = [r for r in repos if not r.fork] or repos
+    return await refresh_repo_commits_async(username, owned, snapshot)
+
+
+@stage("commit_analysis", inputs=("repo_states",))
+async def commit_analysis(username, repo_states):
+    if not repo_states:
+        # Same defaults as a user with repos but no commits
+        return analyze_commit_patterns([])
+
+    # Large histories take a noticeable slice of CPU; keep it off the loop
+    return await asyncio.to_thread(analyze_repo_states, repo_states)
+
+
+@stage("early_red_flags", inputs=("profile", "repos", "commit_analysis", "readme_selection"))
+async def early_red_flags(username, profile, repos, commit_data, selection):
+    # Until the READMEs are evaluated, judge that rule on presence alone
+    return detect_red_flags(
+        profile, repos, commit_data, {"readme_score": 1 if selection["selected"] else 0}
+    )
+
+
+@stage("red_flags", inputs=("profile", "repos", "commit_analysis", "readme_evaluation"))
+async def red_flags(username, profile, repos, commit_data, readme_eval):
+    return detect_red_flags(profile, repos, commit_data, readme_eval)
+
+
+@stage("screening_score", inputs=("score_data", "readme_evaluation"))
+async def screening_score(username, score_data, readme_eval):
+    return min(score_data["total_score"] + readme_eval["readme_score"], 100)
+
+
+@stage("github_portfolio_score", inputs=("screening_score", "engineering_depth_score"))
+async def final_score(username, screening_score, engineering_score):
+    # Add engineering score to final score
+    return min(screening_score + engineering_score, 100)
+
+
+@stage("recruiter_screening", inputs=("screening_score", "score_data", "readme_evaluation"))
+async def recruiter_screening(username, screening_score, score_data, readme_eval):
+    return await recruiter_screening_summary_async(
+        username,
+        screening_score,
+        score_data["breakdown"],
+        readme_eval
+    )
+
+
+@stage("growth_roadmap", inputs=("github_portfolio_score", "score_data", "red_flags"))
+async def growth_roadmap(username, final_score, score_data, flags):
+    return await generate_growth_roadmap_async(
+        username,
+        final_score,
+        score_data["breakdown"],
+        flags
+    )
+
+
+@stage("activity", inputs=("repos", "snapshot"))
+async def fetch_activity(username, repos, snapshot):
+    owned = [r for r in repos if not r.fork] or repos
+    return await refresh_activity_async(username, owned, snapshot)
+
+
+@stage("repo_activity", inputs=("top_repos", "activity"))
+async def repo_activity(username, top_repos, activity):
+    return [
+        {
+            "repo": repo.name,
+            "issues": activity[repo.name]["total_issues"],
+            "prs": activity[repo.name]["total_prs"],
+            **activity[repo.name]
+        }
+        for repo in top_repos
+    ]
+
+
+@stage("activity_totals", inputs=("activity",))
+async def activity_totals(username, activity):
+    totals = {"repos": len(activity)}
+    for counts in activity.values():
+        for key, value in counts.items():
+            totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+@stage(
+    "cohort_rank",
+    inputs=("username", "repos", "github_portfolio_score", "score_breakdown", "engineering_depth_score")
+)
+async def cohort_rank(username, login, repos, final_score, breakdown, engineering_score):
+    """
+    Add the candidate to the cohort index and return where they rank
+    """
+    index = get_cohort_index()
+    if index is None:
+        return None
+
+    owned = [r for r in repos if not r.fork] or repos
+    login = login or username
+    await asyncio.to_thread(
+        index.add,
+        login,
+        cohort_metrics(final_score, breakdown, engineering_score),
+        [r.language for r in owned]
+    )
+    return index.ranks(login)
+
+
+# ---------- Fast mode ----------
+
+@stage("fast_repos", inputs=("repos", "top_repos"), registry=FAST_STAGES)
+async def fast_repos(username, repos, top_repos):
+    """
+    The repos a fast analysis looks into: the top repos shown in the
+    report, then the most recently pushed, up to FAST_REPO_LIMIT
+    """
+    owned = [r for r in repos if not r.fork] or repos
+    recent = sorted(owned, key=lambda r: r.pushed_at or "", reverse=True)
+
+    chosen = {}
+    for repo in [*top_repos, *recent]:
+        if len(chosen) >= max(FAST_REPO_LIMIT, len(top_repos)):
+            break
+        chosen.setdefault(repo.name, repo)
+    return list(chosen.values())
+
+
+@stage("readmes", inputs=("fast_repos", "snapshot"), registry=FAST_STAGES)
+async def fast_readmes(username, sample, snapshot):
+    return await refresh_readmes_async(username, sample, snapshot)
+
+
+@stage("repo_states", inputs=("fast_repos", "snapshot"), registry=FAST_STAGES)
+async def fast_refresh_commits(username, sample, snapshot):
+    if not sample:
+        return {}
+    return await refresh_repo_commits_async(username, sample, snapshot)
+
+
+@stage("activity", inputs=("fast_repos", "snapshot"), registry=FAST_STAGES)
+async def fast_activity(username, sample, snapshot):
+    return await refresh_activity_async(username, sample, snapshot)
+
+
+@stage(
+    "snapshot_saved",
+    inputs=("profile", "repos", "snapshot", "repo_states", "readmes", "activity", "score_data"),
+    registry=FAST_STAGES
+)
+async def fast_save_snapshot(username, profile, repos, snapshot, repo_states, readmes,
+                             activity, score_data):
+    """
+    Merge the sampled repos into the stored snapshot rather than replacing
+    it, so the next full analysis still starts from every repo
+    """
+    store = get_snapshot_store()
+    if store is None:
+        return False
+
+    previous = snapshot or {}
+    await asyncio.to_thread(store.save, username, {
+        "repos": {**(previous.get("repos") or {}), **repo_states},
+        "readmes": {**(previous.get("readmes") or {}), **readme_states(repos, readmes)},
+        "activity": {**(previous.get("activity") or {}), **activity_states(repos, activity)},
+        "score_fingerprint": score_fingerprint(profile, repos),
+        "score_data": score_data
+    })
+    return True
+
+
+@stage("readme_evaluation", inputs=("readme_selection",), registry=FAST_STAGES)
+async def fast_readme_evaluation(username, selection):
+    return fast_evaluator.evaluate_readmes(selection)
+
+
+@stage(
+    "recruiter_screening",
+    inputs=("screening_score", "score_data", "readme_evaluation", "red_flags"),
+    registry=FAST_STAGES
+)
+async def fast_recruiter_screening(username, screening_score, score_data, readme_eval, flags):
+    return fast_evaluator.recruiter_screening(
+        username, screening_score, score_data["breakdown"], readme_eval, flags
+    )
+
+
+@stage("growth_roadmap", inputs=("github_portfolio_score", "score_data", "red_flags"),
+       registry=FAST_STAGES)
+async def fast_growth_roadmap(username, final_score, score_data, flags):
+    return fast_evaluator.growth_roadmap(username, final_score, score_data["breakdown"], flags)
+
+
+@stage(
+    "cohort_rank",
+    inputs=("github_portfolio_score", "score_breakdown", "engineering_depth_score"),
+    registry=FAST_STAGES
+)
+async def fast_cohort_rank(username, final_score, breakdown, engineering_score):
+    """
+    Rank against the cohort without joining it: heuristic README scores
+    would skew the totals everyone else is ranked on
+    """
+    index = get_cohort_index()
+    if index is None:
+        return None
+
+    return {
+        metric: {"score": value, "percentile": index.percentile(metric, value)}
+        for metric, value in cohort_metrics(final_score, breakdown, engineering_score).items()
+    }
+
+
+@stage(
+    "snapshot_saved",
+    inputs=("profile", "repos", "repo_states", "readmes", "activity", "score_data")
+)
+async def save_snapshot(username, profile, repos, repo_states, readmes, activity, score_data):
+    store = get_snapshot_store()
+    if store is None:
+        return False
+
+    await asyncio.to_thread(store.save, username, {
+        "repos": repo_states,
+        "readmes": readme_states(repos, readmes),
+        "activity": activity_states(repos, activity),
+        "score_fingerprint": score_fingerprint(profile, repos),
+        "score_data": score_data
+    })
+    return True
+
+
+# ---------- Report ----------
+
+# Key order of the assembled report
+REPORT_SECTIONS = [
+    "mode",
+    "top_repositories",
+    "repo_activity",
+    "activity_totals",
+    "username",
+    "github_portfolio_score",
+    "score_breakdown",
+    "readme_evaluation",
+    "recruiter_screening",
+    "commit_analysis",
+    "engineering_depth_score",
+    "cohort_rank",
+    "red_flags",
+    "growth_roadmap"
+]
+
+# Stages whose result is an early value of a report section
+SECTION_ALIASES = {"early_red_flags": "red_flags"}
+
+
+async def iter_report_sections(username: str, timings=None, mode="full"):
+    """
+    Yield (section, value) pairs of the report as each one is ready.
+
+    Deterministic sections come first; the LLM sections follow as their
+    calls finish. "red_flags" may be sent twice: first with the README
+    rule judged on whether a README exists, then again if the README
+    evaluation changes the verdict. The first pair is always
+    ("mode", mode); for an unknown user the only other one is
+    ("error", message).
+    """
+    stages = stages_for(mode)
+    sent = {"mode": mode}
+    yield "mode", mode
+
+    try:
+        async for name, value in execute(stages, username, timings):
+            section = SECTION_ALIASES.get(name, name)
+            if section not in REPORT_SECTIONS:
+                continue
+            # The final red flags only need sending when they differ
+            if section in sent and sent[section] == value:
+                continue
+            # ...and the early ones are moot once the final ones are out
+            if name in SECTION_ALIASES and section in sent:
+                continue
+
+            sent[section] = value
+            yield section, value
+    except UserNotFoundError as e:
+        yield "error", str(e)
+
+
+async def build_report(username: str, timings=None, mode="full"):
+    """
+    Run the whole pipeline and return the report dict
+    """
+    sections = {}
+    async for section, value in iter_report_sections(username, timings, mode):
+        if section == "error":
+            return {"error": value}
+        sections[section] = value
+
+    return {key: sections[key] for key in REPORT_SECTIONS}
@@ -0,0 +1,276 @@
+import asyncio
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+DEFAULT_MAX_WAIT = 120
+SECONDARY_BACKOFF = 60
+
+
+class GitHubRateLimitError(Exception):
+    """
+    Raised when no token can serve a request within the allowed wait
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def resource_for_path(path: str):
+    """
+    Map a request path to the GitHub rate-limit bucket it draws from
+    """
+    if path.startswith("/search"):
+        return "search"
+    if path.startswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+def load_tokens():
+    """
+    Read the configured token pool from GITHUB_TOKENS (comma separated)
+    and GITHUB_TOKEN. An empty pool means anonymous requests.
+    """
+    tokens = [
+        token.strip()
+        for token in os.getenv("GITHUB_TOKENS", "").split(",")
+        if token.strip()
+    ]
+
+    single = os.getenv("GITHUB_TOKEN")
+    if single and single not in tokens:
+        tokens.append(single)
+
+    return tokens
+
+
+class _Budget:
+    def __init__(self):
+        self.remaining = None
+        self.limit = None
+        self.reset_at = 0.0
+
+
+class _TokenState:
+    def __init__(self, token, label):
+        self.token = token
+        self.label = label
+        self.budgets = {}
+        self.blocked_until = 0.0
+
+    def budget(self, resource):
+        if resource not in self.budgets:
+            self.budgets[resource] = _Budget()
+        return self.budgets[resource]
+
+
+class RateLimitScheduler:
+    """
+    Hand out tokens from a pool according to their remaining budget.
+
+    Budgets are learned from X-RateLimit-* response headers. When every
+    token is spent (or backing off from a secondary limit) callers are
+    delayed until the earliest reset instead of failing, up to `max_wait`.
+    """
+
+    def __init__(self, tokens=None, max_wait=DEFAULT_MAX_WAIT):
+        tokens = tokens or [None]
+        self.max_wait = max_wait
+        self._states = [
+            _TokenState(token, f"token-{index}" if token else "anonymous")
+            for index, token in enumerate(tokens)
+        ]
+        self._by_token = {state.token: state for state in self._states}
+        self._lock = threading.Lock()
+        self._counters = {
+            "requests": 0,
+            "primary_limit_waits": 0,
+            "secondary_limit_retries": 0,
+            "not_found": 0,
+            "wait_seconds": 0.0
+        }
+
+    def _pick(self, resource, now):
+        """
+        Return (state, 0) for the best usable token, or (None, delay)
+        until one frees up. Must hold the lock.
+        """
+        best = None
+        best_remaining = -1
+        next_free = None
+
+        for state in self._states:
+            budget = state.budget(resource)
+
+            if budget.remaining is not None and budget.reset_at <= now:
+                budget.remaining = None
+
+            free_at = state.blocked_until
+            if budget.remaining == 0:
+                free_at = max(free_at, budget.reset_at)
+
+            if free_at > now:
+                next_free = free_at if next_free is None else min(next_free, free_at)
+                continue
+
+            remaining = budget.remaining if budget.remaining is not None else float("inf")
+            if remaining > best_remaining:
+                best = state
+                best_remaining = remaining
+
+        if best is not None:
+            budget = best.budget(resource)
+            if budget.remaining is not None:
+                # Reserve one request so concurrent callers spread out
+                budget.remaining -= 1
+            return best, 0.0
+
+        return None, max(next_free - now, 0.0) + 1.0
+
+    async def acquire(self, resource="core"):
+        """
+        Wait for a token with budget left in `resource` and return it
+        """
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                state, delay = self._pick(resource, time.time())
+                if state is not None:
+                    self._counters["requests"] += 1
+                    self._counters["wait_seconds"] += waited
+                    return state.token
+
+                if waited == 0.0:
+                    self._counters["primary_limit_waits"] += 1
+
+            if waited + delay > self.max_wait:
+                raise GitHubRateLimitError(
+                    f"GitHub rate limit exhausted for '{resource}'",
+                    retry_after=int(delay)
+                )
+
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def available(self, resource="core"):
+        """
+        True when some token could send a `resource` request right now,
+        without reserving it
+        """
+        now = time.time()
+
+        with self._lock:
+            for state in self._states:
+                budget = state.budget(resource)
+                if state.blocked_until > now:
+                    continue
+                if budget.remaining == 0 and budget.reset_at > now:
+                    continue
+                return True
+
+        return False
+
+    def update(self, token, headers):
+        """
+        Record the budget reported by a response
+        """
+        remaining = headers.get("x-ratelimit-remaining")
+        if remaining is None:
+            return
+
+        resource = headers.get("x-ratelimit-resource", "core")
+
+        with self._lock:
+            state = self._by_token.get(token)
+            if state is None:
+                return
+
+            budget = state.budget(resource)
+            budget.remaining = int(remaining)
+            budget.limit = int(headers.get("x-ratelimit-limit", 0)) or budget.limit
+            budget.reset_at = float(headers.get("x-ratelimit-reset", 0))
+
+    def mark_exhausted(self, token, resource, reset_at):
+        with self._lock:
+            state = self._by_token.get(token)
+            if state is None:
+                return
+
+            budget = state.budget(resource)
+            budget.remaining = 0
+            budget.reset_at = max(budget.reset_at, reset_at)
+
+    def backoff(self, token, seconds):
+        """
+        Park a token after a secondary (abuse) rate limit response
+        """
+        with self._lock:
+            self._counters["secondary_limit_retries"] += 1
+            state = self._by_token.get(token)
+            if state is not None:
+                state.blocked_until = max(state.blocked_until, time.time() + seconds)
+
+    def record_not_found(self):
+        with self._lock:
+            self._counters["not_found"] += 1
+
+    def stats(self):
+        """
+        Return request counters and each token's known budgets
+        """
+        with self._lock:
+            return {
+                **self._counters,
+                "wait_seconds": round(self._counters["wait_seconds"], 2),
+                "tokens": {
+                    state.label: {
+                        resource: {
+                            "remaining": budget.remaining,
+                            "limit": budget.limit,
+                            "reset_at": budget.reset_at
+                        }
+                        for resource, budget in state.budgets.items()
+                    }
+                    for state in self._states
+                }
+            }
+
+
+def classify_limit_response(response):
+    """
+    Return "primary", "secondary" or None for a GitHub response
+    """
+    if response.status_code not in (403, 429):
+        return None
+
+    if response.headers.get("x-ratelimit-remaining") == "0":
+        return "primary"
+
+    if "retry-after" in response.headers or "secondary rate limit" in response.text.lower():
+        return "secondary"
+
+    return None
+
+
+def retry_after_seconds(value, default):
+    """
+    Seconds to wait from a Retry-After header, which is either a number
+    of seconds or an HTTP-date; `default` when absent or unparseable
+    """
+    if not value:
+        return default
+
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,211 @@
+import math
+import re
+import zlib
+
+# Five-word shingles; short enough to survive edited project names,
+# long enough that unrelated READMEs rarely share many
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+# 16 bands of 4 rows: pairs above ~0.6 Jaccard almost always share a band
+BANDS = 16
+DUPLICATE_THRESHOLD = 0.8
+DEFAULT_TOP_N = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Phrases of unedited starter READMEs; a match marks the text as a template
+TEMPLATE_MARKERS = (
+    "this project was bootstrapped with [create react app]",
+    "this project was bootstrapped with create react app",
+    "this is a [next.js](https://nextjs.org) project bootstrapped with",
+    "this template should help get you started developing with vue",
+    "this template provides a minimal setup to get react working in vite",
+    "this project was generated with [angular cli]",
+    "this is a new [**react native**]",
+    "this repository contains starter code",
+    "starter code for",
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+_HEADING = re.compile(r"^#{1,6}\s+\S", re.MULTILINE)
+_SECTION = re.compile(r"^#{1,6}\s+(.*)$", re.MULTILINE)
+_FENCE = re.compile(r"^```", re.MULTILINE)
+_LINK = re.compile(r"\[[^\]]+\]\([^)]+\)")
+_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]+\)|<img\s", re.IGNORECASE)
+
+INSTALL_WORDS = ("install", "setup", "set up", "getting started", "quick start", "quickstart")
+USAGE_WORDS = ("usage", "example", "how to use", "running", "run ")
+
+
+def is_template(text):
+    lowered = text.lower()
+    return any(marker in lowered for marker in TEMPLATE_MARKERS)
+
+
+def structure_features(text):
+    """
+    Markdown structure of a README: counts of headings, code blocks,
+    links and words, and whether it has install and usage sections
+    and images
+    """
+    text = text or ""
+    sections = " ".join(_SECTION.findall(text)).lower()
+
+    return {
+        "headings": len(_HEADING.findall(text)),
+        "code_blocks": len(_FENCE.findall(text)) // 2,
+        "install_section": any(word in sections for word in INSTALL_WORDS),
+        "usage_section": any(word in sections for word in USAGE_WORDS),
+        "links": len(_LINK.findall(text)),
+        "images": bool(_IMAGE.search(text)),
+        "words": len(_WORD.findall(text.lower()))
+    }
+
+
+def structure_score(text, features=None):
+    """
+    Cheap 0-100 estimate of how complete a README is, from headings,
+    code blocks, install and usage sections, links, images and length
+    """
+    if not text:
+        return 0
+
+    features = features or structure_features(text)
+
+    score = min(features["headings"] * 4, 20)
+    score += min(features["code_blocks"] * 5, 15)
+    score += 15 if features["install_section"] else 0
+    score += 15 if features["usage_section"] else 0
+    score += min(features["links"] * 2, 10)
+    score += 5 if features["images"] else 0
+    # 20 points by ~800 words, on a log scale so padding earns little
+    score += min(int(math.log1p(features["words"]) / math.log1p(800) * 20), 20)
+
+    return min(score, 100)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """
+    32-bit hashes of the text's overlapping `size`-word windows
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode())
+        for i in range(len(words) - size + 1)
+    }
+
+
+def _permutations(count=NUM_PERMUTATIONS, seed=1):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    # Below 2**32, so a * x + b stays inside uint64 for 32-bit shingles
+    a = rng.integers(1, _MAX_HASH, size=count, dtype=np.uint64)
+    b = rng.integers(0, _MAX_HASH, size=count, dtype=np.uint64)
+    return a, b
+
+
+def minhash(shingle_set, permutations=None):
+    """
+    MinHash signature of a shingle set, one value per permutation
+    """
+    import numpy as np
+
+    a, b = permutations or _permutations()
+    if not shingle_set:
+        return np.full(len(a), _MAX_HASH, dtype=np.uint64)
+
+    values = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set))
+    hashed = ((a[:, None] * values[None, :] + b[:, None]) % _MERSENNE_PRIME) & _MAX_HASH
+    return hashed.min(axis=1)
+
+
+def similarity(signature_a, signature_b):
+    """
+    Estimated Jaccard similarity of two signatures
+    """
+    return float((signature_a == signature_b).mean())
+
+
+def duplicate_groups(texts, threshold=DUPLICATE_THRESHOLD):
+    """
+    Group the keys of `texts` ({key: text}) whose READMEs are near
+    copies, using LSH bands to find candidate pairs; returns a list of
+    key lists, singletons included
+    """
+    permutations = _permutations()
+    keys = list(texts)
+    signatures = {key: minhash(shingles(texts[key]), permutations) for key in keys}
+    parent = {key: key for key in keys}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    rows = NUM_PERMUTATIONS // BANDS
+    for band in range(BANDS):
+        buckets = {}
+        for key in keys:
+            bucket = signatures[key][band * rows:(band + 1) * rows].tobytes()
+            buckets.setdefault(bucket, []).append(key)
+
+        for members in buckets.values():
+            first = members[0]
+            for other in members[1:]:
+                if find(first) != find(other) and \
+                        similarity(signatures[first], signatures[other]) >= threshold:
+                    parent[find(other)] = find(first)
+
+    groups = {}
+    for key in keys:
+        groups.setdefault(find(key), []).append(key)
+    return list(groups.values())
+
+
+def select_readmes(readmes, top_n=DEFAULT_TOP_N):
+    """
+    Pick the READMEs worth sending to the LLM from {repo name: text}.
+
+    Near-duplicates are collapsed to their best-structured copy, starter
+    templates are dropped unless nothing else is left, and the `top_n`
+    highest structure scores are kept. Returns a dict with "selected"
+    ([{"repo", "text", "structure_score", "copies"}], best first) and
+    counts of what was fetched and skipped.
+    """
+    texts = {name: text for name, text in readmes.items() if text and text.strip()}
+    scores = {name: structure_score(text) for name, text in texts.items()}
+    # Copies of one template differ mostly in the project name
+    unnamed = {
+        name: re.sub(re.escape(name), " ", text, flags=re.IGNORECASE)
+        for name, text in texts.items()
+    }
+
+    candidates = []
+    for group in duplicate_groups(unnamed):
+        best = max(sorted(group), key=lambda name: scores[name])
+        candidates.append({
+            "repo": best,
+            "text": texts[best],
+            "structure_score": scores[best],
+            "copies": len(group),
+            "template": is_template(texts[best])
+        })
+
+    original = [c for c in candidates if not c["template"]] or candidates
+    original.sort(key=lambda c: (-c["structure_score"], c["repo"]))
+
+    return {
+        "selected": [
+            {key: c[key] for key in ("repo", "text", "structure_score", "copies")}
+            for c in original[:top_n]
+        ],
+        "readmes_found": len(texts),
+        "unique_readmes": len(candidates),
+        "templates_skipped": len(candidates) - len(original)
+    }
@@ -1,25 +1,32 @@
+NO_README = "No proper README documentation detected."
+MOSTLY_FORKS = "Majority repositories are forked projects."
+INACTIVITY_GAPS = "Large inactivity gaps detected in commits."
+LOW_QUALITY_COMMITS = "High percentage of low-quality commit messages."
+FEW_REPOS = "Very few public repositories."
+
+
 def detect_red_flags(profile, repos, commit_data, readme_eval):
     flags = []
 
     # No README
     if readme_eval.get("readme_score", 0) == 0:
-        flags.append("No proper README documentation detected.")
+        flags.append(NO_README)
 
     # Too many forks
-    forked = sum(1 for repo in repos if repo.get("fork"))
+    forked = sum(1 for repo in repos if repo.fork)
     if forked > len(repos) * 0.6:
-        flags.append("Majority repositories are forked projects.")
+        flags.append(MOSTLY_FORKS)
 
     # Low consistency
     if commit_data.get("consistency_score", 0) < 5:
-        flags.append("Large inactivity gaps detected in commits.")
+        flags.append(INACTIVITY_GAPS)
 
     # High meaningless commit ratio
     if commit_data.get("meaningless_commit_ratio", 0) > 0.5:
-        flags.append("High percentage of low-quality commit messages.")
+        flags.append(LOW_QUALITY_COMMITS)
 
     # Very low public repos
     if profile.get("public_repos", 0) < 3:
-        flags.append("Very few public repositories.")
+        flags.append(FEW_REPOS)
 
     return flags
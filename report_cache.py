@@ -0,0 +1,183 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from async_runtime import submit
+
+DEFAULT_TTL = 300
+DEFAULT_MAX_STALE = 3600
+DEFAULT_MAX_ENTRIES = 1000
+
+
+def _resolved(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+class ReportCache:
+    """
+    Whole-report cache with stale-while-revalidate.
+
+    Reports younger than `ttl` are served as is. Older ones, up to
+    `ttl + max_stale`, are served immediately while one background
+    refresh runs. Concurrent requests for a key that is being computed
+    share that single computation.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_stale=DEFAULT_MAX_STALE,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._counters = {"fresh": 0, "stale": 0, "miss": 0, "coalesced": 0}
+
+    def lookup(self, key, compute, refresh=False):
+        """
+        Return (concurrent Future of the report, cache status).
+
+        `compute` is a zero-argument callable returning a coroutine; it
+        runs on the shared background loop so any thread or loop can wait.
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            age = now - entry[0] if entry else None
+
+            if entry and not refresh and age < self.ttl:
+                self._entries.move_to_end(key)
+                self._counters["fresh"] += 1
+                return _resolved(entry[1]), {"status": "fresh", "age_seconds": round(age, 1)}
+
+            if entry and not refresh and age < self.ttl + self.max_stale:
+                self._counters["stale"] += 1
+                self._start(key, compute)
+                return _resolved(entry[1]), {"status": "stale", "age_seconds": round(age, 1)}
+
+            if key in self._inflight:
+                self._counters["coalesced"] += 1
+                status = "in_flight"
+            else:
+                self._counters["miss"] += 1
+                status = "miss"
+            return self._start(key, compute), {"status": status, "age_seconds": 0}
+
+    def _start(self, key, compute):
+        """
+        Start computing `key` unless it already is. Must hold the lock.
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = submit(self._run(key, compute))
+            self._inflight[key] = future
+        return future
+
+    async def _run(self, key, compute):
+        try:
+            report = await compute()
+            self.store(key, report)
+            return report
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def peek(self, key):
+        """
+        Return (report, cache status) when a fresh report is cached,
+        otherwise None; never starts a computation
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            age = time.time() - entry[0] if entry else None
+
+            if entry is None or age >= self.ttl:
+                self._counters["miss"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._counters["fresh"] += 1
+            return entry[1], {"status": "fresh", "age_seconds": round(age, 1)}
+
+    def store(self, key, report):
+        """
+        Keep a report computed outside `lookup` (e.g. a streamed one)
+        """
+        # Errors (unknown user, rate limit) are not worth keeping
+        if "error" in report:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.time(), report)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key, compute, refresh=False):
+        """
+        Blocking lookup; returns (report, cache status)
+        """
+        future, status = self.lookup(key, compute, refresh)
+        return future.result(), status
+
+    async def get_async(self, key, compute, refresh=False):
+        """
+        Awaitable lookup; returns (report, cache status). Cancelling one
+        waiter leaves the shared computation running for the others.
+        """
+        future, status = self.lookup(key, compute, refresh)
+        return await asyncio.shield(asyncio.wrap_future(future)), status
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = sum(self._counters.values())
+            served = self._counters["fresh"] + self._counters["stale"]
+            return {
+                **self._counters,
+                "hit_ratio": round(served / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "in_flight": len(self._inflight)
+            }
+
+
+def report_key(username, mode="full"):
+    """
+    Cache key of a report; fast-mode reports never stand in for full ones
+    """
+    return username.lower() if mode == "full" else f"{username.lower()}:{mode}"
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_report_cache():
+    """
+    Return the shared report cache, or None when disabled via REPORT_CACHE=0
+    """
+    global _cache
+
+    if os.getenv("REPORT_CACHE", "1") == "0":
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ReportCache(
+                    ttl=int(os.getenv("REPORT_CACHE_TTL", str(DEFAULT_TTL))),
+                    max_stale=int(os.getenv("REPORT_CACHE_MAX_STALE", str(DEFAULT_MAX_STALE))),
+                    max_entries=int(os.getenv("REPORT_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES)))
+                )
+
+    return _cache
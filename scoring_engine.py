@@ -12,16 +12,25 @@ def calculate_portfolio_score(profile, repos):
     follower_points = min(profile.get("followers", 0) // 10, 10)
     score += follower_points
 
-    total_stars = sum(repo.get("stargazers_count", 0) for repo in repos[:5])
+    # Single pass so `repos` may be a streaming iterator
+    total_stars = 0
+    languages = set()
+    active_repos = 0
+
+    for index, repo in enumerate(repos):
+        if index < 5:
+            total_stars += repo.stars
+        if repo.language:
+            languages.add(repo.language)
+        if not repo.fork:
+            active_repos += 1
+
     star_points = min(total_stars // 50, 20)
     score += star_points
 
-
-    languages = set(repo.get("language") for repo in repos if repo.get("language"))
     language_points = min(len(languages) * 3, 15)
     score += language_points
 
-    active_repos = sum(1 for repo in repos if not repo.get("fork"))
     active_points = min(active_repos * 2, 20)
     score += active_points
 
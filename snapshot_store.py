@@ -0,0 +1,257 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from commit_analyzer import analyze_commit_arrays, extract_commit_features
+from github_service import (
+    DEFAULT_COMMIT_LIMIT,
+    get_repo_commits_async,
+    get_repo_readmes_async,
+    get_user_activity_async
+)
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(".cache", "snapshots.sqlite")
+COMMIT_FETCH_CONCURRENCY = 8
+
+
+class SnapshotStore:
+    """
+    Per-user record of what the last analysis saw: each repo's pushed_at,
+    its recent commits (sha, timestamp, meaningful flag), README text and
+    issue/PR counts, and the last portfolio score with the inputs it was
+    computed from
+    """
+
+    def __init__(self, path=DEFAULT_SNAPSHOT_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                username TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def load(self, username: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM snapshots WHERE username = ?",
+                (username.lower(),)
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def save(self, username: str, snapshot):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots (username, data, updated_at) VALUES (?, ?, ?)",
+                (username.lower(), json.dumps(snapshot), time.time())
+            )
+            self._conn.commit()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_snapshot_store():
+    """
+    Return the shared snapshot store, or None when disabled via SNAPSHOT_STORE=0
+    """
+    global _store
+
+    if os.getenv("SNAPSHOT_STORE", "1") == "0":
+        return None
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SnapshotStore(os.getenv("SNAPSHOT_DB_PATH", DEFAULT_SNAPSHOT_PATH))
+
+    return _store
+
+
+def score_fingerprint(profile, repos):
+    """
+    Hash of every input calculate_portfolio_score reads
+    """
+    material = json.dumps([
+        profile.get("public_repos", 0),
+        profile.get("followers", 0),
+        [
+            [r.stars, r.language, r.fork]
+            for r in repos
+        ]
+    ])
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def _commit_entries(commits):
+    """
+    Compact a commit list to [sha, epoch seconds, meaningful] rows, newest first
+    """
+    if not commits:
+        return []
+
+    timestamps, meaningful = extract_commit_features(commits)
+    rows = [
+        [commit.get("sha"), int(ts), bool(flag)]
+        for commit, ts, flag in zip(commits, timestamps.tolist(), meaningful.tolist())
+    ]
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return rows
+
+
+def _iso(epoch_seconds):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch_seconds))
+
+
+async def refresh_repo_commits_async(username: str, repos, previous=None):
+    """
+    Return {repo name: state} with the recent commits of every repo.
+
+    Repos whose pushed_at matches the snapshot are reused without a
+    request; repos pushed since then only fetch commits after the last
+    one recorded; new repos are fetched in full.
+    """
+    previous_repos = (previous or {}).get("repos", {})
+    semaphore = asyncio.Semaphore(COMMIT_FETCH_CONCURRENCY)
+
+    async def refresh(repo):
+        name = repo.name
+        known = previous_repos.get(name)
+
+        if known and known["pushed_at"] == repo.pushed_at:
+            return name, known
+
+        async with semaphore:
+            if known and known["commits"]:
+                newest = known["commits"][0]
+                fresh = await get_repo_commits_async(
+                    username, name, since=_iso(newest[1])
+                )
+                known_shas = {row[0] for row in known["commits"]}
+                rows = [row for row in _commit_entries(fresh) if row[0] not in known_shas]
+                rows = (rows + known["commits"])[:DEFAULT_COMMIT_LIMIT]
+            else:
+                rows = _commit_entries(await get_repo_commits_async(username, name))
+
+        return name, {"pushed_at": repo.pushed_at, "commits": rows}
+
+    results = await asyncio.gather(*(refresh(repo) for repo in repos))
+    return dict(results)
+
+
+def readme_states(repos, readmes):
+    """
+    Snapshot entries for fetched READMEs: {repo name: {pushed_at, text}}
+    """
+    return {
+        repo.name: {"pushed_at": repo.pushed_at, "text": readmes[repo.name]}
+        for repo in repos
+        if repo.name in readmes
+    }
+
+
+async def refresh_readmes_async(username: str, repos, previous=None):
+    """
+    Return {repo name: README text or None}. A README only changes with a
+    push, so repos whose pushed_at matches the snapshot reuse the stored
+    text; the rest are fetched.
+    """
+    stored = (previous or {}).get("readmes", {})
+    readmes = {}
+    stale = []
+
+    for repo in repos:
+        known = stored.get(repo.name)
+        if known and known["pushed_at"] == repo.pushed_at:
+            readmes[repo.name] = known["text"]
+        else:
+            stale.append(repo.name)
+
+    if stale:
+        readmes.update(await get_repo_readmes_async(username, stale))
+    return {repo.name: readmes[repo.name] for repo in repos}
+
+
+def _activity_version(repo):
+    """
+    What has to match for stored issue/PR counts to be reused. Issues and
+    PRs open and close without a push, but each one moves the repo's
+    open_issues_count (which counts both); a merge also moves pushed_at.
+    """
+    return [repo.pushed_at, repo.open_issues]
+
+
+def activity_states(repos, activity):
+    """
+    Snapshot entries for fetched activity counts: {repo name: {version, counts}}
+    """
+    return {
+        repo.name: {"version": _activity_version(repo), "counts": activity[repo.name]}
+        for repo in repos
+        if repo.name in activity and repo.open_issues is not None
+    }
+
+
+async def refresh_activity_async(username: str, repos, previous=None):
+    """
+    Return {repo name: activity counts}, reusing the stored counts of
+    repos with neither a push nor a change in open issues and PRs since
+    the snapshot. Repos without open_issues_count (GraphQL) are always
+    fetched, from the same single query as everything else.
+    """
+    stored = (previous or {}).get("activity", {})
+    activity = {}
+    stale = []
+
+    for repo in repos:
+        known = stored.get(repo.name)
+        if known and repo.open_issues is not None and known["version"] == _activity_version(repo):
+            activity[repo.name] = known["counts"]
+        else:
+            stale.append(repo)
+
+    if stale:
+        activity.update(await get_user_activity_async(username, stale))
+    return {repo.name: activity[repo.name] for repo in repos}
+
+
+def analyze_repo_states(repo_states):
+    """
+    Run the commit analyzer over the merged commits of every repo state,
+    counting commits shared between repos once
+    """
+    import numpy as np
+
+    seen = set()
+    timestamps = []
+    meaningful = []
+
+    for state in repo_states.values():
+        for sha, ts, flag in state["commits"]:
+            if sha is not None:
+                if sha in seen:
+                    continue
+                seen.add(sha)
+            timestamps.append(ts)
+            meaningful.append(flag)
+
+    return analyze_commit_arrays(
+        np.array(timestamps, dtype=np.int64),
+        np.array(meaningful, dtype=bool)
+    )
@@ -0,0 +1,210 @@
+"""
+Local stand-in for the GitHub REST endpoints the analyzer calls, serving
+synthetic users from benchmarks.synthetic with a configurable latency.
+
+    python -m stubs.github_rest --users 10 --repos 50 --commits 5000 --latency 0.02
+    GITHUB_BASE_URL=http://127.0.0.1:8766 uvicorn main:app
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from benchmarks.synthetic import generate_users, iter_commits
+
+RATE_LIMIT_HEADERS = {
+    "X-RateLimit-Limit": "5000",
+    "X-RateLimit-Remaining": "4999",
+    "X-RateLimit-Reset": "4102444800"
+}
+
+
+def _page_params(query, default_size=30):
+    size = min(int(query.get("per_page", [default_size])[0]), 100)
+    page = max(int(query.get("page", ["1"])[0]), 1)
+    return size, page
+
+
+def _link(url, query, page, rel):
+    params = {key: values[0] for key, values in query.items()}
+    params["page"] = page
+    return f'<{url}?{urlencode(params)}>; rel="{rel}"'
+
+
+def _links(url, query, page, last):
+    """
+    GitHub-style Link header with next and last relations
+    """
+    links = []
+    if page < last:
+        links.append(_link(url, query, page + 1, "next"))
+    if last > 1:
+        links.append(_link(url, query, last, "last"))
+    return ", ".join(links)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under concurrent load,
+    # which shows up as one-second SYN retries in the measurements
+    request_queue_size = 256
+
+
+class GitHubRESTHandler(BaseHTTPRequestHandler):
+    # Keep-alive, like api.github.com, so clients can pool connections
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY each
+    # response waits out a delayed ACK (~40 ms) on keep-alive connections
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        split = urlsplit(self.path)
+        parts = [part for part in split.path.split("/") if part]
+        query = parse_qs(split.query)
+        # Absolute, as in GitHub's Link headers
+        url = f"http://{self.headers.get('Host', 'localhost')}{split.path}"
+
+        if parts[:1] == ["users"] and len(parts) in (2, 3):
+            user = self.server.users.get(parts[1].lower())
+            if user is None:
+                return self._json(404, {"message": "Not Found"})
+            if len(parts) == 2:
+                return self._json(200, user["profile"])
+            if parts[2] == "repos":
+                return self._repos(url, query, user)
+
+        if parts[:1] == ["repos"] and len(parts) == 4:
+            user = self.server.users.get(parts[1].lower())
+            if user is None or parts[2] not in user["commit_counts"]:
+                return self._json(404, {"message": "Not Found"})
+            return self._repo_resource(url, query, user, parts[2], parts[3])
+
+        if parts == ["search", "issues"]:
+            return self._search(query)
+
+        self._json(404, {"message": "Not Found"})
+
+    def _repos(self, url, query, user):
+        repos = user["repos"]
+        if query.get("sort", [""])[0] == "pushed":
+            repos = sorted(repos, key=lambda repo: repo["pushed_at"], reverse=True)
+        self._paged(url, query, repos)
+
+    def _repo_resource(self, url, query, user, name, resource):
+        if resource == "readme":
+            text = user["readmes"].get(name)
+            if text is None:
+                return self._json(404, {"message": "Not Found"})
+            return self._send(200, text.encode(), "text/plain; charset=utf-8")
+
+        if resource == "commits":
+            size, page = _page_params(query)
+            start = (page - 1) * size
+            since = query.get("since", [None])[0]
+            commits = list(iter_commits(user, name, start, start + size + 1, since))
+            has_next = len(commits) > size
+            # Like GitHub, commit listings only say whether a next page exists
+            headers = {"Link": _link(url, query, page + 1, "next")} if has_next else {}
+            return self._json(200, commits[:size], headers)
+
+        if resource in ("issues", "pulls"):
+            counts = user["activity"][name]
+            state = query.get("state", ["open"])[0]
+            if resource == "pulls":
+                total = {
+                    "open": counts["open_prs"],
+                    "closed": counts["closed_prs"] + counts["merged_prs"]
+                }
+            else:
+                # Like GitHub, the issues listing includes pull requests
+                total = {
+                    "open": counts["open_issues"] + counts["open_prs"],
+                    "closed": counts["closed_issues"] + counts["closed_prs"] + counts["merged_prs"]
+                }
+            count = sum(total.values()) if state == "all" else total.get(state, 0)
+            return self._counted(url, query, count)
+
+        self._json(404, {"message": "Not Found"})
+
+    def _search(self, query):
+        terms = query.get("q", [""])[0].split()
+        repo = next((term[5:] for term in terms if term.startswith("repo:")), "")
+        owner, _, name = repo.partition("/")
+        user = self.server.users.get(owner.lower())
+
+        if user is None or name not in user["activity"]:
+            return self._json(422, {"message": "Validation Failed"})
+
+        total = user["activity"][name]["merged_prs"] if "is:merged" in terms else 0
+        self._json(200, {"total_count": total, "incomplete_results": False, "items": []})
+
+    def _paged(self, url, query, items):
+        size, page = _page_params(query)
+        last = max((len(items) + size - 1) // size, 1)
+        start = (page - 1) * size
+        links = _links(url, query, page, last)
+        self._json(200, items[start:start + size], {"Link": links} if links else {})
+
+    def _counted(self, url, query, count):
+        size, page = _page_params(query)
+        last = max((count + size - 1) // size, 1)
+        start = (page - 1) * size
+        items = [{"number": n + 1} for n in range(start, min(start + size, count))]
+        links = _links(url, query, page, last)
+        self._json(200, items, {"Link": links} if links else {})
+
+    def _json(self, status, payload, headers=None):
+        self._send(status, json.dumps(payload).encode(), "application/json", headers)
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        resource = "search" if self.path.startswith("/search") else "core"
+        self.send_header("X-RateLimit-Resource", resource)
+        for key, value in {**RATE_LIMIT_HEADERS, **(headers or {})}.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(users, host="127.0.0.1", port=0, latency=0.0):
+    """
+    Start the stand-in on a background thread and return the server;
+    its base URL is f"http://{host}:{server.server_port}"
+    """
+    server = StubServer((host, port), GitHubRESTHandler)
+    server.users = {login.lower(): user for login, user in users.items()}
+    server.latency = latency
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local GitHub REST stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--repos", type=int, default=30)
+    parser.add_argument("--commits", type=int, default=3000)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds added to every response")
+    args = parser.parse_args()
+
+    users = generate_users(args.users, args.repos, args.commits)
+    server = serve(users, args.host, args.port, args.latency)
+    print(f"GitHub REST stand-in on http://{args.host}:{server.server_port} "
+          f"serving {', '.join(list(users)[:3])}{', ...' if len(users) > 3 else ''}")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
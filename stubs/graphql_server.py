@@ -0,0 +1,162 @@
+"""
+Local stand-in for the GitHub GraphQL endpoint.
+
+It does not parse GraphQL; it answers the repository query used by
+github_graphql (honouring `login`, `after` and the page-size variables)
+from in-memory fixture users, so the backend can be exercised offline:
+
+    python -m stubs.graphql_server --port 8765
+    GITHUB_BACKEND=graphql GITHUB_GRAPHQL_URL=http://127.0.0.1:8765/graphql ...
+"""
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from github_graphql import README_PATHS
+
+
+def _fixture_readmes(index):
+    """
+    README blobs of a fixture repo: none for every third repo, README.md
+    for the next, and one of the other README_PATHS for the rest
+    """
+    blobs = {f"readme{i}": None for i in range(len(README_PATHS))}
+    if index % 3:
+        path = 0 if index % 3 == 1 else 1 + (index // 3) % (len(README_PATHS) - 1)
+        blobs[f"readme{path}"] = {"text": f"# project-{index:03d}\n\n## Usage\n\n```\nrun it\n```\n"}
+    return blobs
+
+
+def _fixture_repo(index):
+    day = 1 + index % 28
+    language = ["Python", "TypeScript", "Go", None][index % 4]
+    return {
+        "name": f"project-{index:03d}",
+        "description": f"Sample project {index}",
+        "url": f"https://github.com/octo-sample/project-{index:03d}",
+        "isFork": index % 5 == 0,
+        "stargazerCount": (index * 7) % 60,
+        "forkCount": index % 4,
+        "diskUsage": 100 + index,
+        "pushedAt": f"2025-{1 + index % 12:02d}-{day:02d}T12:00:00Z",
+        "primaryLanguage": {"name": language} if language else None,
+        "openIssues": {"totalCount": index % 4},
+        "closedIssues": {"totalCount": index % 9},
+        "openPRs": {"totalCount": index % 2},
+        "closedPRs": {"totalCount": index % 3},
+        "mergedPRs": {"totalCount": index % 6},
+        **_fixture_readmes(index),
+        "defaultBranchRef": {
+            "target": {
+                "history": {
+                    "nodes": [
+                        {
+                            "oid": f"{index:04d}{commit:036d}",
+                            "message": "Add feature" if commit % 3 else "update",
+                            "authoredDate": f"2025-{1 + commit % 12:02d}-{1 + commit % 28:02d}T09:00:00Z"
+                        }
+                        for commit in range(20)
+                    ]
+                }
+            }
+        }
+    }
+
+
+FIXTURE_USERS = {
+    "octo-sample": {
+        "login": "octo-sample",
+        "name": "Octo Sample",
+        "bio": "Fixture user for the GraphQL stand-in",
+        "company": None,
+        "location": None,
+        "avatarUrl": "https://avatars.githubusercontent.com/u/0",
+        "url": "https://github.com/octo-sample",
+        "createdAt": "2020-01-01T00:00:00Z",
+        "followers": {"totalCount": 42},
+        "following": {"totalCount": 7},
+        "repositories": [_fixture_repo(i) for i in range(120)]
+    }
+}
+
+
+def answer(variables, users=FIXTURE_USERS):
+    """
+    Build the GraphQL response body for one page of the user query
+    """
+    user = users.get((variables.get("login") or "").lower())
+    if user is None:
+        return {
+            "data": {"user": None},
+            "errors": [{
+                "type": "NOT_FOUND",
+                "message": f"Could not resolve to a User with the login of '{variables.get('login')}'."
+            }]
+        }
+
+    repos = user["repositories"]
+    start = int(variables.get("after") or 0)
+    size = int(variables.get("repoPageSize") or 50)
+    commit_count = int(variables.get("commitCount") or 100)
+    end = min(start + size, len(repos))
+
+    nodes = []
+    for repo in repos[start:end]:
+        node = dict(repo)
+        history = node["defaultBranchRef"]["target"]["history"]["nodes"][:commit_count]
+        node["defaultBranchRef"] = {"target": {"history": {"nodes": history}}}
+        nodes.append(node)
+
+    body = {key: value for key, value in user.items() if key != "repositories"}
+    body["repositories"] = {
+        "totalCount": len(repos),
+        "pageInfo": {"hasNextPage": end < len(repos), "endCursor": str(end)},
+        "nodes": nodes
+    }
+    return {"data": {"user": body}}
+
+
+class GraphQLHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.path.rstrip("/") != "/graphql":
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        body = json.dumps(answer(request.get("variables") or {})).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Resource", "graphql")
+        self.send_header("X-RateLimit-Limit", "5000")
+        self.send_header("X-RateLimit-Remaining", "4999")
+        self.send_header("X-RateLimit-Reset", "4102444800")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host="127.0.0.1", port=0):
+    """
+    Start the stand-in on a background thread and return the server;
+    its URL is f"http://{host}:{server.server_port}/graphql"
+    """
+    server = ThreadingHTTPServer((host, port), GraphQLHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local GitHub GraphQL stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), GraphQLHandler)
+    print(f"GraphQL stand-in on http://{args.host}:{args.port}/graphql")
+    server.serve_forever()
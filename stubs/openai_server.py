@@ -0,0 +1,143 @@
+"""
+Local stand-in for an OpenAI-compatible chat completions endpoint that
+answers the analyzer's three prompts with fixed JSON after a
+configurable delay.
+
+    python -m stubs.openai_server --latency 0.5
+    GROQ_BASE_URL=http://127.0.0.1:8767/v1 GROQ_API_KEY=stub uvicorn main:app
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+README_ANSWER = {
+    "readme_score": 14,
+    "strengths": ["Clear installation steps", "Usage example", "Feature list"],
+    "improvements": ["Add screenshots", "Explain the architecture", "Add a license section"]
+}
+
+SCREENING_ANSWER = {
+    "screening_decision": "Borderline",
+    "recruiter_summary": "Solid fundamentals with uneven documentation.",
+    "top_improvements": ["Pin the strongest projects", "Add tests", "Deploy a demo"]
+}
+
+ROADMAP_ANSWER = {
+    f"week{week}": {
+        "focus": f"Focus area {week}",
+        "tasks": [f"Task {week}.{task}" for task in range(1, 4)]
+    }
+    for week in range(1, 5)
+}
+
+
+def answer(prompt):
+    """
+    Pick the canned answer for whichever evaluator wrote `prompt`
+    """
+    if "Evaluate each of the following GitHub READMEs" in prompt:
+        names = re.findall(r"^\s*--- README \d+ \((.+?)\) ---$", prompt, re.MULTILINE)
+        return json.dumps({
+            "readmes": [
+                {"repo": name, "readme_score": README_ANSWER["readme_score"] - i}
+                for i, name in enumerate(names)
+            ],
+            "strengths": README_ANSWER["strengths"],
+            "improvements": README_ANSWER["improvements"]
+        })
+    if "Evaluate the following GitHub README" in prompt:
+        return json.dumps(README_ANSWER)
+    if "initial GitHub screening" in prompt:
+        return json.dumps(SCREENING_ANSWER)
+    if "30-day improvement roadmap" in prompt:
+        return json.dumps(ROADMAP_ANSWER)
+    return "Hello from the stand-in."
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under concurrent load,
+    # which shows up as one-second SYN retries in the measurements
+    request_queue_size = 256
+
+
+class ChatHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY each
+    # response waits out a delayed ACK (~40 ms) on keep-alive connections
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self._json(404, {"error": {"message": "Not Found"}})
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        prompt = "\n".join(m.get("content") or "" for m in request.get("messages", []))
+        content = answer(prompt)
+        # Roughly four characters per token
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+
+        self._json(200, {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content}
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    def _json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host="127.0.0.1", port=0, latency=0.0):
+    """
+    Start the stand-in on a background thread and return the server;
+    its base URL is f"http://{host}:{server.server_port}/v1"
+    """
+    server = StubServer((host, port), ChatHandler)
+    server.latency = latency
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible chat stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds added to every completion")
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, args.latency)
+    print(f"Chat completions stand-in on http://{args.host}:{server.server_port}/v1")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
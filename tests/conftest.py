@@ -0,0 +1,82 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ai_evaluator  # noqa: E402
+import github_graphql  # noqa: E402
+import github_service  # noqa: E402
+from async_runtime import run_sync  # noqa: E402
+from benchmarks.synthetic import generate_user, generate_users  # noqa: E402
+from stubs import github_rest, graphql_server, openai_server  # noqa: E402
+
+# 150 repos span two REST pages of 100; 1,500 commits give some repos
+# several pages of commits
+REPOS = 150
+COMMITS = 1500
+EMPTY_USER = "empty-user"
+UNKNOWN_USER = "nobody-here"
+
+
+@pytest.fixture(scope="session")
+def users():
+    users = generate_users(2, repos=REPOS, commits=COMMITS, prefix="test-user")
+    users[EMPTY_USER] = generate_user(EMPTY_USER, repos=0, commits=0)
+    return users
+
+
+@pytest.fixture(scope="session")
+def rest_stub(users):
+    server = github_rest.serve(users)
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture(scope="session")
+def graphql_stub():
+    server = graphql_server.serve()
+    yield f"http://127.0.0.1:{server.server_port}/graphql"
+    server.shutdown()
+
+
+@pytest.fixture(scope="session")
+def llm_stub():
+    server = openai_server.serve()
+    yield f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+
+
+async def _close_clients():
+    await github_service.close_async_client()
+    await ai_evaluator.close_async_client()
+
+
+def _reset_services():
+    # Pooled clients and the scheduler read their configuration once
+    run_sync(_close_clients())
+    github_service._scheduler = None
+    github_graphql._memo.clear()
+
+
+@pytest.fixture
+def services(monkeypatch, rest_stub, graphql_stub, llm_stub):
+    """
+    Point the service layer at the stand-ins with every persistent cache
+    off, so each test starts cold
+    """
+    for name in ("GITHUB_TOKEN", "GITHUB_TOKENS", "CASSETTE_MODE"):
+        monkeypatch.delenv(name, raising=False)
+
+    monkeypatch.setenv("GITHUB_BASE_URL", rest_stub)
+    monkeypatch.setenv("GITHUB_GRAPHQL_URL", graphql_stub)
+    monkeypatch.setenv("GITHUB_BACKEND", "rest")
+    monkeypatch.setenv("GROQ_BASE_URL", llm_stub)
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+    for name in ("GITHUB_HTTP_CACHE", "LLM_CACHE", "REPORT_CACHE", "SNAPSHOT_STORE", "COHORT_INDEX"):
+        monkeypatch.setenv(name, "0")
+
+    _reset_services()
+    yield
+    _reset_services()
@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+import httpx
+
+import github_service
+import main
+from async_runtime import LoopLocal, run_sync
+from conftest import EMPTY_USER, UNKNOWN_USER
+
+
+def _lines(stream):
+    async def collect():
+        return [json.loads(line) async for line in stream]
+    return run_sync(collect())
+
+
+def test_batch_streams_one_line_per_candidate(services):
+    batch = main.BatchRequest(
+        usernames=["test-user-0000", "Test-User-0000", EMPTY_USER, UNKNOWN_USER],
+        concurrency=2
+    )
+    response = run_sync(main.analyze_batch(batch))
+    lines = _lines(response.body_iterator)
+
+    candidates, summary = lines[:-1], lines[-1]["summary"]
+    reports = {line["username"]: line["report"] for line in candidates}
+
+    # Logins are case-insensitive, so the repeated one is analyzed once
+    assert set(reports) == {"test-user-0000", EMPTY_USER, UNKNOWN_USER}
+    assert reports[UNKNOWN_USER] == {"error": "GitHub user not found"}
+    assert reports["test-user-0000"]["mode"] == "full"
+    assert summary["candidates"] == 3
+    assert summary["failed"] == 1
+    assert summary["candidates_per_minute"] > 0
+
+
+def test_fast_batches_skip_the_llm(services):
+    lines = _lines(main._stream_batch(["test-user-0000"], 1, "fast"))
+
+    report = lines[0]["report"]
+    assert report["mode"] == "fast"
+    assert report["recruiter_screening"]["generated_by"] == "fast-heuristics"
+
+
+def test_identical_fetches_in_flight_are_shared(services, monkeypatch):
+    sent = []
+
+    async def handler(request):
+        sent.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"login": "octo"})
+
+    monkeypatch.setattr(github_service, "_client", LoopLocal(lambda: httpx.AsyncClient(
+        base_url="https://github.test", transport=httpx.MockTransport(handler)
+    )))
+
+    async def both():
+        return await asyncio.gather(
+            github_service.get_user_profile_async("octo"),
+            github_service.get_user_profile_async("octo")
+        )
+
+    assert run_sync(both()) == [{"login": "octo"}, {"login": "octo"}]
+    assert sent == ["/users/octo"]
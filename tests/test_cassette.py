@@ -0,0 +1,50 @@
+import pytest
+
+import cassette
+from async_runtime import run_sync
+from cassette import CassetteMiss
+from conftest import EMPTY_USER, _reset_services
+from pipeline import build_report
+
+
+@pytest.fixture
+def use_cassette(services, monkeypatch, tmp_path):
+    """
+    Switch every client to a cassette at a temporary path; returns a
+    function taking the mode, which also starts a fresh cassette object
+    """
+    monkeypatch.setenv("CASSETTE_PATH", str(tmp_path / "cassette.sqlite"))
+
+    def switch(mode):
+        monkeypatch.setenv("CASSETTE_MODE", mode)
+        _reset_services()
+        if cassette._cassette is not None:
+            cassette._cassette.close()
+        monkeypatch.setattr(cassette, "_cassette", None)
+        return cassette.get_cassette()
+
+    yield switch
+
+    _reset_services()
+    if cassette._cassette is not None:
+        cassette._cassette.close()
+
+
+def test_replay_reproduces_the_recorded_report(use_cassette):
+    recording = use_cassette("record")
+    recorded = run_sync(build_report(EMPTY_USER))
+    assert recording.stats()["recorded"] > 0
+
+    replaying = use_cassette("replay")
+    replayed = run_sync(build_report(EMPTY_USER))
+
+    assert replayed == recorded
+    assert replaying.stats()["missed"] == 0
+    assert replaying.stats()["replayed"] > 0
+
+
+def test_unrecorded_request_is_a_miss(use_cassette):
+    use_cassette("replay")
+
+    with pytest.raises(CassetteMiss):
+        run_sync(build_report("test-user-0000"))
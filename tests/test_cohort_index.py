@@ -0,0 +1,61 @@
+from cohort_index import CohortIndex, cohort_metrics
+
+
+def _index(path=None):
+    index = CohortIndex(path)
+    index.add("Ann", {"total": 90}, ["Python"])
+    index.add("Bob", {"total": 70}, ["Go", "Python"])
+    index.add("Cy", {"total": 70}, ["Go"])
+    index.add("Dee", {"total": 40}, [])
+    return index
+
+
+def test_percentile_counts_ties_as_half():
+    index = _index()
+
+    assert index.percentile("total", 70) == 50.0
+    assert index.percentile("total", 90) == 87.5
+    assert index.percentile("total", 100) == 100.0
+    assert index.percentile("total", 0) == 0.0
+    assert index.percentile("unknown", 50) is None
+
+
+def test_percentile_within_a_language():
+    index = _index()
+
+    assert index.percentile("total", 70, language="python") == 25.0
+    assert index.percentile("total", 70, language="Go") == 50.0
+    assert index.percentile("total", 70, language="rust") is None
+
+
+def test_top_is_best_first():
+    index = _index()
+
+    assert [row["username"] for row in index.top("total", k=3)] == ["Ann", "Bob", "Cy"]
+    assert index.top("total", k=1, language="Go") == [{"username": "Bob", "score": 70}]
+
+
+def test_readding_replaces_the_old_entry():
+    index = _index()
+    index.add("dee", {"total": 95}, ["Rust"])
+
+    assert index.stats()["candidates"] == 4
+    assert index.top("total", k=1)[0]["username"] == "dee"
+    assert index.ranks("DEE")["total"] == {"score": 95, "percentile": 87.5}
+    assert index.percentile("total", 40) == 0.0
+
+
+def test_entries_survive_a_restart(tmp_path):
+    path = str(tmp_path / "cohort.sqlite")
+    _index(path)
+
+    reloaded = CohortIndex(path)
+    assert reloaded.stats()["candidates"] == 4
+    assert reloaded.percentile("total", 70) == 50.0
+    assert reloaded.stats()["languages"] == ["go", "python"]
+
+
+def test_metrics_skip_the_reserved_dimension():
+    metrics = cohort_metrics(80, {"Technical Depth": 10, "ai_evaluation_reserved": 0}, 12)
+
+    assert metrics == {"total": 80, "engineering_depth": 12, "Technical Depth": 10}
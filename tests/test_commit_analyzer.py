@@ -0,0 +1,80 @@
+import numpy as np
+
+from commit_analyzer import DAY, analyze_commit_arrays, analyze_commit_patterns, extract_commit_features
+
+
+def _commit(date, message="Add parser for invoice totals"):
+    return {"sha": date, "commit": {"message": message, "author": {"date": date}}}
+
+
+# Six commits on Monday 2024-01-01, one on Thursday, one the Sunday after next
+COMMITS = [
+    *[_commit(f"2024-01-01T{hour:02d}:00:00Z") for hour in range(9, 15)],
+    _commit("2024-01-04T10:00:00Z", "update"),
+    _commit("2024-01-14T10:00:00Z", "fix"),
+]
+
+
+def test_no_commits_keeps_the_defaults():
+    assert analyze_commit_patterns([]) == {
+        "consistency_score": 0,
+        "burst_detected": True,
+        "message_quality_score": 0,
+        "meaningless_commit_ratio": 1
+    }
+
+
+def test_gaps_bursts_and_quality():
+    result = analyze_commit_patterns(COMMITS)
+
+    assert result["total_commits"] == 8
+    assert result["active_days"] == 3
+    assert result["max_gap_days"] == 10
+    assert result["consistency_score"] == 5
+    assert result["burst_detected"] is True
+    assert result["burst_days"] == 1
+    assert result["meaningless_commit_ratio"] == 0.25
+    assert result["message_quality_score"] == 11
+
+
+def test_rolling_windows_and_weekly_cadence():
+    result = analyze_commit_patterns(COMMITS)
+
+    assert result["rolling_activity"] == {"max_commits_7_days": 7, "max_commits_30_days": 8}
+    cadence = result["weekly_cadence"]
+    assert cadence["weekday_histogram"] == {
+        "Mon": 6, "Tue": 0, "Wed": 0, "Thu": 1, "Fri": 0, "Sat": 0, "Sun": 1
+    }
+    assert cadence["active_weeks"] == 2
+    assert cadence["active_week_ratio"] == 1.0
+    assert cadence["max_commits_per_week"] == 7
+
+
+def test_offsets_are_read_as_utc():
+    timestamps, _ = extract_commit_features([
+        _commit("2024-01-01T01:00:00+02:00"),
+        _commit("2023-12-31T23:00:00Z")
+    ])
+
+    assert timestamps[0] == timestamps[1]
+
+
+def test_order_does_not_matter():
+    assert analyze_commit_patterns(COMMITS[::-1]) == analyze_commit_patterns(COMMITS)
+
+
+def test_large_histories_match_a_plain_loop():
+    rng = np.random.default_rng(0)
+    timestamps = np.sort(rng.integers(0, 3 * 365 * DAY, 100_000))
+    meaningful = rng.random(100_000) < 0.8
+
+    result = analyze_commit_arrays(timestamps, meaningful)
+
+    days = timestamps // DAY
+    per_day = {}
+    for day in days.tolist():
+        per_day[day] = per_day.get(day, 0) + 1
+    assert result["active_days"] == len(per_day)
+    assert result["burst_days"] == sum(1 for count in per_day.values() if count > 5)
+    gaps = [int(b - a) // DAY for a, b in zip(timestamps[:-1], timestamps[1:])]
+    assert result["max_gap_days"] == max(gaps)
@@ -0,0 +1,62 @@
+import pytest
+
+import github_graphql
+import github_service
+from conftest import UNKNOWN_USER
+from stubs.graphql_server import FIXTURE_USERS
+
+USER = "octo-sample"
+
+
+@pytest.fixture
+def graphql(services, monkeypatch):
+    monkeypatch.setenv("GITHUB_BACKEND", "graphql")
+
+
+def test_repos_follow_pagination(graphql):
+    repos = github_service.get_user_repos(USER)
+    fixture = FIXTURE_USERS[USER]["repositories"]
+
+    assert len(fixture) > github_graphql.REPO_PAGE_SIZE
+    assert [repo.name for repo in repos] == [repo["name"] for repo in fixture]
+    assert sum(repo.fork for repo in repos) == sum(repo["isFork"] for repo in fixture)
+
+
+def test_profile_counts_every_page(graphql):
+    profile = github_service.get_user_profile(USER)
+
+    assert profile["login"] == USER
+    assert profile["public_repos"] == len(FIXTURE_USERS[USER]["repositories"])
+    assert profile["followers"] == 42
+
+
+def test_repo_resources_come_from_the_same_query(graphql):
+    fixture = FIXTURE_USERS[USER]["repositories"][7]
+    name = fixture["name"]
+
+    readme = github_service.get_repo_readme(USER, name)
+    commits = github_service.get_repo_commits(USER, name)
+    activity = github_service.get_repo_activity(USER, name)
+
+    assert readme == fixture["readme0"]["text"]
+    assert len(commits) == len(fixture["defaultBranchRef"]["target"]["history"]["nodes"])
+    assert activity["merged_prs"] == fixture["mergedPRs"]["totalCount"]
+    assert activity["total_prs"] == (
+        fixture["openPRs"]["totalCount"] + fixture["closedPRs"]["totalCount"]
+        + fixture["mergedPRs"]["totalCount"]
+    )
+
+
+def test_readmes_outside_the_root_are_found(graphql):
+    readmes = github_service.get_repo_readmes(USER, [f"project-{i:03d}" for i in range(30)])
+
+    # Repos 2, 5, ..., 23 keep theirs under each README path but README.md,
+    # including docs/README.md (20) and .github/README.md (23)
+    found = {name for name, text in readmes.items() if text}
+    assert found == {f"project-{i:03d}" for i in range(30) if i % 3}
+    assert readmes["project-023"].startswith("# project-023")
+
+
+def test_unknown_user(graphql):
+    assert github_service.get_user_profile(UNKNOWN_USER) == {"error": "User not found"}
+    assert github_service.get_user_repos(UNKNOWN_USER) == []
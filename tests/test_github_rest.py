@@ -0,0 +1,135 @@
+import time
+
+import httpx
+import pytest
+
+import github_service
+from async_runtime import LoopLocal
+from conftest import COMMITS, EMPTY_USER, REPOS, UNKNOWN_USER
+
+USER = "test-user-0000"
+
+
+def _busiest_repo(users):
+    counts = users[USER]["commit_counts"]
+    return max(counts, key=counts.get)
+
+
+def test_repos_follow_pagination(services):
+    repos = github_service.get_user_repos(USER)
+
+    assert len(repos) == REPOS
+    assert len({repo.name for repo in repos}) == REPOS
+    assert all(isinstance(repo, github_service.RepoRecord) for repo in repos)
+
+
+def test_repos_stop_at_max_items(services):
+    assert len(github_service.get_user_repos(USER, max_items=120)) == 120
+
+
+def test_repos_since_stop_at_the_first_older_push(services):
+    repos = github_service.get_user_repos(USER)
+    cutoff = sorted(repo.pushed_at for repo in repos)[-10]
+
+    recent = github_service.get_user_repos(USER, since=cutoff)
+
+    assert len(recent) == 9
+    assert all(repo.pushed_at > cutoff for repo in recent)
+
+
+def test_commits_follow_pagination(services, users):
+    name = _busiest_repo(users)
+    expected = users[USER]["commit_counts"][name]
+    assert expected > github_service.PAGE_SIZE
+
+    commits = github_service.get_repo_commits(USER, name, max_items=None)
+
+    assert len(commits) == expected
+    assert len({commit["sha"] for commit in commits}) == expected
+    assert sum(users[USER]["commit_counts"].values()) == COMMITS
+
+
+def test_commits_default_to_the_newest_hundred(services, users):
+    commits = github_service.get_repo_commits(USER, _busiest_repo(users))
+
+    assert len(commits) == github_service.DEFAULT_COMMIT_LIMIT
+    dates = [commit["commit"]["author"]["date"] for commit in commits]
+    assert dates == sorted(dates, reverse=True)
+
+
+def test_zero_repo_user(services):
+    profile = github_service.get_user_profile(EMPTY_USER)
+
+    assert profile["login"] == EMPTY_USER
+    assert github_service.get_user_repos(EMPTY_USER) == []
+    assert github_service.get_user_activity(EMPTY_USER, []) == {}
+
+
+def test_unknown_user(services):
+    assert github_service.get_user_profile(UNKNOWN_USER) == {"error": "User not found"}
+    assert github_service.get_user_repos(UNKNOWN_USER) == []
+    assert github_service.get_repo_readme(UNKNOWN_USER, "repo-0000") is None
+
+
+def test_activity_counts_are_exact(services, users):
+    repos = github_service.get_user_repos(USER)[:10]
+    expected = users[USER]["activity"]
+
+    activity = github_service.get_user_activity(USER, repos)
+
+    for repo in repos:
+        counts = activity[repo.name]
+        assert {key: counts[key] for key in expected[repo.name]} == expected[repo.name]
+        assert "merged_unknown" not in counts
+
+
+def test_spent_search_budget_leaves_merges_unknown(services, users):
+    github_service.get_scheduler().update(None, {
+        "x-ratelimit-remaining": "0",
+        "x-ratelimit-reset": str(time.time() + 600),
+        "x-ratelimit-resource": "search"
+    })
+    repo = github_service.get_user_repos(USER)[0]
+    expected = users[USER]["activity"][repo.name]
+
+    counts = github_service.get_repo_activity(USER, repo.name)
+
+    assert counts["merged_unknown"] == 1
+    assert counts["merged_prs"] == 0
+    assert counts["closed_prs"] == expected["closed_prs"] + expected["merged_prs"]
+    assert counts["open_issues"] == expected["open_issues"]
+
+
+@pytest.fixture
+def flaky_github(services, monkeypatch):
+    """
+    A GitHub whose per-repo endpoints fail by repo name: "blocked" (451),
+    "empty" (409) and "broken" (502 on every attempt)
+    """
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        for name, status in (("blocked", 451), ("empty", 409), ("broken", 502)):
+            if f"/{name}/" in request.url.path:
+                return httpx.Response(status)
+        return httpx.Response(200, json=[])
+
+    monkeypatch.setattr(github_service, "SERVER_ERROR_BACKOFF", 0)
+    monkeypatch.setattr(github_service, "_client", LoopLocal(lambda: httpx.AsyncClient(
+        base_url="https://github.test", transport=httpx.MockTransport(handler)
+    )))
+    return calls
+
+
+@pytest.mark.parametrize("repo", ["blocked", "empty", "broken"])
+def test_failing_repo_counts_as_missing(flaky_github, repo):
+    assert github_service.get_repo_commits(USER, repo) == []
+    assert github_service.get_repo_readme(USER, repo) is None
+    assert github_service.get_repo_activity(USER, repo)["total_prs"] == 0
+
+
+def test_server_errors_are_retried(flaky_github):
+    github_service.get_repo_readme(USER, "broken")
+
+    assert len(flaky_github) == github_service.SERVER_ERROR_RETRIES + 1
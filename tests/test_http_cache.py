@@ -0,0 +1,77 @@
+import types
+
+import httpx
+import pytest
+
+import github_service
+import http_cache
+from async_runtime import LoopLocal
+from http_cache import HTTPCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    A settable time.time() for the cache
+    """
+    clock = types.SimpleNamespace(now=1_000_000.0)
+    monkeypatch.setattr(http_cache, "time", types.SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def test_evicts_least_recently_used(tmp_path, clock):
+    cache = HTTPCache(str(tmp_path / "http.sqlite"), max_bytes=250)
+
+    for i in range(3):
+        clock.now += 1
+        cache.store(f"k{i}", {"etag": f'"{i}"'}, b"x" * 100)
+
+    assert cache.lookup("k0") is None
+    assert cache.lookup("k2")["body"] == b"x" * 100
+    assert cache.stats()["bytes"] == 200
+    assert cache.stats()["evictions"] == 1
+
+    # A 304 refreshes k1, so k2 is the oldest when the next store overflows
+    clock.now += 1
+    cache.record_hit("k1")
+    clock.now += 1
+    cache.store("k3", {"etag": '"3"'}, b"x" * 100)
+
+    assert cache.lookup("k1") is not None
+    assert cache.lookup("k2") is None
+
+
+def test_tracks_bytes_across_replacements(tmp_path, clock):
+    path = str(tmp_path / "http.sqlite")
+    cache = HTTPCache(path, max_bytes=1000)
+
+    cache.store("k", {"etag": '"a"'}, b"x" * 400)
+    cache.store("k", {"etag": '"b"'}, b"x" * 100)
+    cache.store("unvalidated", {}, b"x" * 100)
+
+    assert cache.stats()["bytes"] == 100
+    assert HTTPCache(path, max_bytes=1000).stats()["bytes"] == 100
+
+
+def test_not_modified_is_served_from_the_cache(services, monkeypatch, tmp_path):
+    sent = []
+
+    def handler(request):
+        sent.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, headers={"ETag": '"v1"'}, json={"login": "octo"})
+
+    cache = HTTPCache(str(tmp_path / "http.sqlite"))
+    monkeypatch.setenv("GITHUB_HTTP_CACHE", "1")
+    monkeypatch.setattr(github_service, "_http_cache", cache)
+    monkeypatch.setattr(github_service, "_client", LoopLocal(lambda: httpx.AsyncClient(
+        base_url="https://github.test", transport=httpx.MockTransport(handler)
+    )))
+
+    assert github_service.get_user_profile("octo") == {"login": "octo"}
+    assert github_service.get_user_profile("octo") == {"login": "octo"}
+
+    assert sent == [None, '"v1"']
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,161 @@
+import asyncio
+import sqlite3
+import threading
+import types
+
+import pytest
+
+import job_queue
+from async_runtime import run_sync
+from conftest import EMPTY_USER
+from job_queue import STALE_SECONDS, JobQueue, JobStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "jobs.sqlite")
+
+
+def test_claims_by_priority_then_age(path):
+    store = JobStore(path)
+    low = store.add("low", priority=-5)
+    first = store.add("first")
+    second = store.add("second")
+    urgent = store.add("urgent", priority=10)
+
+    assert store.get(second)["queue_position"] == 2
+    claimed = [store.claim()[0] for _ in range(4)]
+
+    assert claimed == [urgent, first, second, low]
+    assert store.claim() is None
+
+
+def test_claim_returns_the_job_settings(path):
+    store = JobStore(path)
+    job_id = store.add("alice", refresh=True, mode="fast")
+
+    assert store.claim() == (job_id, "alice", True, "fast")
+    assert store.get(job_id)["status"] == "running"
+
+
+def test_finish_records_the_report(path):
+    store = JobStore(path)
+    job_id = store.add("alice")
+    store.claim()
+    store.update(job_id, {"username": "alice"})
+
+    assert store.get(job_id)["report"] == {"username": "alice"}
+    assert store.finish(job_id, {"username": "alice", "score": 1})
+
+    job = store.get(job_id)
+    assert job["status"] == "done"
+    assert job["pending_sections"] == [s for s in job_queue.REPORT_SECTIONS if s not in job["report"]]
+
+
+def test_requeue_leaves_live_owners_alone(path):
+    running, restarted = JobStore(path), JobStore(path)
+    job_id = running.add("alice")
+    running.claim()
+
+    assert restarted.requeue() == 0
+    assert not restarted.finish(job_id, {"stolen": True})
+    assert running.get(job_id)["status"] == "running"
+
+
+def test_requeue_takes_over_stale_jobs(path, monkeypatch):
+    crashed, survivor = JobStore(path), JobStore(path)
+    job_id = crashed.add("alice")
+    crashed.claim()
+
+    later = job_queue.time.time() + STALE_SECONDS + 1
+    monkeypatch.setattr(job_queue, "time", types.SimpleNamespace(time=lambda: later))
+
+    assert survivor.requeue() == 1
+    assert survivor.claim()[0] == job_id
+
+    # The original owner's late result is dropped
+    assert not crashed.finish(job_id, {"late": True})
+    assert survivor.finish(job_id, {"fresh": True})
+    assert survivor.get(job_id)["report"] == {"fresh": True}
+
+
+def test_heartbeat_keeps_jobs_alive(path, monkeypatch):
+    running, other = JobStore(path), JobStore(path)
+    running.add("alice")
+    running.claim()
+
+    later = job_queue.time.time() + STALE_SECONDS + 1
+    monkeypatch.setattr(job_queue, "time", types.SimpleNamespace(time=lambda: later))
+    running.heartbeat()
+
+    assert other.requeue() == 0
+
+
+def test_requeue_by_id_only_for_the_owner(path):
+    owner, other = JobStore(path), JobStore(path)
+    job_id = owner.add("alice")
+    owner.claim()
+
+    assert other.requeue(job_id) == 0
+    assert owner.requeue(job_id) == 1
+    assert owner.get(job_id)["status"] == "queued"
+
+
+def test_old_files_gain_the_new_columns(path):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, username TEXT NOT NULL, priority INTEGER NOT NULL, "
+        "refresh INTEGER NOT NULL, status TEXT NOT NULL, report TEXT NOT NULL, error TEXT, "
+        "created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+    )
+    conn.execute("INSERT INTO jobs VALUES ('old', 'alice', 0, 0, 'queued', '{}', NULL, 1, NULL, NULL)")
+    conn.commit()
+    conn.close()
+
+    assert JobStore(path).claim() == ("old", "alice", False, "full")
+
+
+class _ThreadRecordingStore(JobStore):
+    """
+    A JobStore noting which threads its worker-facing calls run on
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = set()
+
+    def _note(self, method, *args):
+        self.threads.add(threading.get_ident())
+        return method(*args)
+
+    def claim(self):
+        return self._note(super().claim)
+
+    def update(self, *args):
+        return self._note(super().update, *args)
+
+    def finish(self, *args):
+        return self._note(super().finish, *args)
+
+    def requeue(self, *args):
+        return self._note(super().requeue, *args)
+
+
+def test_workers_keep_the_store_off_the_loop(services, path):
+    store = _ThreadRecordingStore(path)
+    queue = JobQueue(store, workers=2)
+
+    async def run():
+        await queue.start()
+        job_id = queue.submit(EMPTY_USER)
+        try:
+            while store.get(job_id)["status"] not in ("done", "failed"):
+                await asyncio.sleep(0.05)
+        finally:
+            await queue.stop()
+        return threading.get_ident(), store.get(job_id)
+
+    loop_thread, job = run_sync(run())
+
+    assert job["report"]["username"] == EMPTY_USER
+    assert store.threads and loop_thread not in store.threads
@@ -0,0 +1,58 @@
+import pytest
+
+from engineering_depth import analyze_engineering_depth
+from github_service import RepoRecord
+from keyword_matcher import KeywordMatcher, default_matcher
+
+
+@pytest.mark.parametrize("name, category", [
+    ("vue3-shop", "frontend"),
+    ("react18", "frontend"),
+    ("ReactPortfolio", "frontend"),
+    ("reactjs-todo", "frontend"),
+    ("DjangoBlog", "backend"),
+    ("myDjangoApp", "backend"),
+    ("my_django_app", "backend"),
+    ("springboot-demo", "backend"),
+    ("flaskapp", "backend"),
+    ("FastAPI-demo", "backend"),
+    ("postgresql-notes", "database"),
+    ("TensorFlow-experiments", "ml"),
+    ("k8s-lab", "infra"),
+])
+def test_repo_names_hold_their_stack(name, category):
+    assert category in default_matcher.categories(name)
+
+
+@pytest.mark.parametrize("name", ["mysql-notes", "MySQL", "prefix", "html5-game", "notes"])
+def test_keywords_inside_words_do_not_count(name):
+    assert default_matcher.categories(name) == set()
+
+
+def test_commit_messages_need_whole_words():
+    messages = ["fix", "Fixed typo", "fixTypo", "prefix handling", "Add fixture for parser"]
+
+    assert default_matcher.flags(messages, "low_signal") == [True, True, True, False, False]
+    assert default_matcher.has("minor: updates", "low_signal")
+
+
+def test_matches_list_each_keyword_found():
+    assert default_matcher.matches("flask-react-postgres") == {
+        "backend": ["flask"], "frontend": ["react"], "database": ["postgres"]
+    }
+
+
+def test_registered_keywords_recompile():
+    matcher = KeywordMatcher({"backend": ["django"]})
+    matcher.register("backend", ["rails*"])
+    matcher.register("mobile", ["swift ui"])
+
+    assert matcher.categories("railsapp with swift-ui") == {"backend", "mobile"}
+    with pytest.raises(ValueError):
+        matcher.register("not a name", ["x"])
+
+
+def test_joined_names_score_engineering_depth():
+    repos = [RepoRecord("DjangoBlog"), RepoRecord("vue3-shop"), RepoRecord("mysql-notes")]
+
+    assert analyze_engineering_depth(repos) == 6
@@ -0,0 +1,59 @@
+import types
+
+import pytest
+
+import ai_evaluator
+import llm_cache
+from async_runtime import run_sync
+from llm_cache import LLMCache, cache_key
+
+README = "# Tool\n\nConverts invoices.\n\n## Usage\n\n    tool --help\n"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    A settable time.time() for the cache
+    """
+    clock = types.SimpleNamespace(now=1_000_000.0)
+    monkeypatch.setattr(llm_cache, "time", types.SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def test_keys_cover_every_input():
+    key = cache_key("model", 0.2, "readme-v1", "text")
+
+    assert key == cache_key("model", 0.2, "readme-v1", "text")
+    assert key != cache_key("model", 0.3, "readme-v1", "text")
+    assert key != cache_key("model", 0.2, "readme-v2", "text")
+    assert key != cache_key("other", 0.2, "readme-v1", "text")
+
+
+def test_expires_after_ttl(tmp_path, clock):
+    path = str(tmp_path / "llm.sqlite")
+    cache = LLMCache(path, ttl=100, max_entries=1)
+
+    cache.set("a", "first")
+    cache.set("b", "second")
+
+    # "a" left the in-memory LRU but is still on disk
+    assert cache.get("a") == "first"
+    assert LLMCache(path, ttl=100).get("b") == "second"
+
+    clock.now += 100
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+
+
+def test_repeat_evaluation_makes_no_llm_call(services, monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_CACHE", "1")
+    monkeypatch.setattr(ai_evaluator, "_llm_cache", LLMCache(str(tmp_path / "llm.sqlite")))
+
+    first = run_sync(ai_evaluator.evaluate_readme_async(README))
+
+    def no_client():
+        raise AssertionError("LLM called for a cached prompt")
+
+    monkeypatch.setattr(ai_evaluator, "get_async_client", no_client)
+    assert run_sync(ai_evaluator.evaluate_readme_async(README)) == first
+    assert ai_evaluator.get_llm_cache().stats()["hits"] == 1
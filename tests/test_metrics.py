@@ -0,0 +1,54 @@
+import pytest
+
+import metrics
+from async_runtime import run_sync
+from conftest import EMPTY_USER
+from pipeline import build_report
+
+
+@pytest.fixture
+def registry(services, monkeypatch):
+    """
+    A fresh metrics registry, so counts start at zero
+    """
+    monkeypatch.setenv("METRICS", "1")
+    monkeypatch.setattr(metrics, "_instruments", None)
+    return lambda: metrics._get()["registry"]
+
+
+def test_github_paths_collapse_to_routes():
+    assert metrics.github_endpoint("/users/octo") == "/users/{user}"
+    assert metrics.github_endpoint("/users/octo/repos") == "/users/{user}/repos"
+    assert metrics.github_endpoint("/repos/octo/app/issues") == "/repos/{owner}/{repo}/issues"
+    assert metrics.github_endpoint("/search/issues") == "/search/issues"
+
+
+def test_report_records_stages_and_calls(registry):
+    run_sync(build_report(EMPTY_USER))
+    samples = registry()
+
+    assert samples.get_sample_value(
+        "pipeline_stage_seconds_count", {"stage": "profile", "outcome": "ok"}
+    ) == 1
+    assert samples.get_sample_value(
+        "github_request_seconds_count",
+        {"method": "GET", "endpoint": "/users/{user}", "status": "200"}
+    ) >= 1
+    assert samples.get_sample_value(
+        "groq_request_seconds_count",
+        {"endpoint": "chat.completions", "model": "llama-3.1-8b-instant", "status": "200"}
+    ) >= 1
+
+    body, content_type = metrics.render()
+    assert content_type.startswith("text/plain")
+    assert b"github_rate_limit_remaining" in body
+
+
+def test_disabled_metrics_record_nothing(registry, monkeypatch):
+    monkeypatch.setenv("METRICS", "0")
+    run_sync(build_report(EMPTY_USER))
+    monkeypatch.setenv("METRICS", "1")
+
+    assert registry().get_sample_value(
+        "pipeline_stage_seconds_count", {"stage": "profile", "outcome": "ok"}
+    ) is None
@@ -0,0 +1,45 @@
+import pytest
+
+from async_runtime import run_sync
+from commit_analyzer import analyze_commit_patterns
+from conftest import EMPTY_USER, UNKNOWN_USER
+from pipeline import REPORT_SECTIONS, build_report, stages_for
+
+USER = "test-user-0001"
+
+
+@pytest.mark.parametrize("mode", ["full", "fast"])
+def test_report_has_every_section(services, mode):
+    report = run_sync(build_report(USER, mode=mode))
+
+    assert list(report) == REPORT_SECTIONS
+    assert report["mode"] == mode
+    assert 0 <= report["github_portfolio_score"] <= 100
+
+
+def test_fast_report_is_labelled(services):
+    report = run_sync(build_report(USER, mode="fast"))
+
+    for section in ("readme_evaluation", "recruiter_screening", "growth_roadmap"):
+        assert report[section]["generated_by"] == "fast-heuristics"
+    assert report["activity_totals"]["repos"] <= 5
+
+
+@pytest.mark.parametrize("mode", ["full", "fast"])
+def test_zero_repo_user(services, mode):
+    report = run_sync(build_report(EMPTY_USER, mode=mode))
+
+    assert report["top_repositories"] == []
+    assert report["repo_activity"] == []
+    assert report["commit_analysis"] == analyze_commit_patterns([])
+    assert report["readme_evaluation"]["readme_score"] == 0
+
+
+@pytest.mark.parametrize("mode", ["full", "fast"])
+def test_unknown_user(services, mode):
+    assert run_sync(build_report(UNKNOWN_USER, mode=mode)) == {"error": "GitHub user not found"}
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        stages_for("slow")
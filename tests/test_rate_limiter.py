@@ -0,0 +1,63 @@
+import time
+
+import pytest
+
+from async_runtime import run_sync
+from rate_limiter import GitHubRateLimitError, RateLimitScheduler, retry_after_seconds
+
+
+def _headers(remaining, reset=None, resource="core"):
+    return {
+        "x-ratelimit-remaining": str(remaining),
+        "x-ratelimit-limit": "5000",
+        "x-ratelimit-reset": str(reset or time.time() + 3600),
+        "x-ratelimit-resource": resource
+    }
+
+
+def test_picks_the_token_with_most_budget_left():
+    scheduler = RateLimitScheduler(["a", "b"])
+    scheduler.update("a", _headers(10))
+    scheduler.update("b", _headers(900))
+
+    assert run_sync(scheduler.acquire()) == "b"
+
+
+def test_exhausted_tokens_are_skipped_until_reset():
+    scheduler = RateLimitScheduler(["a", "b"])
+    scheduler.mark_exhausted("a", "core", time.time() + 3600)
+
+    assert {run_sync(scheduler.acquire()) for _ in range(3)} == {"b"}
+    # Budgets are per resource
+    assert scheduler.available("search")
+
+
+def test_fails_when_every_token_waits_too_long():
+    scheduler = RateLimitScheduler(["a"], max_wait=5)
+    scheduler.update("a", _headers(0, time.time() + 600, "search"))
+
+    assert not scheduler.available("search")
+    with pytest.raises(GitHubRateLimitError) as error:
+        run_sync(scheduler.acquire("search"))
+    assert error.value.retry_after >= 599
+
+
+def test_secondary_limits_are_counted_apart_from_not_found():
+    scheduler = RateLimitScheduler(["a"])
+    scheduler.backoff("a", 30)
+    scheduler.record_not_found()
+
+    stats = scheduler.stats()
+    assert stats["secondary_limit_retries"] == 1
+    assert stats["not_found"] == 1
+    assert not scheduler.available()
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("7", 7),
+    ("Wed, 21 Oct 2015 07:28:00 GMT", 0),
+    ("soon", 60),
+    (None, 60),
+])
+def test_retry_after_accepts_seconds_and_dates(value, expected):
+    assert retry_after_seconds(value, 60) == expected
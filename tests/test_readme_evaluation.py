@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+import ai_evaluator
+from async_runtime import run_sync
+from readme_selection import select_readmes
+from red_flag_engine import NO_README, detect_red_flags
+
+README = """# {name}
+
+A command line tool that {what}.
+
+## Installation
+
+```
+pip install {name}
+```
+
+## Usage
+
+```
+{name} --help
+```
+
+See the [docs](https://example.com/{name}) for more.
+"""
+
+READMES = {
+    "alpha": README.format(name="alpha", what="converts invoices into ledgers"),
+    "beta": README.format(name="beta", what="renders terrain maps from elevation tiles"),
+    "gamma": README.format(name="gamma", what="schedules chores for a shared flat"),
+}
+
+
+@pytest.fixture
+def selection():
+    return select_readmes(READMES)
+
+
+def _answer(monkeypatch, raw):
+    """
+    Make the model answer `raw` to the batched README prompt
+    """
+    async def complete(prompt, temperature, template_version, parse):
+        return parse(raw)
+
+    monkeypatch.setattr(ai_evaluator, "_complete_async", complete)
+
+
+def test_scores_match_by_name_in_any_order(monkeypatch, selection):
+    _answer(monkeypatch, "```json\n" + json.dumps({
+        "readmes": [
+            {"repo": "GAMMA/README.md", "readme_score": 10},
+            {"repo": "octo/alpha", "readme_score": 16},
+            {"repo": "beta.md", "readme_score": 25}
+        ],
+        "strengths": ["Clear usage"],
+        "improvements": []
+    }) + "\n```")
+
+    result = run_sync(ai_evaluator.evaluate_readmes_async(selection))
+    scores = {repo["repo"]: repo["readme_score"] for repo in result["repos"]}
+
+    assert scores == {"alpha": 16, "beta": 20, "gamma": 10}
+    assert {repo["scored_by"] for repo in result["repos"]} == {"llm"}
+    assert result["readme_score"] == round((16 + 20 + 10) / 3)
+    assert result["strengths"] == ["Clear usage"]
+
+
+def test_skipped_repos_keep_their_structure_score(monkeypatch, selection):
+    _answer(monkeypatch, json.dumps({"readmes": [{"repo": "alpha", "readme_score": 18}]}))
+
+    result = run_sync(ai_evaluator.evaluate_readmes_async(selection))
+    repos = {repo["repo"]: repo for repo in result["repos"]}
+
+    assert repos["alpha"]["scored_by"] == "llm"
+    assert repos["beta"]["scored_by"] == "structure"
+    assert repos["beta"]["readme_score"] == round(repos["beta"]["structure_score"] / 5)
+
+
+@pytest.mark.parametrize("raw", [
+    "I cannot score these.",
+    "{not json}",
+    json.dumps({"readmes": [{"repo": "someone-else", "readme_score": 20}]}),
+    json.dumps({"readmes": [{"repo": "alpha", "readme_score": "n/a"}]}),
+])
+def test_unusable_answers_fall_back_to_structure(monkeypatch, selection, raw):
+    _answer(monkeypatch, raw)
+
+    result = run_sync(ai_evaluator.evaluate_readmes_async(selection))
+
+    assert result["improvements"] == ["AI response parsing failed."]
+    assert {repo["scored_by"] for repo in result["repos"]} == {"structure"}
+    assert result["readme_score"] > 0
+
+    profile = {"public_repos": 3}
+    commits = {"consistency_score": 15, "meaningless_commit_ratio": 0}
+    assert NO_README not in detect_red_flags(profile, [], commits, result)
+
+
+def test_stand_in_answers_in_order(services, selection):
+    result = run_sync(ai_evaluator.evaluate_readmes_async(selection))
+
+    assert [repo["readme_score"] for repo in result["repos"]] == [14, 13, 12]
+    assert result["readmes_found"] == 3
+
+
+def test_no_readmes_scores_zero():
+    result = run_sync(ai_evaluator.evaluate_readmes_async(select_readmes({})))
+
+    assert result["readme_score"] == 0
+    assert result["repos"] == []
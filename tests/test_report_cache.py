@@ -0,0 +1,71 @@
+import asyncio
+import types
+
+import pytest
+
+import report_cache
+from report_cache import ReportCache, report_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    A settable time.time() for the report cache
+    """
+    clock = types.SimpleNamespace(now=1_000_000.0)
+    monkeypatch.setattr(report_cache, "time", types.SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def test_serves_fresh_reports_only(clock):
+    cache = ReportCache(ttl=60, max_stale=0)
+    cache.store(report_key("Alice"), {"username": "alice"})
+
+    clock.now += 59
+    assert cache.peek("alice")[0] == {"username": "alice"}
+    clock.now += 1
+    assert cache.peek("alice") is None
+
+
+def test_skips_errors_and_evicts_oldest(clock):
+    cache = ReportCache(ttl=60, max_entries=2)
+
+    cache.store("error", {"error": "GitHub user not found"})
+    for name in ("a", "b", "c"):
+        cache.store(name, {"username": name})
+
+    assert cache.peek("error") is None
+    assert cache.peek("a") is None
+    assert cache.peek("c") is not None
+
+
+def test_keys_keep_modes_apart():
+    assert report_key("Alice") == "alice"
+    assert report_key("Alice", "fast") != report_key("Alice")
+
+
+def test_cancelled_waiter_leaves_others_waiting():
+    cache = ReportCache()
+    runs = []
+
+    async def compute():
+        runs.append(1)
+        await asyncio.sleep(0.2)
+        return {"username": "alice"}
+
+    async def main():
+        first = asyncio.ensure_future(cache.get_async("alice", compute))
+        second = asyncio.ensure_future(cache.get_async("alice", compute))
+        await asyncio.sleep(0.05)
+
+        first.cancel()
+        report, status = await second
+        assert first.cancelled()
+        return report, status
+
+    report, status = asyncio.run(main())
+
+    assert report == {"username": "alice"}
+    assert status["status"] == "in_flight"
+    assert len(runs) == 1
+    assert cache.peek("alice")[0] == report
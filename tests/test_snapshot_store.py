@@ -0,0 +1,68 @@
+import pytest
+
+import github_service
+import snapshot_store
+from async_runtime import run_sync
+from pipeline import build_report
+from snapshot_store import SnapshotStore, refresh_activity_async, refresh_readmes_async
+
+USER = "test-user-0000"
+# Sections that must come out the same when rebuilt from the snapshot
+REUSED = ("commit_analysis", "repo_activity", "activity_totals", "readme_evaluation",
+          "github_portfolio_score", "red_flags")
+
+
+@pytest.fixture
+def store(services, monkeypatch, tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots.sqlite"))
+    monkeypatch.setenv("SNAPSHOT_STORE", "1")
+    monkeypatch.setattr(snapshot_store, "_store", store)
+    return store
+
+
+def _requests():
+    return github_service.get_scheduler().stats()["requests"]
+
+
+@pytest.mark.parametrize("mode", ["full", "fast"])
+def test_unchanged_candidate_costs_a_few_requests(store, mode):
+    first = run_sync(build_report(USER, mode=mode))
+    cold = _requests()
+
+    second = run_sync(build_report(USER, mode=mode))
+
+    # The profile and two pages of repos; nothing per repo
+    assert _requests() - cold == 3
+    assert cold > 30
+    for section in REUSED:
+        assert second[section] == first[section]
+
+
+def test_only_changed_repos_are_fetched_again(store):
+    run_sync(build_report(USER))
+    snapshot = store.load(USER)
+    repos = [r for r in github_service.get_user_repos(USER) if not r.fork]
+    pushed, reopened = repos[0], repos[1]
+
+    snapshot["readmes"][pushed.name] = {"pushed_at": "2000-01-01T00:00:00Z", "text": "stale"}
+    snapshot["activity"][reopened.name]["version"][1] += 1
+    snapshot["activity"][reopened.name]["counts"] = {"stale": True}
+    before = _requests()
+
+    readmes = run_sync(refresh_readmes_async(USER, repos, snapshot))
+    activity = run_sync(refresh_activity_async(USER, repos, snapshot))
+
+    # One README, and the four listings plus a merged count of one repo
+    assert _requests() - before <= 1 + 5
+    assert readmes == github_service.get_repo_readmes(USER, [r.name for r in repos])
+    assert activity[reopened.name] == github_service.get_repo_activity(USER, reopened.name)
+
+
+def test_no_snapshot_fetches_everything(services):
+    repos = github_service.get_user_repos(USER)[:5]
+    before = _requests()
+
+    readmes = run_sync(refresh_readmes_async(USER, repos))
+
+    assert list(readmes) == [r.name for r in repos]
+    assert _requests() - before == 5
@@ -0,0 +1,41 @@
+import json
+
+import httpx
+
+import ai_evaluator
+import main
+from async_runtime import run_sync
+from conftest import EMPTY_USER, UNKNOWN_USER
+
+
+def _lines(stream):
+    async def collect():
+        return [json.loads(line) async for line in stream]
+    return run_sync(collect())
+
+
+def test_sections_stream_then_done(services):
+    lines = _lines(main._stream_sections(EMPTY_USER, refresh=True))
+    sections = [line["section"] for line in lines]
+
+    assert set(main.REPORT_SECTIONS) <= set(sections)
+    assert sections[-1] == "done"
+    assert all(line["elapsed_seconds"] >= 0 for line in lines)
+
+
+def test_unknown_user_ends_with_error(services):
+    lines = _lines(main._stream_sections(UNKNOWN_USER, refresh=True))
+
+    assert lines[-1]["section"] == "error"
+
+
+def test_llm_failure_ends_with_error(services, monkeypatch):
+    async def unreachable(*args, **kwargs):
+        raise httpx.ConnectError("Groq is unreachable")
+
+    monkeypatch.setattr(ai_evaluator, "_complete_async", unreachable)
+    lines = _lines(main._stream_sections(EMPTY_USER, refresh=True))
+
+    assert lines[-1]["section"] == "error"
+    assert lines[-1]["data"] == "Groq is unreachable"
+    assert "done" not in [line["section"] for line in lines]